@@ -0,0 +1,78 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# route 종류별 기본 동시 처리 한도 (합계가 워커 스레드 수보다 작아야 heartbeat용 스레드가 남는다)
+DEFAULT_LIMITS = {"command": 6, "interaction": 6, "options": 8, "events": 4}
+BUSY_TEXT = "요청이 많아 지금은 처리할 수 없습니다. 잠시 후 다시 시도해 주세요."
+
+
+def parse_limits(spec: str, defaults: dict = None) -> dict:
+    """예: ADMISSION_LIMITS="command=8,interaction=8,options=16" (지정하지 않은 route는 defaults 값)"""
+    limits = dict(DEFAULT_LIMITS if defaults is None else defaults)
+    for part in filter(None, (p.strip() for p in (spec or "").split(","))):
+        route, _, limit = part.partition("=")
+        limits[route.strip()] = int(limit)
+    return limits
+
+
+class AdmissionController:
+    """route 종류별 동시 처리(in-flight) 수를 제한한다. 한도에 걸리면 기다리지 않고 바로 거절한다.
+
+    한도가 없는 route(heartbeat / healthz 등 우선 처리 대상)는 항상 통과한다.
+    """
+
+    def __init__(self, limits: dict):
+        self.limits = dict(limits)
+        self._in_flight = {route: 0 for route in self.limits}
+        self._rejected = {route: 0 for route in self.limits}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, route: str) -> bool:
+        limit = self.limits.get(route)
+        if limit is None:
+            return True
+        with self._lock:
+            if self._in_flight[route] >= limit:
+                self._rejected[route] += 1
+                return False
+            self._in_flight[route] += 1
+            return True
+
+    def release(self, route: str):
+        if route not in self.limits:
+            return
+        with self._lock:
+            self._in_flight[route] -= 1
+
+    def in_flight(self) -> dict:
+        with self._lock:
+            return dict(self._in_flight)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                route: {"in_flight": self._in_flight[route], "limit": limit, "rejected": self._rejected[route]}
+                for route, limit in self.limits.items()
+            }
+
+
+def busy_response(route: str, data: dict = None):
+    """한도 초과 시 Slack에 바로 돌려줄 (HTTP status, 응답 dict 또는 None)
+
+    - command: 요청자에게만 보이는 안내 메시지
+    - interaction(view_submission): 모달을 닫지 않고 첫 입력 블록에 오류 표시 (다시 제출 가능)
+    - options: 빈 옵션 목록
+    - events: 503 → Slack이 나중에 다시 보낸다
+    """
+    if route == "command":
+        return 200, {"response_type": "ephemeral", "text": BUSY_TEXT}
+    if route == "interaction":
+        values = ((data or {}).get("view") or {}).get("state", {}).get("values", {})
+        if (data or {}).get("type") == "view_submission" and values:
+            return 200, {"response_action": "errors", "errors": {next(iter(values)): BUSY_TEXT}}
+        return 200, None
+    if route == "options":
+        return 200, {"options": []}
+    return 503, None
@@ -0,0 +1,236 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import Slack_Json
+from Slack_Resilience import METHOD_BUDGETS, is_failure, not_sent, retry_after
+
+logger = logging.getLogger(__name__)
+
+# Slack Web API 메서드별 rate limit tier (분당 호출 수)
+# https://api.slack.com/docs/rate-limits
+TIER_LIMITS = {1: 1, 2: 20, 3: 50, 4: 100}
+METHOD_TIERS = {
+    "users.list": 2,
+    "conversations.open": 3,
+    "conversations.info": 3,
+    "chat.scheduleMessage": 3,
+    "views.open": 4,
+    "views.update": 4,
+    "chat.postEphemeral": 4,
+}
+# chat.postMessage는 tier가 아닌 "채널당 초당 1건" 특수 제한 → 전체 기준으로는 넉넉하게 둔다
+SPECIAL_LIMITS = {"chat.postMessage": 600}
+DEFAULT_PER_MINUTE = TIER_LIMITS[3]
+
+DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) 초
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 다시 보내면 메시지가 한 번 더 올라가는 메서드: 요청이 Slack에 닿지 않은 실패(연결 실패)와 429만 재시도한다
+NON_IDEMPOTENT_METHODS = {"chat.postMessage", "chat.postEphemeral", "chat.scheduleMessage"}
+# 채널별로 제한되는 메서드: 429는 그 채널만의 제한이라 메서드 전체를 멈추지 않고 retry_after와 함께 바로 돌려준다
+# (MessageScheduler가 그 채널만 멈췄다가 다시 보낸다)
+CHANNEL_LIMITED_METHODS = {"chat.postMessage"}
+
+
+class RateLimiter:
+    """메서드별 토큰 버킷. 429 응답 시 Retry-After 동안 전체 호출을 멈춘다."""
+
+    def __init__(self, per_minute: float, burst: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, per_minute / 10.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """토큰 하나를 예약하고, 사용 가능해질 때까지 기다려야 하는 시간을 돌려준다."""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate == float("inf"):
+                return max(0.0, self._blocked_until - now)
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self, max_wait: float = None) -> bool:
+        wait = self._reserve()
+        if max_wait is not None and wait > max_wait:
+            with self._lock:
+                if self.rate != float("inf"):
+                    self._tokens += 1  # 예약 취소
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def block_for(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class SlackApiClient:
+    """커넥션 풀을 공유하는 Slack Web API 클라이언트.
+
+    - requests.Session + HTTPAdapter로 keep-alive 커넥션 재사용
+    - 메서드별 tier rate limit, 429 Retry-After 준수 (CHANNEL_LIMITED_METHODS는 재시도 없이 retry_after를 돌려준다)
+    - 5xx/네트워크 오류는 지수 백오프 + jitter로 제한된 횟수만 재시도.
+      단 NON_IDEMPOTENT_METHODS는 전송 뒤 끊김 / 읽기 타임아웃 / 5xx를 재시도하지 않고
+      uncertain 오류로 돌려준다 (Slack이 이미 게시했을 수 있다)
+    - 시간 예산(budget, METHOD_BUDGETS)이 있는 메서드는 재시도 / rate limit 대기를 포함해 그 안에 끝낸다
+    - breakers(BreakerRegistry)를 주면 메서드별 회로 차단기가 열린 동안 호출 없이 circuit_open으로 실패한다
+    - 항상 Slack 응답 형식의 dict를 돌려준다 (실패 시 {"ok": False, "error": ...})
+    """
+
+    def __init__(self, token: str, base_url: str = "https://slack.com/api", pool_size: int = 20,
+                 timeout=DEFAULT_TIMEOUT, max_retries: int = 3, backoff_base: float = 0.5,
+                 max_backoff: float = 8.0, max_rate_wait: float = 5.0, rate_limit_scale: float = 1.0,
+                 on_call=None, breakers=None):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.max_rate_wait = max_rate_wait
+        # tier 한도에 곱하는 배율 (0이면 클라이언트 측 제한 없이 429 Retry-After만 따른다)
+        self.rate_limit_scale = rate_limit_scale
+        # 호출마다 on_call(method, 소요 시간(초), 응답 dict)을 부른다 (메트릭 수집용)
+        self.on_call = on_call
+        self.breakers = breakers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Authorization": f"Bearer {token}"})
+        self._limiters: dict[str, RateLimiter] = {}
+        self._limiters_lock = threading.Lock()
+
+    def limiter(self, method: str) -> RateLimiter:
+        limiter = self._limiters.get(method)
+        if limiter is None:
+            with self._limiters_lock:
+                limiter = self._limiters.get(method)
+                if limiter is None:
+                    per_minute = SPECIAL_LIMITS.get(method) or TIER_LIMITS.get(METHOD_TIERS.get(method), DEFAULT_PER_MINUTE)
+                    if self.rate_limit_scale <= 0:
+                        per_minute = float("inf")
+                    else:
+                        per_minute *= self.rate_limit_scale
+                    limiter = self._limiters[method] = RateLimiter(per_minute)
+        return limiter
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(max_backoff, base * 2^attempt)
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * (2 ** attempt)))
+
+    def call(self, method: str, payload: dict = None, params: dict = None, http_method: str = "POST",
+             timeout=None, body: bytes = None, budget: float = None, idempotent: bool = None) -> dict:
+        """Slack API 메서드를 호출한다. body에 미리 직렬화한 JSON bytes를 넘기면 payload 대신 그대로 전송한다.
+
+        budget: 재시도를 포함한 전체 시간 상한(초). 없으면 METHOD_BUDGETS 값, 거기도 없으면 제한 없음.
+        idempotent: 전송 뒤 실패를 재시도해도 되는지. 없으면 GET이거나 NON_IDEMPOTENT_METHODS가 아닌 메서드
+        """
+        started = time.perf_counter()
+        breaker = self.breakers.get(method) if self.breakers is not None else None
+        if breaker is not None and not breaker.allow():
+            response = {"ok": False, "error": "circuit_open"}
+        else:
+            if budget is None:
+                budget = METHOD_BUDGETS.get(method)
+            deadline = time.monotonic() + budget if budget else None
+            if idempotent is None:
+                idempotent = http_method == "GET" or method not in NON_IDEMPOTENT_METHODS
+            response = self._call(method, payload, params, http_method, timeout, body, deadline, idempotent)
+            if breaker is not None:
+                breaker.record(is_failure(response))
+        if self.on_call is not None:
+            self.on_call(method, time.perf_counter() - started, response)
+        return response
+
+    @staticmethod
+    def _remaining(deadline):
+        return None if deadline is None else deadline - time.monotonic()
+
+    @staticmethod
+    def _cap(timeout, remaining):
+        if remaining is None:
+            return timeout
+        if isinstance(timeout, tuple):
+            return tuple(min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
+
+    def _sleep_backoff(self, attempt: int, deadline) -> bool:
+        """백오프 후 재시도할 시간이 남아 있으면 잠들고 True"""
+        delay = self._backoff(attempt)
+        remaining = self._remaining(deadline)
+        if remaining is not None and delay >= remaining - 0.1:
+            return False
+        time.sleep(delay)
+        return True
+
+    def _call(self, method, payload, params, http_method, timeout, body, deadline=None, idempotent=True) -> dict:
+        if http_method != "GET" and body is None:
+            body = Slack_Json.dumps(payload or {})
+        url = f"{self.base_url}/{method}"
+        limiter = self.limiter(method)
+        error = "unknown_error"
+        for attempt in range(self.max_retries + 1):
+            remaining = self._remaining(deadline)
+            if remaining is not None and remaining <= 0.1:
+                logger.warning("%s 시간 예산 초과 (시도 %d)", method, attempt + 1)
+                return {"ok": False, "error": "request_failed: deadline_exceeded" if attempt == 0 else error}
+            max_wait = self.max_rate_wait if remaining is None else min(self.max_rate_wait, remaining)
+            if not limiter.acquire(max_wait):
+                logger.warning("%s rate limit 대기 초과", method)
+                return {"ok": False, "error": "ratelimited"}
+            attempt_timeout = self._cap(timeout or self.timeout, self._remaining(deadline))
+            try:
+                if http_method == "GET":
+                    response = self.session.get(url, params=params, timeout=attempt_timeout)
+                else:
+                    response = self.session.post(
+                        url,
+                        params=params,
+                        data=body,
+                        headers={"Content-Type": "application/json; charset=utf-8"},
+                        timeout=attempt_timeout,
+                    )
+            except requests.RequestException as e:
+                logger.warning("%s 호출 실패 (시도 %d): %s", method, attempt + 1, e)
+                if not idempotent and not not_sent(e):
+                    return {"ok": False, "error": f"uncertain: {e.__class__.__name__}"}
+                error = f"request_failed: {e.__class__.__name__}"
+                if attempt < self.max_retries and not self._sleep_backoff(attempt, deadline):
+                    break
+                continue
+
+            if response.status_code == 429:
+                wait = retry_after(response)
+                logger.warning("%s rate limited, Retry-After=%ss", method, wait)
+                if method in CHANNEL_LIMITED_METHODS:
+                    return {"ok": False, "error": "ratelimited", "retry_after": wait}
+                limiter.block_for(wait)
+                error = "ratelimited"
+                continue
+            if response.status_code in RETRY_STATUS:
+                error = f"http_{response.status_code}"
+                logger.warning("%s HTTP %d (시도 %d)", method, response.status_code, attempt + 1)
+                if not idempotent:
+                    return {"ok": False, "error": f"uncertain: {error}"}
+                if attempt < self.max_retries and not self._sleep_backoff(attempt, deadline):
+                    break
+                continue
+
+            try:
+                return Slack_Json.loads(response.content)
+            except ValueError:
+                return {"ok": False, "error": f"invalid_response: HTTP {response.status_code}"}
+
+        return {"ok": False, "error": error}
@@ -0,0 +1,584 @@
+"""asyncio/ASGI 서빙 모드
+
+Slack_WebServer(Flask, 동기)와 같은 슬래시 커맨드 / 인터랙션을 코루틴으로 처리한다.
+업스트림 호출은 slack_sdk AsyncWebClient + 공유 aiohttp 커넥션 풀을 사용하고,
+view_submission은 바로 응답(response_action: clear)한 뒤 백그라운드 태스크에서 처리한다.
+
+Slack_WebServer에만 있는 기능 (이 모드에서는 동작하지 않는다):
+- outbox: 제출 내용은 저장하지 않고 바로 백그라운드 태스크로 처리한다 (재기동 시 처리 중이던 제출은 유실)
+- Events API(/slack/events): 멤버 디렉터리를 쓰지 않으므로 엔드포인트가 없다
+- 마감 리마인더: 업무 요청을 보내도 리마인더를 저장하지 않고, 저장된 리마인더도 보내지 않는다
+
+실행: uvicorn Slack_AsyncServer:app --host 0.0.0.0 --port 5000 --workers 2
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from urllib.parse import parse_qs
+
+import aiohttp
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import (
+    AsyncConnectionErrorRetryHandler,
+    AsyncRateLimitErrorRetryHandler,
+)
+from slack_sdk.web.async_client import AsyncWebClient
+
+import Slack_Json
+import Slack_Logging
+import Slack_Metrics
+from Slack_Bulk import format_errors, group_by_channel, summary_text, validate_rows
+from Slack_Cache import MISSING, TTLCache
+from Slack_Config import (
+    DEFAULT_CC_USER_IDS, JIRA_API_TOKEN, JIRA_URL, JIRA_USER_EMAIL, SLACK_API_URL, SLACK_BOT_TOKEN, WORK_TYPE_OPTIONS,
+    data_path,
+)
+from Slack_Events import parse_payload
+from Slack_Idempotency import (
+    DONE, NEW, CachedResponse, IdempotencyCache, Uncached, command_key, interaction_key, should_store,
+)
+from Slack_Jira import CreateMetaIndex, JiraClient
+from Slack_Ledger import COMMANDS as LEDGER_COMMANDS, MEETING, TaskLedger, ledger_command
+from Slack_Messages import (
+    build_fanout_report, build_jira_issue_message, build_meeting_dm, build_meeting_message, build_work_message,
+    meeting_recipients, message_link,
+)
+from Slack_Options import ACTION_INDEXES, OptionsProvider, block_suggestion_options, jira_source, work_type_source
+from Slack_Resilience import (
+    METHOD_BUDGETS, OPEN, TRANSIENT_ERROR_PREFIXES, BreakerRegistry, CircuitBreaker, breaker_settings, is_failure,
+)
+from Slack_SharedCache import SharedCache
+from Slack_Submissions import PARSERS, JiraIssueRequest, MeetingRequest, WorkBulkRequest, WorkRequest, parse_submission
+from Slack_Views import build_view_registry
+
+Slack_Logging.setup_logging()
+logger = logging.getLogger(__name__)
+
+HTTP_POOL_SIZE = int(os.environ.get("ASYNC_HTTP_POOL_SIZE", "100"))
+HTTP_TIMEOUT = float(os.environ.get("ASYNC_HTTP_TIMEOUT", "10"))
+MAX_IN_FLIGHT = int(os.environ.get("ASYNC_MAX_IN_FLIGHT", "1000"))
+CHANNEL_POST_RATE = float(os.environ.get("CHANNEL_POST_RATE", "1.0"))
+MEETING_DM_FANOUT = os.environ.get("MEETING_DM_FANOUT", "0") == "1"
+UNAVAILABLE_TEXT = "Slack 응답이 지연되고 있어 지금은 처리할 수 없습니다. 잠시 후 다시 시도해 주세요."
+
+view_templates = build_view_registry()
+idempotency = IdempotencyCache(
+    ttl=int(os.environ.get("IDEMPOTENCY_TTL", "600")),
+    max_size=int(os.environ.get("IDEMPOTENCY_MAX_KEYS", "10000")),
+    path=os.environ.get("IDEMPOTENCY_DB") or None,
+)
+duplicate_requests = Slack_Metrics.registry.counter(
+    "slack_app_duplicate_requests_total", "재시도 / 중복으로 걸러낸 요청 수", ("route", "state"))
+# name 라벨은 요청 본문에서 오므로 아래 목록에 없는 값은 "other"로 기록한다
+Slack_Metrics.known_names("command", ("/create_new_work", "/jira_issue_create", "/모임요청", "/heartbeat", *LEDGER_COMMANDS))
+Slack_Metrics.known_names("interaction", PARSERS)
+Slack_Metrics.known_names("options", ACTION_INDEXES)
+
+# 업스트림 회로 차단기 (Slack은 메서드별, Jira는 하나)
+BREAKER_SETTINGS = breaker_settings(os.environ)
+slack_breakers = BreakerRegistry(**BREAKER_SETTINGS)
+
+# Jira 클라이언트는 동기(requests)라 이벤트 루프 밖(asyncio.to_thread)에서 호출한다
+jira_client = None
+jira_meta = None
+jira_breaker = None
+if JIRA_URL:
+    jira_breaker = CircuitBreaker("jira", **BREAKER_SETTINGS)
+    jira_client = JiraClient(
+        JIRA_URL, JIRA_API_TOKEN, email=JIRA_USER_EMAIL,
+        pool_size=int(os.environ.get("JIRA_POOL_SIZE", "10")),
+        max_retries=int(os.environ.get("JIRA_MAX_RETRIES", "3")),
+        breaker=jira_breaker,
+    )
+    jira_meta = CreateMetaIndex(jira_client.createmeta, ttl=int(os.environ.get("JIRA_META_TTL", "600")))
+
+option_sources = {"work_type": work_type_source(WORK_TYPE_OPTIONS)}
+if jira_meta is not None:
+    option_sources["jira"] = jira_source(jira_meta)
+options_provider = OptionsProvider(option_sources, refresh_interval=int(os.environ.get("OPTIONS_REFRESH_INTERVAL", "60")))
+# DM 채널 캐시: SHARED_CACHE_PATH가 있으면 uvicorn 워커들과 공유 (히트는 워커 메모리에서 바로 처리된다)
+SHARED_CACHE_PATH = data_path("SHARED_CACHE_PATH", "shared_cache.db")
+DM_CACHE_TTL = int(os.environ.get("DM_CACHE_TTL", "86400"))
+DM_CACHE_NEGATIVE_TTL = int(os.environ.get("DM_CACHE_NEGATIVE_TTL", "300"))
+if SHARED_CACHE_PATH:
+    dm_channel_cache = SharedCache(SHARED_CACHE_PATH, "dm", ttl=DM_CACHE_TTL, negative_ttl=DM_CACHE_NEGATIVE_TTL)
+else:
+    dm_channel_cache = TTLCache(ttl=DM_CACHE_TTL, negative_ttl=DM_CACHE_NEGATIVE_TTL)
+# SQLite 저장소(공유 DM 캐시, IDEMPOTENCY_DB)는 잠금 대기(busy timeout)가 길 수 있어 이벤트 루프 밖에서 호출한다
+DM_CACHE_SHARED = isinstance(dm_channel_cache, SharedCache)
+
+
+async def off_loop(blocking: bool, func, *args):
+    """blocking이면 asyncio.to_thread로, 아니면(메모리 저장소) 바로 호출한다."""
+    if blocking:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+# 업무 원장 (/my_tasks, /team_tasks): gunicorn 서버와 같은 파일을 쓰면 양쪽 기록을 함께 조회한다
+LEDGER_PATH = data_path("LEDGER_PATH", "ledger.db")
+task_ledger = None
+if LEDGER_PATH and os.environ.get("LEDGER_ENABLED", "1") == "1":
+    task_ledger = TaskLedger(LEDGER_PATH, undated_days=int(os.environ.get("LEDGER_UNDATED_DAYS", "14")))
+
+
+class AsyncSlackApp:
+    """프레임워크 없이 동작하는 최소 ASGI 앱"""
+
+    def __init__(self):
+        self.client = None
+        self.session = None
+        self._slots = None
+        self._tasks = set()
+        self._channel_locks = {}
+        self._channel_last_post = {}
+        self._latencies = deque(maxlen=500)
+        self._completed = 0
+        self._failed = 0
+
+    # ---- 수명 주기 ----
+
+    async def startup(self):
+        connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector)
+        self.client = AsyncWebClient(
+            token=SLACK_BOT_TOKEN,
+            base_url=SLACK_API_URL.rstrip("/") + "/",
+            timeout=int(HTTP_TIMEOUT),
+            session=self.session,
+            retry_handlers=[
+                AsyncConnectionErrorRetryHandler(max_retry_count=2),
+                AsyncRateLimitErrorRetryHandler(max_retry_count=2),
+            ],
+        )
+        self._slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+        if SLACK_BOT_TOKEN:
+            # CC 대상 DM 채널을 미리 열어 둔다
+            self.spawn("cc-warmup", self.normalize_cc_user_ids(DEFAULT_CC_USER_IDS))
+        if jira_meta is not None:
+            jira_meta.start()
+        options_provider.start()
+        logger.info("🚀 ASGI Slack Command Server Started")
+
+    async def shutdown(self):
+        if self._tasks:
+            await asyncio.wait(self._tasks, timeout=30)
+        await self.session.close()
+
+    # ---- Slack 호출 ----
+
+    async def call(self, method: str, **kwargs) -> dict:
+        """METHOD_BUDGETS에 있는 메서드는 재시도를 포함해 그 시간 안에 끝내고, 회로 차단기가 열려 있으면 바로 실패한다."""
+        started = time.perf_counter()
+        breaker = slack_breakers.get(method)
+        if not breaker.allow():
+            response = {"ok": False, "error": "circuit_open"}
+        else:
+            try:
+                response = (await asyncio.wait_for(
+                    self.client.api_call(method, json=kwargs), METHOD_BUDGETS.get(method))).data
+            except SlackApiError as e:
+                response = e.response.data if isinstance(e.response.data, dict) else {"ok": False, "error": str(e)}
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                response = {"ok": False, "error": f"request_failed: {e.__class__.__name__}"}
+            breaker.record(is_failure(response))
+        Slack_Metrics.observe_slack_call(method, time.perf_counter() - started, response)
+        return response
+
+    async def open_dm_channel(self, user_id: str):
+        # 공유 캐시도 워커 메모리에 있으면 스레드를 거치지 않는다
+        channel_id = dm_channel_cache.peek(user_id) if DM_CACHE_SHARED else MISSING
+        if channel_id is MISSING:
+            channel_id = await off_loop(DM_CACHE_SHARED, dm_channel_cache.get, user_id)
+        if channel_id is not MISSING:
+            return channel_id
+        resp = await self.call("conversations.open", users=user_id)
+        if resp.get("ok"):
+            channel_id = resp["channel"]["id"]
+            await off_loop(DM_CACHE_SHARED, dm_channel_cache.set, user_id, channel_id)
+            return channel_id
+        error = str(resp.get("error"))
+        logger.warning("DM open 실패 %s: %s", user_id, error)
+        if not error.startswith(TRANSIENT_ERROR_PREFIXES):
+            await off_loop(DM_CACHE_SHARED, dm_channel_cache.set, user_id, None)
+        return None
+
+    async def normalize_cc_user_ids(self, user_ids: list[str]) -> list[str]:
+        # 캐시에 없는 ID들은 동시에 conversations.open
+        channels = await asyncio.gather(*(self.open_dm_channel(uid) for uid in user_ids))
+        return [uid for uid, channel_id in zip(user_ids, channels) if channel_id]
+
+    async def post_message(self, payload: dict) -> dict:
+        """채널당 CHANNEL_POST_RATE(건/초)를 넘지 않게 chat.postMessage 한다."""
+        channel = payload["channel"]
+        lock = self._channel_locks.setdefault(channel, asyncio.Lock())
+        async with lock:
+            wait = self._channel_last_post.get(channel, 0) + 1.0 / CHANNEL_POST_RATE - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._channel_last_post[channel] = time.monotonic()
+        return await self.call("chat.postMessage", **payload)
+
+    # ---- 백그라운드 처리 ----
+
+    def spawn(self, label: str, coro):
+        task = asyncio.create_task(self._run(label, coro))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, label: str, coro):
+        async with self._slots:
+            started = time.monotonic()
+            ok = False
+            try:
+                result = await coro
+                ok = not isinstance(result, dict) or result.get("ok", True)
+            except Exception:
+                logger.exception("%s 처리 실패", label)
+            elapsed = time.monotonic() - started
+            self._latencies.append(elapsed)
+            if ok:
+                self._completed += 1
+            else:
+                self._failed += 1
+            logger.info("%s 처리 완료 (%.1fms)", label, elapsed * 1000)
+
+    async def record_tasks(self, tasks: list):
+        """업무 원장 기록 (SQLite라 스레드에서). 실패해도 요청 처리는 성공으로 둔다."""
+        if task_ledger is None or not tasks:
+            return
+        try:
+            await asyncio.to_thread(task_ledger.record, tasks)
+        except Exception:
+            logger.exception("업무 원장 저장 실패")
+
+    async def process_work_request(self, work_type, title, content, period, plan_url, assignee_user_id, user_id=None):
+        normalized = await self.normalize_cc_user_ids(DEFAULT_CC_USER_IDS)
+        payload = build_work_message(work_type, title, content, period, plan_url, assignee_user_id, normalized)
+        response = await self.post_message(payload)
+        if response.get("ok"):
+            logger.info("신규 잡 메시지 전송 성공")
+            await self.record_tasks([{"kind": "work", "work_type": work_type, "title": title,
+                                      "assignee_user_id": assignee_user_id, "period": period,
+                                      "channel": response.get("channel"), "ts": response.get("ts")}])
+        else:
+            logger.error("Slack 메시지 전송 실패: %s", response.get("error"))
+        return response
+
+    async def process_work_bulk(self, rows, user_id):
+        """채널별로 동시에 보내고(같은 채널은 post_message가 속도를 맞춘다) 결과 요약을 요청자에게 DM으로 알린다."""
+        normalized = await self.normalize_cc_user_ids(DEFAULT_CC_USER_IDS)
+        rows = [row for channel_rows in group_by_channel(rows).values() for row in channel_rows]
+        responses = await asyncio.gather(*(
+            self.post_message(build_work_message(row.work_type, row.title, row.content, row.period, row.plan_url,
+                                                 row.assignee_user_id, normalized))
+            for row in rows
+        ))
+        results = list(zip(rows, responses))
+        failed = sum(1 for response in responses if not response.get("ok"))
+        logger.info("일괄 업무 요청 전송: %d건 (실패 %d건)", len(rows), failed)
+        await self.record_tasks([{"kind": "work", "work_type": row.work_type, "title": row.title,
+                                  "assignee_user_id": row.assignee_user_id, "period": row.period,
+                                  "channel": response.get("channel"), "ts": response.get("ts")}
+                                 for row, response in results if response.get("ok")])
+        notify = await self.post_message({"channel": user_id, "text": summary_text(results)})
+        if not notify.get("ok"):
+            logger.warning("일괄 요청 결과 DM 전송 실패: %s", notify.get("error"))
+        return {"ok": True, "sent": len(rows) - failed, "failed": failed}
+
+    async def send_meeting_dm(self, user_id, title, document, content, link):
+        """참석자 한 명에게 DM. 실패하면 사유, 성공하면 None"""
+        channel_id = await self.open_dm_channel(user_id)
+        if not channel_id:
+            return "dm_open_failed"
+        response = await self.post_message(build_meeting_dm(channel_id, title, document, content, link))
+        return None if response.get("ok") else response.get("error")
+
+    async def fan_out_meeting_dms(self, title, document, content, assignees, link="") -> dict:
+        """담당자 + 참조 인원에게 동시에 DM (DM 채널 열기 → 발송을 사람마다 따로 진행). 실패한 user id → 사유"""
+        recipients = meeting_recipients(assignees, DEFAULT_CC_USER_IDS)
+        errors = await asyncio.gather(*(self.send_meeting_dm(uid, title, document, content, link)
+                                        for uid in recipients))
+        failures = {uid: error for uid, error in zip(recipients, errors) if error}
+        logger.info("모임요청 DM 발송: %d명 (실패 %d명)", len(recipients), len(failures))
+        return failures
+
+    async def process_meeting_request(self, title, document, content, assignees, user_id=None):
+        response = await self.post_message(build_meeting_message(title, document, content, assignees))
+        if response.get("ok"):
+            logger.info("모임요청 메시지 전송 성공")
+            await self.record_tasks([{"kind": MEETING, "work_type": MEETING, "title": title, "assignee_user_id": uid,
+                                      "channel": response.get("channel"), "ts": response.get("ts")}
+                                     for uid in assignees or []])
+            if MEETING_DM_FANOUT:
+                link = message_link(response.get("channel"), response.get("ts"))
+                failures = await self.fan_out_meeting_dms(title, document, content, assignees, link)
+                if failures:
+                    logger.warning("모임요청 DM 실패: %s", failures)
+                    if user_id:
+                        total = len(meeting_recipients(assignees, DEFAULT_CC_USER_IDS))
+                        notify = await self.post_message(build_fanout_report(user_id, title, total, failures))
+                        if not notify.get("ok"):
+                            logger.warning("모임요청 DM 실패 알림 전송 실패: %s", notify.get("error"))
+        else:
+            logger.error("슬랙 모임요청 메시지 전송 실패: %s", response.get("error"))
+        return response
+
+    # ---- 라우트 ----
+
+    async def process_jira_issue(self, project_key, issuetype, summary, description, user_id):
+        result = await asyncio.to_thread(jira_client.create_issue, project_key, issuetype, summary, description)
+        if result.get("ok"):
+            logger.info("Jira 이슈 생성 성공: %s", result["key"])
+        else:
+            logger.error("Jira 이슈 생성 실패: %s %s", result.get("error"), result.get("detail"))
+        notify = await self.post_message(build_jira_issue_message(user_id, summary, result))
+        if not notify.get("ok"):
+            logger.warning("Jira 결과 DM 전송 실패: %s", notify.get("error"))
+        return result
+
+    async def open_modal(self, callback_id: str, trigger_id: str, **values) -> dict:
+        response = await self.call("views.open", trigger_id=trigger_id, view=view_templates.view(callback_id, **values))
+        logger.info("%s 모달 열기 응답: ok=%s error=%s", callback_id, response.get("ok"), response.get("error"))
+        return response
+
+    async def slash_command(self, form: dict):
+        """(status, 응답 dict 또는 None, 메트릭 이름)을 돌려준다."""
+        status, result = await self._slash_command(form)
+        return status, result, form.get("command")
+
+    async def _slash_command(self, form: dict):
+        command_text = form.get("command")
+        user_id = form.get("user_id")
+        trigger_id = form.get("trigger_id")
+        logger.info("Slash Command 요청: %s by %s", command_text, user_id)
+        Slack_Logging.log_payload(logger, "command", command_text, form)
+
+        if command_text == "/heartbeat":
+            return 200, {"status": "alive"}
+
+        args = form.get("text", "").split(None, 1)
+        if command_text == "/create_new_work" and args and args[0] in ("bulk", "일괄"):
+            # ASGI 모드에는 멤버 디렉터리가 없어 담당자는 멘션 / user id로만 받는다
+            if len(args) > 1 and args[1].strip():
+                rows, errors = validate_rows(args[1])
+                if errors:
+                    return 200, {"response_type": "ephemeral",
+                                 "text": "입력 오류가 있어 등록하지 않았습니다.\n" + format_errors(errors)}
+                self.spawn("work_bulk_create", self.process_work_bulk(rows, user_id))
+                return 200, {"response_type": "ephemeral",
+                             "text": f"{len(rows)}건을 접수했습니다. 결과는 DM으로 알려 드립니다."}
+            command_text = "/create_new_work bulk"
+
+        if command_text in LEDGER_COMMANDS:
+            if task_ledger is None:
+                return 200, {"response_type": "ephemeral", "text": "업무 원장이 설정되지 않았습니다."}
+            return 200, await asyncio.to_thread(ledger_command, task_ledger, command_text, user_id, form.get("text", ""))
+
+        modals = {
+            "/create_new_work": ("work_create_modal", {"initial_user": user_id}),
+            "/create_new_work bulk": ("work_bulk_create_modal", {}),
+            "/jira_issue_create": ("jira_issue_create_modal", {}),
+            "/모임요청": ("meeting_review_modal", {}),
+        }
+        if command_text in modals:
+            if not trigger_id:
+                return 200, {"response_type": "ephemeral",
+                             "text": "trigger_id가 없습니다. Slack 인터랙티브 명령에서만 동작합니다."}
+            callback_id, values = modals[command_text]
+            if callback_id == "jira_issue_create_modal" and jira_breaker is not None and jira_breaker.state == OPEN:
+                return 200, {"response_type": "ephemeral",
+                             "text": "Jira 응답이 없어 지금은 이슈를 만들 수 없습니다. 잠시 후 다시 시도해 주세요."}
+            modal_resp = await self.open_modal(callback_id, trigger_id, **values)
+            if not modal_resp.get("ok"):
+                error = str(modal_resp.get("error"))
+                if error.startswith(TRANSIENT_ERROR_PREFIXES):
+                    return 200, Uncached(response_type="ephemeral", text=UNAVAILABLE_TEXT)
+                return 200, {"response_type": "ephemeral", "text": f"모달을 띄우는 데 실패했습니다: {error}"}
+            return 200, None
+
+        return 200, {"response_type": "ephemeral", "text": f"알 수 없는 커맨드({command_text})입니다."}
+
+    async def interaction(self, data: dict):
+        """data: 파싱된 interactions payload"""
+        if not data:
+            return 400, None, None
+        status, result = await self._interaction(data)
+        return status, result, data.get("view", {}).get("callback_id")
+
+    async def _interaction(self, data: dict):
+        if data.get("type") != "view_submission":
+            return 200, None
+
+        callback_id, submission, errors = parse_submission(data)
+        if errors:
+            return 200, {"response_action": "errors", "errors": errors}
+
+        if isinstance(submission, WorkRequest):
+            self.spawn(callback_id, self.process_work_request(**submission.fields()))
+            return 200, {"response_action": "clear"}
+
+        if isinstance(submission, WorkBulkRequest):
+            rows, errors = validate_rows(submission.rows_text)
+            if errors:
+                return 200, {"response_action": "errors", "errors": {"rows": format_errors(errors)}}
+            self.spawn(callback_id, self.process_work_bulk(rows, submission.user_id))
+            return 200, {"response_action": "clear"}
+
+        if isinstance(submission, MeetingRequest):
+            self.spawn(callback_id, self.process_meeting_request(**submission.fields()))
+            return 200, {"response_action": "clear"}
+
+        if isinstance(submission, JiraIssueRequest):
+            if jira_client is None:
+                return 200, {"response_action": "errors", "errors": {"summary": "Jira 연동이 설정되지 않았습니다"}}
+            project_key, issuetype, errors = await asyncio.to_thread(
+                jira_meta.validate, submission.project_key, submission.issuetype)
+            if errors:
+                return 200, {"response_action": "errors", "errors": errors}
+            self.spawn(callback_id, self.process_jira_issue(
+                project_key, issuetype, submission.summary, submission.description, submission.user_id,
+            ))
+            return 200, {"response_action": "clear"}
+
+        return 200, None
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        return {
+            "ack_mode": True,
+            "submissions": {
+                "in_flight": len(self._tasks),
+                "completed": self._completed,
+                "failed": self._failed,
+                "latency_ms": {
+                    "p50": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else 0.0,
+                    "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1)
+                    if latencies else 0.0,
+                },
+            },
+            "options": options_provider.stats(),
+            "breakers": {**slack_breakers.stats(), **({"jira": jira_breaker.stats()} if jira_breaker else {})},
+        }
+
+    # ---- ASGI ----
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        path, method = scope["path"], scope["method"]
+        if method == "GET" and path == "/healthz":
+            # 헬스 체크: 본문 파싱 / 메트릭 / 로그 없이 바로 응답
+            return await self._respond(send, 200, b'{"status":"ok"}', b"application/json")
+        if method == "POST" and path in ("/slack/command", "/slack/interactions"):
+            started = time.perf_counter()
+            body = await self._read_body(receive)
+            form = {k: v[0] for k, v in parse_qs(body.decode("utf-8")).items()}
+            if path == "/slack/command":
+                route, handler, key = "command", self.slash_command, command_key(form)
+            else:
+                form = parse_payload(form.get("payload"))
+                route, handler, key = "interaction", self.interaction, interaction_key(form) if form else None
+            retry_num = dict(scope["headers"]).get(b"x-slack-retry-num")
+            duplicate = await self._check_duplicate(route, key, retry_num)
+            if duplicate is not None:
+                Slack_Metrics.observe_request(route, "duplicate", duplicate.status, time.perf_counter() - started)
+                return await self._respond(send, duplicate.status, duplicate.body, duplicate.content_type.encode())
+            try:
+                status, result, name = await handler(form)
+            except BaseException:
+                if key is not None:
+                    await off_loop(bool(idempotency.path), idempotency.release, key)
+                raise
+            Slack_Metrics.observe_request(route, name, status, time.perf_counter() - started)
+            if key is not None:
+                body, content_type = self._encode(result)
+                if isinstance(result, Uncached) or not should_store(status, body):
+                    await off_loop(bool(idempotency.path), idempotency.release, key)
+                else:
+                    await off_loop(bool(idempotency.path), idempotency.complete, key,
+                                   CachedResponse(status, body, content_type.decode()))
+                return await self._respond(send, status, body, content_type)
+        elif method == "POST" and path == "/slack/options":
+            started = time.perf_counter()
+            form = {k: v[0] for k, v in parse_qs((await self._read_body(receive)).decode("utf-8")).items()}
+            data = parse_payload(form.get("payload"))
+            if not data:
+                status, result = 400, None
+            else:
+                status, result = 200, block_suggestion_options(options_provider, data)
+            Slack_Metrics.observe_request("options", (data or {}).get("action_id"), status, time.perf_counter() - started)
+        elif method == "GET" and path == "/metrics":
+            return await self._respond(send, 200, Slack_Metrics.registry.render().encode("utf-8"),
+                                       Slack_Metrics.CONTENT_TYPE.encode())
+        elif method == "GET" and path == "/slack/worker/stats":
+            status, result = 200, self.stats()
+        else:
+            logger.warning("404 Not Found: %s %s", method, path)
+            return await self._respond(send, 404, "요청한 URL이 존재하지 않습니다.".encode("utf-8"), b"text/plain; charset=utf-8")
+
+        await self._respond(send, status, *self._encode(result))
+
+    @staticmethod
+    async def _check_duplicate(route: str, key, retry_num):
+        """재시도 / 중복 요청이면 돌려줄 CachedResponse, 처음 요청이면 None"""
+        if key is None:
+            if not retry_num:
+                return None
+            # 키를 만들 수 없는 재시도는 처음 요청이 이미 처리 중이라고 보고 버린다
+            duplicate_requests.inc(route, "retry")
+            return CachedResponse(200, b"", "text/plain; charset=utf-8")
+        state, cached = await off_loop(bool(idempotency.path), idempotency.begin, key)
+        if state == NEW:
+            return None
+        duplicate_requests.inc(route, state)
+        logger.info("중복 요청 무시 (%s): %s retry=%s", state, key, retry_num)
+        if state == DONE:
+            return cached
+        return CachedResponse(200, b"", "text/plain; charset=utf-8")
+
+    @staticmethod
+    def _encode(result):
+        if result is None:
+            return b"", b"text/plain; charset=utf-8"
+        return Slack_Json.dumps(result), b"application/json"
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def _respond(send, status: int, body: bytes, content_type: bytes):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+app = AsyncSlackApp()
+Slack_Metrics.registry.gauge(
+    "slack_app_submission_in_flight", "처리 중인 백그라운드 제출 작업 수", lambda: len(app._tasks),
+)
@@ -0,0 +1,150 @@
+"""업무 요청 일괄 등록 (/create_new_work bulk)
+
+한 줄에 업무 하나씩 TSV(스프레드시트 붙여넣기) 또는 CSV로 받는다.
+열 순서: 업무유형, 제목, 시작일, 종료일, 담당자[, 내용[, 기획서 URL]]
+- 업무유형: client_task 같은 키 또는 "클라" 같은 표시 이름
+- 날짜: YYYY-MM-DD (둘 다 비우면 기간 미설정)
+- 담당자: <@U...> 멘션, user id, 또는 Slack 표시 이름(@name)
+모든 줄을 한 번에 검증하고, 오류가 하나라도 있으면 아무것도 보내지 않고 오류 목록을 돌려준다.
+"""
+import csv
+import datetime
+import re
+from collections import namedtuple
+
+from Slack_Config import CHANNEL_MAP, TARGET_CHANNEL, WORK_TYPE_OPTIONS
+
+# 한 번에 받을 수 있는 최대 줄 수 (모달 입력 3000자 기준으로 충분한 값)
+MAX_ROWS = 200
+# 오류 / 실패 목록은 이 개수까지만 보여 준다 (Slack 메시지 길이 제한)
+MAX_LISTED = 20
+
+COLUMNS = ("work_type", "title", "start_date", "end_date", "assignee", "content", "plan_url")
+REQUIRED_COLUMNS = 5
+HEADER_NAMES = {"work_type", "업무유형", "업무 유형", "담당 부서", "부서"}
+
+BulkRow = namedtuple("BulkRow", ["line", "work_type", "title", "content", "period", "plan_url",
+                                 "assignee_user_id", "source"])
+
+_MENTION = re.compile(r"^<@([UW][A-Z0-9]+)(?:\|[^>]*)?>$")
+_USER_ID = re.compile(r"^[UW][A-Z0-9]{6,}$")
+
+# 표시 이름 / 키(소문자) → 업무유형 키
+_WORK_TYPES = {}
+for _key, _label in WORK_TYPE_OPTIONS.items():
+    _WORK_TYPES[_key.lower()] = _key
+    _WORK_TYPES[_key.replace("_task", "").lower()] = _key
+    _WORK_TYPES[_label.lower()] = _key
+
+
+def resolve_work_type(value: str):
+    """client_task / client / 클라 같은 입력을 업무유형 키로 바꾼다. 모르는 값이면 None."""
+    return _WORK_TYPES.get((value or "").strip().lower())
+
+
+def parse_rows(text: str) -> list:
+    """입력을 [(줄 번호, [칸, ...], 원문), ...]으로 나눈다. 첫 줄에 탭이 있으면 TSV, 아니면 CSV."""
+    lines = [(n, line) for n, line in enumerate((text or "").splitlines(), 1) if line.strip()]
+    if not lines:
+        return []
+    delimiter = "\t" if "\t" in lines[0][1] else ","
+    rows = []
+    for (n, line), cells in zip(lines, csv.reader((line for _, line in lines), delimiter=delimiter)):
+        cells = [c.strip() for c in cells]
+        if not rows and cells and cells[0].lower() in HEADER_NAMES:
+            continue  # 스프레드시트에서 머리글까지 복사한 경우
+        rows.append((n, cells, line))
+    return rows
+
+
+def _parse_date(value: str):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def resolve_assignee(value: str, names: dict = None):
+    """멘션 / user id / 표시 이름을 user id로 바꾼다. 못 찾으면 None."""
+    match = _MENTION.match(value)
+    if match:
+        return match.group(1)
+    if _USER_ID.match(value):
+        return value
+    if names is not None:
+        return names.get(value.lstrip("@").lower())
+    return None
+
+
+def validate_rows(text: str, names: dict = None):
+    """(BulkRow 목록, [(줄 번호, 오류), ...]). names: 표시 이름(소문자) → user id (없으면 멘션 / id만 허용)"""
+    parsed = parse_rows(text)
+    if not parsed:
+        return [], [(0, "입력된 업무가 없습니다")]
+    if len(parsed) > MAX_ROWS:
+        return [], [(0, f"한 번에 최대 {MAX_ROWS}건까지 등록할 수 있습니다 (입력 {len(parsed)}건)")]
+    rows, errors = [], []
+    for line, cells, source in parsed:
+        if len(cells) < REQUIRED_COLUMNS:
+            errors.append((line, f"열이 부족합니다 ({len(cells)}/{REQUIRED_COLUMNS}: 업무유형, 제목, 시작일, 종료일, 담당자)"))
+            continue
+        fields = dict(zip(COLUMNS, cells + [""] * (len(COLUMNS) - len(cells))))
+        problems = []
+        work_type = resolve_work_type(fields["work_type"])
+        if work_type is None:
+            problems.append(f"알 수 없는 업무유형 '{fields['work_type']}'")
+        if not fields["title"]:
+            problems.append("제목이 비어 있습니다")
+        start, end = fields["start_date"], fields["end_date"]
+        period = "기간 미설정"
+        if start or end:
+            start_date, end_date = _parse_date(start), _parse_date(end)
+            if start_date is None or end_date is None:
+                problems.append("날짜는 YYYY-MM-DD 형식으로 시작일 / 종료일을 모두 입력하세요")
+            elif start_date > end_date:
+                problems.append("종료일이 시작일보다 빠릅니다")
+            else:
+                period = f"{start} ~ {end}"
+        assignee = resolve_assignee(fields["assignee"], names)
+        if assignee is None:
+            problems.append(f"담당자를 찾을 수 없습니다 '{fields['assignee']}'")
+        if problems:
+            errors.append((line, ", ".join(problems)))
+            continue
+        rows.append(BulkRow(line, work_type, fields["title"], fields["content"], period,
+                            fields["plan_url"], assignee, source))
+    return rows, errors
+
+
+def group_by_channel(rows) -> dict:
+    """발송 채널(CHANNEL_MAP) → 그 채널로 갈 BulkRow 목록 (입력 순서 유지)"""
+    groups = {}
+    for row in rows:
+        groups.setdefault(CHANNEL_MAP.get(row.work_type, TARGET_CHANNEL), []).append(row)
+    return groups
+
+
+def format_errors(errors) -> str:
+    lines = [f"{line}번째 줄: {message}" if line else message for line, message in errors[:MAX_LISTED]]
+    if len(errors) > MAX_LISTED:
+        lines.append(f"외 {len(errors) - MAX_LISTED}건")
+    return "\n".join(lines)
+
+
+def summary_text(results) -> str:
+    """results: [(BulkRow, Slack 응답), ...] → 요청자에게 보낼 결과 요약 (실패한 줄은 다시 붙여넣을 수 있게 원문 첨부)"""
+    failed = [(row, response) for row, response in results if not response.get("ok")]
+    succeeded = len(results) - len(failed)
+    per_channel = {}
+    for row, response in results:
+        channel = CHANNEL_MAP.get(row.work_type, TARGET_CHANNEL)
+        per_channel[channel] = per_channel.get(channel, 0) + (1 if response.get("ok") else 0)
+    lines = [f"일괄 업무 요청 결과: 성공 {succeeded}건 / 실패 {len(failed)}건"]
+    lines += [f"• <#{channel}>: {count}건" for channel, count in per_channel.items() if count]
+    if failed:
+        lines.append("*실패:*")
+        lines += [f"• {row.line}번째 줄 {row.title}: {response.get('error')}" for row, response in failed[:MAX_LISTED]]
+        if len(failed) > MAX_LISTED:
+            lines.append(f"외 {len(failed) - MAX_LISTED}건")
+        lines.append("```" + "\n".join(row.source for row, _ in failed) + "```")
+    return "\n".join(lines)
@@ -0,0 +1,78 @@
+import threading
+import time
+
+MISSING = object()
+
+
+class TTLCache:
+    """스레드 안전한 간단한 TTL 캐시.
+
+    실패 결과(None)는 negative_ttl 동안만 캐시해서 같은 실패를 반복 호출하지 않되 빨리 재시도되게 한다.
+    """
+
+    def __init__(self, ttl: float = 3600, negative_ttl: float = 60, max_size: int = 10000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._data = {}
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> 조회 중인 스레드가 끝나면 set 되는 Event
+
+    def get(self, key, default=MISSING):
+        """캐시된 값을 돌려준다. 없거나 만료되면 default(미지정 시 MISSING)."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            with self._lock:
+                self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key, value):
+        ttl = self.ttl if value is not None else self.negative_ttl
+        with self._lock:
+            if len(self._data) >= self.max_size and key not in self._data:
+                # 가장 먼저 만료될 항목 하나를 비운다
+                oldest = min(self._data, key=lambda k: self._data[k][1])
+                del self._data[oldest]
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def get_or_fetch(self, key, fetch):
+        """캐시된 값을 돌려주고, 없으면 fetch() 한다. 같은 키를 동시에 찾는 스레드 중 하나만 fetch 한다.
+
+        fetch()는 캐시할 값(None이면 negative 캐시)을 돌려주고, 일시적 실패면 MISSING을 돌려준다.
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        with self._lock:
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+        if not owner:
+            event.wait()
+            value = self.get(key)
+            return None if value is MISSING else value
+        try:
+            value = fetch()
+            if value is MISSING:
+                return None
+            self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __contains__(self, key):
+        return self.get(key) is not MISSING
+
+    def __len__(self):
+        return len(self._data)
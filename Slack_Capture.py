@@ -0,0 +1,125 @@
+"""요청 캡처 (회귀 벤치마크 재생용)
+
+CAPTURE_PATH를 지정하면 /slack/command, /slack/interactions 요청 본문과 도착 시각 / 처리 시간을 JSONL로 남긴다.
+benchmarks/replay.py가 이 파일을 원래 간격(또는 N배속)으로 다시 보낸다.
+
+- 사용자가 입력한 내용(text/value/title 등)과 이름은 글자 수와 구분자(공백, 탭, 쉼표, 줄바꿈)만 남기고 가린다
+  → 요청 크기와 형태는 유지되고 내용은 남지 않는다. 선택형 값(selected_option 등)과 id는 그대로 둔다
+- 검증 토큰(token)은 저장하지 않는다
+- 요청 스레드는 큐에 넣기만 하고 가리기 / 직렬화 / 쓰기는 백그라운드 스레드가 한다 (큐가 차면 버린다)
+"""
+import logging
+import queue
+import random
+import re
+import threading
+import time
+
+import Slack_Json
+from Slack_Logging import REDACT_KEYS, TOKEN_PATTERN
+
+logger = logging.getLogger(__name__)
+
+MASK_KEYS = REDACT_KEYS | {"user_name", "name", "username", "real_name", "team_domain", "channel_name"}
+DROP_KEYS = {"token"}
+# 이 키 아래의 value는 사용자가 고른 선택지(업무 유형, 프로젝트 키 등)라 재생에 필요하므로 남긴다
+KEEP_PARENTS = {"selected_option", "selected_options", "initial_option"}
+
+_WORD = re.compile(r"\w")
+_FIRST_WORD = re.compile(r"(\S*)(.*)", re.S)
+
+
+def mask(text: str) -> str:
+    return _WORD.sub("x", TOKEN_PATTERN.sub("", text))
+
+
+def scrub(value, parent: str = None, depth: int = 0):
+    """dict/list를 복사하며 MASK_KEYS의 문자열 값을 가리고 DROP_KEYS는 뺀다."""
+    if depth > 12:
+        return None
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key in DROP_KEYS:
+                continue
+            if key in MASK_KEYS and isinstance(item, str) and parent not in KEEP_PARENTS:
+                result[key] = mask(item)
+            else:
+                result[key] = scrub(item, key, depth + 1)
+        return result
+    if isinstance(value, list):
+        return [scrub(item, parent, depth + 1) for item in value]
+    if isinstance(value, str):
+        return TOKEN_PATTERN.sub("[redacted]", value)
+    return value
+
+
+def scrub_command(form: dict) -> dict:
+    """슬래시 커맨드: text의 첫 단어(예: bulk)는 하위 명령이라 남기고 나머지만 가린다."""
+    head, rest = _FIRST_WORD.match(form.get("text") or "").groups()
+    result = scrub({k: v for k, v in form.items() if k != "text"})
+    result["text"] = head + mask(rest)
+    return result
+
+
+class TrafficRecorder:
+    """요청을 JSONL로 기록한다. 한 줄: {"ts", "path", "form", "status", "elapsed_ms"}
+
+    interactions의 form은 {"payload": <파싱된 payload>} 형태로 저장한다.
+    """
+
+    def __init__(self, path: str, sample: float = 1.0, max_queue: int = 10000):
+        self.path = path
+        self.sample = sample
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.dropped = 0
+        threading.Thread(target=self._run, name="traffic-capture", daemon=True).start()
+
+    def record(self, path: str, form: dict, payload=None, status: int = 200, elapsed: float = 0.0):
+        if self.sample < 1 and random.random() >= self.sample:
+            return
+        try:
+            self._queue.put_nowait((time.time(), path, form, payload, status, elapsed))
+        except queue.Full:
+            self.dropped += 1
+
+    def _entry(self, ts, path, form, payload, status, elapsed) -> dict:
+        if payload is None and isinstance(form.get("payload"), str):
+            payload = Slack_Json.loads(form["payload"])
+        scrubbed = {"payload": scrub(payload)} if payload is not None else scrub_command(form)
+        return {"ts": round(ts, 4), "path": path, "form": scrubbed, "status": status,
+                "elapsed_ms": round(elapsed * 1000, 2)}
+
+    def _run(self):
+        with open(self.path, "ab") as f:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < 100:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for item in batch:
+                    try:
+                        f.write(Slack_Json.dumps(self._entry(*item)) + b"\n")
+                        self.written += 1
+                    except Exception:
+                        logger.exception("요청 캡처 기록 실패")
+                f.flush()
+
+    def stats(self) -> dict:
+        return {"path": self.path, "written": self.written, "dropped": self.dropped, "queued": self._queue.qsize()}
+
+
+def load(path: str) -> list:
+    """캡처 파일을 읽어 도착 시각 순으로 돌려준다 (깨진 줄은 건너뛴다)."""
+    entries = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                entries.append(Slack_Json.loads(line))
+            except ValueError:
+                continue
+    entries.sort(key=lambda e: e["ts"])
+    return entries
@@ -0,0 +1,63 @@
+import os
+
+SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
+SLACK_SIGNING_SECRET = os.environ.get("SLACK_SIGNING_SECRET")  # /slack/events 요청 서명 검증 (없으면 /slack/events는 404)
+SLACK_API_URL = os.environ.get("SLACK_API_URL", "https://slack.com/api")  # 로컬 테스트 시 가짜 서버로 교체
+JIRA_URL = os.environ.get("JIRA_URL")
+JIRA_API_TOKEN = os.environ.get("JIRA_API_TOKEN")
+JIRA_USER_EMAIL = os.environ.get("JIRA_USER_EMAIL")  # Jira Cloud: 이메일 + API 토큰(Basic), 없으면 Bearer(PAT)
+# SQLite 저장소(outbox, 리마인더, 업무 원장, 워커 간 공유 캐시)를 둘 디렉터리. 없으면 *_PATH로 직접 지정한 저장소만 쓴다
+DATA_DIR = os.environ.get("DATA_DIR", "")
+
+
+def data_path(env_name: str, filename: str) -> str:
+    """환경 변수 env_name이 있으면 그 경로, 없으면 DATA_DIR/filename. 둘 다 없으면 "" (그 저장소를 쓰지 않는다)"""
+    path = os.environ.get(env_name)
+    if path is not None:
+        return path
+    return os.path.join(DATA_DIR, filename) if DATA_DIR else ""
+
+
+# 업무 유형 → 슬랙 채널 ID 매핑 (예시, 실제 채널 ID로 변경 필요)
+CHANNEL_MAP = {
+    "client_task": "C09QEGZ4W92",
+    "planning_task": "C09PVGS3U31",
+    "qa_task": "C09Q4JY193M",
+    "character_task": "C09Q7H0QB0D",
+    "background_task": "C09Q4J03Y1Z",
+    "concept_task": "C09Q4JJ1AM9",
+    "animation_task": "C09QB1AJBCJ",
+    "effect_task": "C09QPTJ3KMX",
+#   "art_task": "C09C4S28412", # 주석처리
+    "server_task": "C09QB1H753L",
+    "ta_task": "C09Q7H3QA1K",
+    "test_task": "C09PWF7SGKH",
+    "ui_task": "C09QPTE5BSM"
+}
+
+# 기본 채널을 client_task 채널로 지정
+TARGET_CHANNEL = CHANNEL_MAP["client_task"]
+
+
+WORK_TYPE_OPTIONS = {
+    "client_task": "클라",
+    "planning_task": "기획",
+    "qa_task": "품질",
+    "character_task": "캐릭터",
+    "background_task": "배경",
+    "concept_task": "컨셉",
+    "animation_task": "애니",
+    "effect_task": "VFX",
+#   "art_task": "아트", # 주석처리
+    "server_task": "서버",
+    "ta_task": "TA",
+    "test_task": "테스트",
+    "ui_task": "UI"
+}
+
+PREFIX_MAP = {k: f"{v}-" for k, v in WORK_TYPE_OPTIONS.items()}
+
+# 기획리뷰 채널
+MEETING_REQUEST_CHANNEL = "C09QF1TKQQ4"
+
+DEFAULT_CC_USER_IDS = ["U09Q5HLF3R6","U09Q13V4E75","U09Q7GTU0BU"]# 예: 홍석기,노승한,김주현 PM님들
@@ -0,0 +1,81 @@
+import hashlib
+import hmac
+import logging
+import time
+
+import Slack_Json
+
+logger = logging.getLogger(__name__)
+
+# 서명 타임스탬프 허용 오차 (재전송 공격 방지, Slack 권장 5분)
+MAX_CLOCK_SKEW = 60 * 5
+
+# 처리하는 envelope / 이벤트 종류 (메트릭 name 라벨 허용 목록에도 쓴다)
+EVENT_TYPES = (
+    "url_verification", "event_callback",
+    "user_change", "team_join", "member_joined_channel", "member_left_channel",
+)
+
+
+def verify_signature(signing_secret: str, timestamp: str, body: bytes, signature: str, now: float = None) -> bool:
+    """X-Slack-Signature 검증: v0=HMAC-SHA256(signing_secret, "v0:{timestamp}:{body}")"""
+    if not timestamp or not signature:
+        return False
+    try:
+        if abs((now or time.time()) - int(timestamp)) > MAX_CLOCK_SKEW:
+            return False
+    except ValueError:
+        return False
+    base = b"v0:" + timestamp.encode() + b":" + body
+    expected = "v0=" + hmac.new(signing_secret.encode(), base, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def parse_payload(raw):
+    """interactions / options 요청의 payload 필드, Events API 본문 → dict. 비어 있거나 JSON 객체가 아니면 None"""
+    if not raw:
+        return None
+    try:
+        data = Slack_Json.loads(raw)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def apply_event(directory, event: dict) -> bool:
+    """멤버 관련 이벤트 하나를 디렉터리에 반영한다. 처리한 이벤트면 True."""
+    event_type = event.get("type")
+    if event_type in ("user_change", "team_join"):
+        user = event.get("user")
+        if isinstance(user, dict) and user.get("id"):
+            directory.upsert(user)
+            return True
+    elif event_type in ("member_joined_channel", "member_left_channel"):
+        channel, user = event.get("channel"), event.get("user")
+        if isinstance(channel, str) and isinstance(user, str):
+            if event_type == "member_joined_channel":
+                directory.join_channel(channel, user)
+            else:
+                directory.leave_channel(channel, user)
+            return True
+    return False
+
+
+def handle_envelope(directory, envelope: dict):
+    """Events API 요청 본문을 처리하고 (HTTP status, 응답 dict 또는 None)을 돌려준다.
+
+    이벤트 반영은 메모리 갱신뿐이라 요청 스레드에서 바로 처리한다 (Slack 3초 응답 제한 내).
+    """
+    if not isinstance(envelope, dict):
+        return 400, None
+    envelope_type = envelope.get("type")
+    if envelope_type == "url_verification":
+        return 200, {"challenge": envelope.get("challenge")}
+    if envelope_type == "event_callback":
+        event = envelope.get("event")
+        if not isinstance(event, dict):
+            return 400, None
+        if not apply_event(directory, event):
+            logger.debug("처리하지 않는 이벤트: %s", event.get("type"))
+        return 200, None
+    return 400, None
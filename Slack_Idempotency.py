@@ -0,0 +1,194 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import Slack_Json
+from Slack_Cache import MISSING
+
+logger = logging.getLogger(__name__)
+
+# 처음 처리한 요청의 응답 (재시도/중복 요청에 그대로 돌려준다)
+CachedResponse = namedtuple("CachedResponse", ["status", "body", "content_type"])
+
+NEW = "new"          # 처음 보는 키 → 호출한 쪽이 처리하고 complete()/release() 해야 한다
+PENDING = "pending"  # 다른 요청(다른 워커 포함)이 처리 중
+DONE = "done"        # 이미 처리됨 → 저장된 응답 사용
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency (
+    key TEXT PRIMARY KEY,
+    status INTEGER,
+    body BLOB,
+    content_type TEXT,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class Uncached(dict):
+    """저장하지 않을 응답 dict (업스트림 장애 안내 등 잠시 뒤 같은 요청을 다시 처리하면 결과가 달라지는 응답)"""
+
+
+def should_store(status: int, body: bytes) -> bool:
+    """처음 응답을 저장해 재시도 / 중복 요청에 돌려줄지. 5xx와 view_submission 입력 오류는 저장하지 않는다.
+
+    view_submission 키(view.id + hash)는 사용자가 입력을 고쳐도 바뀌지 않으므로, errors 응답을 저장하면
+    고쳐서 다시 제출해도 TTL 동안 같은 오류를 받게 된다 (바쁨 / 업스트림 장애 안내도 errors 응답이다).
+    """
+    if status >= 500:
+        return False
+    if body[:1] == b"{" and b'"response_action"' in body:
+        try:
+            return Slack_Json.loads(body).get("response_action") != "errors"
+        except ValueError:
+            return True
+    return True
+
+
+def command_key(form: dict):
+    """슬래시 커맨드: trigger_id는 호출마다 유일하고 Slack 재시도에도 같은 값이 온다."""
+    trigger_id = form.get("trigger_id")
+    return f"cmd:{form.get('team_id', '')}:{trigger_id}" if trigger_id else None
+
+
+def interaction_key(data: dict):
+    """view_submission: view.id + view.hash (같은 모달 상태의 재시도/중복 제출), 그 외는 trigger_id"""
+    view = data.get("view") or {}
+    if data.get("type") == "view_submission" and view.get("id"):
+        return f"view:{view['id']}:{view.get('hash', '')}"
+    trigger_id = data.get("trigger_id")
+    return f"act:{trigger_id}" if trigger_id else None
+
+
+class IdempotencyCache:
+    """Slack 재시도(X-Slack-Retry-Num)와 중복 제출을 걸러내는 캐시.
+
+    - 메모리: 크기 제한 LRU + TTL (워커 내에서 즉시 판정)
+    - path 지정 시 SQLite 공유 저장소: gunicorn 워커 여러 개가 같은 키를 본다
+    처리 중(PENDING) 표시는 pending_ttl 뒤 만료되므로, 처리하던 워커가 죽어도 키가 영구히 잠기지 않는다.
+    """
+
+    def __init__(self, ttl: float = 600, pending_ttl: float = 60, max_size: int = 10000, path: str = None):
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self.max_size = max_size
+        self.path = path
+        self._entries = OrderedDict()  # key -> (CachedResponse 또는 None(처리 중), 만료 시각)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self._purged_at = time.time()
+        if path:
+            conn = self._conn()
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, response, expires_at):
+        with self._lock:
+            self._entries[key] = (response, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _local_lookup(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[1] < now:
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def begin(self, key: str):
+        """-> (NEW | PENDING | DONE, CachedResponse 또는 None)"""
+        now = time.time()
+        cached = self._local_lookup(key, now)
+        if cached is not MISSING:
+            self.hits += 1
+            return (DONE, cached) if cached is not None else (PENDING, None)
+        if self.path:
+            try:
+                state, cached = self._shared_begin(key, now)
+            except sqlite3.Error:
+                logger.exception("idempotency 저장소 조회 실패, 메모리 캐시만 사용")
+            else:
+                if state != NEW:
+                    self.hits += 1
+                    if state == DONE:
+                        self._remember(key, cached, now + self.ttl)
+                    return state, cached
+        self._remember(key, None, now + self.pending_ttl)
+        return NEW, None
+
+    def _shared_begin(self, key, now):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT status, body, content_type, expires_at FROM idempotency WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[3] >= now:
+                conn.execute("COMMIT")
+                if row[0] is None:
+                    return PENDING, None
+                return DONE, CachedResponse(row[0], row[1], row[2])
+            conn.execute(
+                "INSERT OR REPLACE INTO idempotency (key, status, body, content_type, expires_at) "
+                "VALUES (?, NULL, NULL, NULL, ?)",
+                (key, now + self.pending_ttl),
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        return NEW, None
+
+    def complete(self, key: str, response: CachedResponse):
+        """처리 결과를 저장한다. 이후 같은 키의 요청은 이 응답을 바로 받는다."""
+        expires_at = time.time() + self.ttl
+        self._remember(key, response, expires_at)
+        if self.path:
+            try:
+                self._conn().execute(
+                    "INSERT OR REPLACE INTO idempotency (key, status, body, content_type, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, response.status, response.body, response.content_type, expires_at),
+                )
+            except sqlite3.Error:
+                logger.exception("idempotency 응답 저장 실패")
+            if expires_at - self._purged_at > 2 * self.ttl:
+                self._purged_at = time.time()
+                self.purge()
+
+    def release(self, key: str):
+        """처리에 실패한 키를 지워 Slack 재시도가 다시 처리되게 한다."""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.path:
+            try:
+                self._conn().execute("DELETE FROM idempotency WHERE key = ?", (key,))
+            except sqlite3.Error:
+                logger.exception("idempotency 키 삭제 실패")
+
+    def purge(self):
+        """공유 저장소에서 만료된 키를 지운다."""
+        if self.path:
+            try:
+                self._conn().execute("DELETE FROM idempotency WHERE expires_at < ?", (time.time(),))
+            except sqlite3.Error:
+                logger.exception("idempotency 만료 키 정리 실패")
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,220 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import Slack_Json
+from Slack_Resilience import not_sent, retry_after
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) 초
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class JiraClient:
+    """커넥션 풀을 공유하는 Jira REST(v2) 클라이언트.
+
+    - email을 주면 Basic 인증(Jira Cloud: 이메일 + API 토큰), 없으면 Bearer(PAT)
+    - 429/5xx/연결 실패는 지수 백오프 + jitter로 재시도 (429는 Retry-After 준수)
+    - 이슈 생성(POST, idempotent=False)은 요청이 Jira에 닿지 않은 실패(연결 거부 / 연결 타임아웃)와 429만 재시도한다.
+      전송 뒤 끊김 / 읽기 타임아웃 / 5xx는 이미 생성됐을 수 있어 바로 돌려준다 (response_lost, http_5xx)
+    - breaker(CircuitBreaker)를 주면 열린 동안 호출 없이 바로 실패한다 (status 0, circuit_open)
+    """
+
+    def __init__(self, base_url: str, token: str, email: str = None, pool_size: int = 10,
+                 timeout=DEFAULT_TIMEOUT, max_retries: int = 3, backoff_base: float = 0.5,
+                 max_backoff: float = 8.0, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.breaker = breaker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if email:
+            self.session.auth = (email, token)
+        elif token:
+            self.session.headers.update({"Authorization": f"Bearer {token}"})
+        self.session.headers.update({"Accept": "application/json"})
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method: str, path: str, payload: dict = None, params: dict = None,
+                idempotent: bool = True):
+        """(HTTP status, 응답 JSON)을 돌려준다. 네트워크 오류로 끝나면 status는 0."""
+        if self.breaker is not None and not self.breaker.allow():
+            return 0, {"errorMessages": ["circuit_open"]}
+        status, result = self._request(method, path, payload, params, idempotent)
+        if self.breaker is not None:
+            self.breaker.record(status == 0 or status >= 500)
+        return status, result
+
+    def _request(self, method, path, payload, params, idempotent):
+        url = f"{self.base_url}{path}"
+        body = Slack_Json.dumps(payload) if payload is not None else None
+        status, result = 0, {"errorMessages": ["request_failed"]}
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.request(
+                    method, url, params=params, data=body,
+                    headers={"Content-Type": "application/json"} if body is not None else None,
+                    timeout=self.timeout,
+                )
+            except requests.ConnectionError as e:
+                logger.warning("Jira %s %s 연결 실패 (시도 %d): %s", method, path, attempt + 1, e)
+                if not idempotent and not not_sent(e):
+                    return 0, {"errorMessages": [f"response_lost: {e.__class__.__name__}"]}
+                result = {"errorMessages": [f"request_failed: {e.__class__.__name__}"]}
+            except requests.RequestException as e:
+                logger.warning("Jira %s %s 호출 실패 (시도 %d): %s", method, path, attempt + 1, e)
+                if not idempotent:
+                    return 0, {"errorMessages": [f"response_lost: {e.__class__.__name__}"]}
+                result = {"errorMessages": [f"request_failed: {e.__class__.__name__}"]}
+            else:
+                status = response.status_code
+                try:
+                    result = Slack_Json.loads(response.content) if response.content else {}
+                except ValueError:
+                    result = {"errorMessages": [f"invalid_response: HTTP {status}"]}
+                if status not in RETRY_STATUS or (status != 429 and not idempotent):
+                    return status, result
+                logger.warning("Jira %s %s HTTP %d (시도 %d)", method, path, status, attempt + 1)
+                if status == 429 and attempt < self.max_retries:
+                    time.sleep(min(self.max_backoff, retry_after(response)))
+                    continue
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt))
+        return status, result
+
+    def createmeta(self) -> list:
+        """프로젝트별 생성 가능한 이슈 타입 목록"""
+        status, result = self.request(
+            "GET", "/rest/api/2/issue/createmeta", params={"expand": "projects.issuetypes"})
+        if status != 200:
+            raise RuntimeError(f"Jira createmeta 조회 실패: HTTP {status} {error_message(result)}")
+        return result.get("projects", [])
+
+    def create_issue(self, project_key: str, issuetype: str, summary: str, description: str = "") -> dict:
+        """이슈를 만든다. Slack 응답과 같은 형식({"ok": ..., "key"/"error": ...})으로 돌려준다.
+
+        실패 시 retryable: 요청이 Jira에 닿지 않았거나(request_failed, circuit_open) 429라 다시 보내도 중복 생성이 없음.
+        uncertain: 전송 뒤 응답을 못 받았거나(response_lost) 5xx라 이미 생성됐을 수 있음 (재시도하지 않고 사용자에게 알린다).
+        """
+        fields = {
+            "project": {"key": project_key},
+            "issuetype": {"name": issuetype},
+            "summary": summary,
+        }
+        if description:
+            fields["description"] = description
+        status, result = self.request("POST", "/rest/api/2/issue", {"fields": fields}, idempotent=False)
+        if status == 201:
+            return {"ok": True, "key": result.get("key"), "url": f"{self.base_url}/browse/{result.get('key')}"}
+        detail = error_message(result)
+        error = f"http_{status}" if status else (detail.split(":")[0] or "request_failed")
+        return {"ok": False, "error": error, "detail": detail,
+                "retryable": error in ("request_failed", "circuit_open", "http_429"),
+                "uncertain": error == "response_lost" or status >= 500}
+
+
+def error_message(result) -> str:
+    """Jira 오류 응답(errorMessages / errors)을 한 줄로 만든다."""
+    if not isinstance(result, dict):
+        return str(result)
+    messages = list(result.get("errorMessages") or [])
+    messages += [f"{k}: {v}" for k, v in (result.get("errors") or {}).items()]
+    return "; ".join(messages)
+
+
+class CreateMetaIndex:
+    """createmeta 결과를 프로젝트 키 / 이슈 타입 이름으로 찾을 수 있게 캐시한다 (TTL, 백그라운드 갱신).
+
+    제출 검증은 캐시만 보고 하며, 아직 로드되지 않았으면 최대 cold_wait 초만 기다린다.
+    """
+
+    def __init__(self, fetch, ttl: float = 600, cold_wait: float = 1.0, retry_interval: float = 30):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.cold_wait = cold_wait
+        self.retry_interval = retry_interval
+        self._projects = {}  # 프로젝트 키(대문자) -> {"key", "name", "issuetypes": {이름(소문자): 이름}}
+        self._loaded_at = 0.0
+        self._failed_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._loaded = threading.Event()
+
+    def refresh(self) -> bool:
+        try:
+            raw_projects = self._fetch()
+        except Exception as e:
+            logger.error("Jira createmeta 갱신 실패: %s", e)
+            self._failed_at = time.monotonic()
+            return False
+        finally:
+            with self._lock:
+                self._refreshing = False
+        projects = {}
+        for project in raw_projects:
+            key = project.get("key", "").upper()
+            projects[key] = {
+                "key": project.get("key"),
+                "name": project.get("name", ""),
+                "issuetypes": {t["name"].lower(): t["name"] for t in project.get("issuetypes", []) if t.get("name")},
+            }
+        with self._lock:
+            self._projects = projects
+            self._loaded_at = time.monotonic()
+        self._loaded.set()
+        logger.info("Jira createmeta 갱신 완료: 프로젝트 %d개", len(projects))
+        return True
+
+    def refresh_async(self) -> bool:
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="jira-createmeta-refresh", daemon=True).start()
+        return True
+
+    def start(self):
+        self.refresh_async()
+
+    def _ensure_fresh(self):
+        if self._loaded_at and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        if self._failed_at and time.monotonic() - self._failed_at < self.retry_interval:
+            return
+        self.refresh_async()
+        if not self._loaded.is_set():
+            self._loaded.wait(self.cold_wait)
+
+    def projects(self) -> list[dict]:
+        self._ensure_fresh()
+        return list(self._projects.values())
+
+    def validate(self, project_key: str, issuetype: str):
+        """(프로젝트 키, 이슈 타입 이름, 오류 dict) — 오류 dict는 view_submission errors 형식(block_id: 메시지).
+
+        메타데이터를 아직 읽지 못했으면 입력값을 그대로 통과시킨다 (최종 검증은 Jira가 한다).
+        """
+        self._ensure_fresh()
+        if not self._loaded.is_set():
+            return project_key.strip().upper(), issuetype.strip(), {}
+        project = self._projects.get(project_key.strip().upper())
+        if project is None:
+            keys = ", ".join(sorted(self._projects)[:10])
+            return None, None, {"project": f"존재하지 않는 프로젝트 키입니다 (예: {keys})"}
+        name = project["issuetypes"].get(issuetype.strip().lower())
+        if name is None:
+            names = ", ".join(sorted(project["issuetypes"].values())[:10])
+            return None, None, {"issuetype": f"{project['key']}에서 쓸 수 없는 이슈 타입입니다 ({names})"}
+        return project["key"], name, {}
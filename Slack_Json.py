@@ -0,0 +1,23 @@
+import json
+
+# orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 동작한다 (선택 의존성)
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def dumps(obj) -> bytes:
+    """obj를 공백 없는 UTF-8 JSON bytes로 직렬화한다."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    """str/bytes JSON을 파싱한다."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,171 @@
+"""업무 원장 (/my_tasks, /team_tasks)
+
+채널에 올라간 업무 요청(단건 / 일괄)과 모임요청을 담당자 한 명당 한 줄씩 SQLite에 남겨 두고,
+(담당자, 종료일) / (업무 유형, 종료일) 인덱스 범위 조회로 바로 답한다 (채널 기록을 뒤지지 않는다).
+
+- 조회 대상은 종료일이 오늘 이후인 항목과 등록된 지 undated_days일이 안 된 기간 미설정 항목이고,
+  종료일 순으로 PAGE_SIZE개씩 보여 준다 (완료 처리가 없으므로 기간 미설정 항목도 이 기간이 지나면 빠진다)
+- 기간 미설정은 end_date를 NO_END_DATE로 저장해 같은 범위 조회 안에서 맨 뒤에 오게 한다
+- 모임요청은 work_type을 MEETING으로 저장한다 (/team_tasks 모임, 기간이 없어 undated_days 뒤 빠진다)
+- 응답은 section 하나가 SECTION_LIMIT자를 넘지 않게 나누고, 긴 제목은 TITLE_LIMIT자로 자른다
+"""
+import datetime
+import sqlite3
+import threading
+import time
+
+from Slack_Bulk import resolve_work_type
+from Slack_Config import PREFIX_MAP, WORK_TYPE_OPTIONS
+from Slack_Mentions import chunk_lines
+from Slack_Messages import message_link
+from Slack_Reminders import period_dates
+
+PAGE_SIZE = 10
+UNDATED_DAYS = 14
+NO_END_DATE = "9999-12-31"
+SECTION_LIMIT = 3000  # Slack section text 최대 길이
+TITLE_LIMIT = 150
+MEETING = "meeting"
+MEETING_NAMES = {MEETING, "모임", "모임요청", "기획리뷰"}
+COMMANDS = ("/my_tasks", "/team_tasks")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    work_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    assignee_user_id TEXT NOT NULL,
+    start_date TEXT NOT NULL DEFAULT '',
+    end_date TEXT NOT NULL,
+    channel TEXT,
+    ts TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks (assignee_user_id, end_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_work_type ON tasks (work_type, end_date);
+"""
+
+COLUMNS = ("id", "kind", "work_type", "title", "assignee_user_id", "start_date", "end_date", "channel", "ts")
+
+# 조회 기준 열 → 인덱스가 걸린 열만 허용
+QUERY_COLUMNS = {"assignee": "assignee_user_id", "work_type": "work_type"}
+
+
+def parse_team(value: str):
+    """/team_tasks 인자 → work_type 키 (모임요청은 MEETING). 모르는 값이면 None."""
+    if (value or "").strip().lower() in MEETING_NAMES:
+        return MEETING
+    return resolve_work_type(value)
+
+
+def parse_page(value: str) -> int:
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
+
+
+class TaskLedger:
+    """업무 원장. 요청 스레드마다 연결을 따로 둔다 (WAL이라 조회끼리, 조회와 기록이 서로 막지 않는다)."""
+
+    def __init__(self, path: str, page_size: int = PAGE_SIZE, undated_days: int = UNDATED_DAYS):
+        self.path = path
+        self.page_size = page_size
+        self.undated_days = undated_days
+        self._conns = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._conns, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conns.conn = conn
+        return conn
+
+    def record(self, tasks: list) -> int:
+        """tasks: [{"kind", "work_type", "title", "assignee_user_id", "period", "channel", "ts"}] → 저장한 줄 수"""
+        now = time.time()
+        rows = []
+        for task in tasks:
+            start_date, end_date = period_dates(task.get("period"))
+            rows.append((task["kind"], task["work_type"], task["title"], task["assignee_user_id"], start_date,
+                         end_date or NO_END_DATE, task.get("channel"), task.get("ts"), now))
+        if rows:
+            with self._conn() as conn:
+                conn.executemany(
+                    "INSERT INTO tasks (kind, work_type, title, assignee_user_id, start_date, end_date, channel, ts, "
+                    "created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def query(self, by: str, value: str, page: int = 1, today: str = None):
+        """(이번 페이지 항목 목록, 전체 건수). by: QUERY_COLUMNS 키"""
+        column = QUERY_COLUMNS[by]
+        today = today or datetime.date.today().isoformat()
+        since = time.time() - self.undated_days * 86400
+        # 기간 미설정(NO_END_DATE)은 등록 시각으로 거른다 (범위 조회는 그대로 (열, end_date) 인덱스를 탄다)
+        where = f"{column} = ? AND end_date >= ? AND (end_date < ? OR created_at >= ?)"
+        params = (value, today, NO_END_DATE, since)
+        conn = self._conn()
+        total = conn.execute(f"SELECT COUNT(*) FROM tasks WHERE {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM tasks WHERE {where} ORDER BY end_date, id LIMIT ? OFFSET ?",
+            (*params, self.page_size, (page - 1) * self.page_size),
+        ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows], total
+
+    def stats(self) -> dict:
+        return {"tasks": self._conn().execute("SELECT COUNT(*) FROM tasks").fetchone()[0]}
+
+
+def _task_line(task: dict, show_assignee: bool) -> str:
+    title = f"{PREFIX_MAP.get(task['work_type'], '')}{task['title']}"
+    if len(title) > TITLE_LIMIT:
+        title = title[:TITLE_LIMIT - 1] + "…"
+    link = message_link(task["channel"], task["ts"])
+    if link:
+        title = f"<{link}|{title}>"
+    due = "기간 미설정" if task["end_date"] == NO_END_DATE else f"~{task['end_date']}"
+    line = f"• `{due}` {'[모임] ' if task['kind'] == MEETING else ''}{title}"
+    return f"{line} <@{task['assignee_user_id']}>" if show_assignee else line
+
+
+def tasks_response(heading: str, tasks: list, total: int, page: int, page_size: int, next_command: str,
+                   show_assignee: bool = False) -> dict:
+    """조회 결과 → ephemeral 응답 (다음 페이지가 있으면 이어서 볼 커맨드를 알려 준다)"""
+    pages = max(1, -(-total // page_size))
+    if not tasks:
+        text = f"*{heading}* 진행 중인 업무가 없습니다." if page == 1 else f"*{heading}* {page}페이지가 없습니다 (전체 {pages}페이지)."
+        return {"response_type": "ephemeral", "text": text}
+    header = f"*{heading}* 전체 {total}건 ({page}/{pages} 페이지)"
+    lines = (_task_line(task, show_assignee) for task in tasks)
+    blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": header}}]
+    blocks += [{"type": "section", "text": {"type": "mrkdwn", "text": text}}
+               for text in chunk_lines(lines, SECTION_LIMIT)]
+    if page < pages:
+        blocks.append({"type": "context", "elements": [
+            {"type": "mrkdwn", "text": f"다음 페이지: `{next_command} {page + 1}`"},
+        ]})
+    return {"response_type": "ephemeral", "text": header, "blocks": blocks}
+
+
+def ledger_command(ledger: TaskLedger, command: str, user_id: str, text: str) -> dict:
+    """/my_tasks [페이지], /team_tasks <업무유형> [페이지] → ephemeral 응답"""
+    args = (text or "").split()
+    if command == "/my_tasks":
+        page = parse_page(args[0]) if args else 1
+        tasks, total = ledger.query("assignee", user_id, page)
+        return tasks_response("내 업무", tasks, total, page, ledger.page_size, "/my_tasks")
+    work_type = parse_team(args[0]) if args else None
+    if work_type is None:
+        names = ", ".join(WORK_TYPE_OPTIONS.values())
+        return {"response_type": "ephemeral", "text": f"사용법: `/team_tasks <업무유형> [페이지]` (업무유형: {names}, 모임)"}
+    page = parse_page(args[1]) if len(args) > 1 else 1
+    tasks, total = ledger.query("work_type", work_type, page)
+    label = "모임요청" if work_type == MEETING else WORK_TYPE_OPTIONS.get(work_type, work_type)
+    return tasks_response(f"{label} 업무", tasks, total, page, ledger.page_size, f"/team_tasks {args[0]}",
+                          show_assignee=True)
@@ -0,0 +1,163 @@
+"""로그 파이프라인
+
+- 요청 스레드는 레코드를 큐에 넣기만 하고(QueueHandler), 포맷/출력은 백그라운드 스레드(QueueListener)가 한다
+- 메시지는 %-스타일 인자로 넘겨 실제 출력 시점(백그라운드)에만 포맷된다
+- LOG_FORMAT=json 이면 한 줄에 JSON 하나 (extra 필드 포함)
+- 토큰(xox*-, Bearer)과 사용자 입력(text/value/title 등)은 출력 전에 가린다
+- 요청 payload 전체 덤프는 route별 샘플링 비율(LOG_PAYLOAD_SAMPLE)로만 남긴다
+"""
+import atexit
+import logging
+import os
+import queue
+import random
+import re
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+import Slack_Json
+
+# 값 자체를 가리는 키 (토큰 / 웹훅 URL / 사용자가 입력한 내용)
+REDACT_KEYS = {
+    "token", "response_url", "text", "value", "title", "content", "document", "plan_url",
+}
+TOKEN_PATTERN = re.compile(r"xox[abposr]-[A-Za-z0-9-]+|Bearer\s+\S+")
+REDACTED = "[redacted]"
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘어온 구조화 필드)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def redact(value, depth: int = 0):
+    """dict/list를 재귀적으로 복사하며 민감한 값을 가린다."""
+    if isinstance(value, str):
+        return TOKEN_PATTERN.sub(REDACTED, value)
+    if depth > 8:
+        return REDACTED
+    if isinstance(value, dict):
+        return {
+            k: (REDACTED if k in REDACT_KEYS and v not in (None, "") else redact(v, depth + 1))
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(v, depth + 1) for v in value]
+    return value
+
+
+class RedactingFormatter(logging.Formatter):
+    """평문 포맷. 포맷된 메시지에서 토큰을 가린다."""
+
+    def format(self, record):
+        return TOKEN_PATTERN.sub(REDACTED, super().format(record))
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드를 JSON 한 줄로 만든다. extra로 넘긴 필드는 가린 뒤 그대로 포함한다."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": TOKEN_PATTERN.sub(REDACTED, record.getMessage()),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = redact(value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return Slack_Json.dumps(entry).decode("utf-8")
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버린다. 포맷은 리스너 스레드로 미룬다."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 기본 구현은 여기서(요청 스레드) 메시지를 포맷한다 → 예외 traceback만 문자열로 만들고 나머지는 미룬다
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LazyRedacted:
+    """출력 시점(백그라운드)에만 가리기 + 직렬화를 하는 로그 인자 래퍼"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return Slack_Json.dumps(redact(self.value)).decode("utf-8")
+
+
+class PayloadSampler:
+    """route별 비율로 payload 덤프 여부를 정한다. 예: LOG_PAYLOAD_SAMPLE="command=0.01,interaction=0.1,*=0" """
+
+    def __init__(self, spec: str = ""):
+        self.rates = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            route, _, rate = part.partition("=")
+            self.rates[route.strip()] = float(rate or 0)
+        self.default = self.rates.pop("*", 0.0)
+
+    def sampled(self, route: str) -> bool:
+        rate = self.rates.get(route, self.default)
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+_listener = None
+_handler = None
+sampler = PayloadSampler(os.environ.get("LOG_PAYLOAD_SAMPLE", ""))
+
+
+def setup_logging(level: str = None, fmt: str = None, queue_size: int = None):
+    """루트 로거를 큐 기반 비동기 로깅으로 설정한다 (여러 번 불러도 한 번만 적용)."""
+    global _listener, _handler
+    if _listener is not None:
+        return _handler
+    level = level or os.environ.get("LOG_LEVEL", "INFO")
+    fmt = fmt or os.environ.get("LOG_FORMAT", "text")
+    queue_size = queue_size or int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+
+    stream = logging.StreamHandler(sys.stderr)
+    if fmt == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(RedactingFormatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+
+    _handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(_handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _handler
+
+
+def log_payload(logger: logging.Logger, route: str, name: str, payload):
+    """샘플링된 요청만 payload 전체를 남긴다 (가리기/직렬화는 출력 스레드에서)."""
+    if sampler.sampled(route) and logger.isEnabledFor(logging.INFO):
+        logger.info("%s payload (%s): %s", route, name, LazyRedacted(payload), extra={"route": route})
+
+
+def dropped_records() -> int:
+    return _handler.dropped if _handler is not None else 0
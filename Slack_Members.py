@@ -0,0 +1,277 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+
+import requests
+
+from Slack_Cache import MISSING
+
+logger = logging.getLogger(__name__)
+
+# users.list 응답 전체 대신 필요한 필드만 보관 (멤버당 메모리 최소화)
+Member = namedtuple("Member", ["id", "name", "deleted", "is_bot"])
+
+
+def to_member(raw: dict) -> Member:
+    return Member(
+        raw.get("id"),
+        raw.get("name", ""),
+        bool(raw.get("deleted")),
+        bool(raw.get("is_bot")),
+    )
+
+
+def users_list_page_fetcher(api_url: str, token: str, session=None, page_size: int = 1000, timeout: float = 10):
+    """users.list 한 페이지를 가져오는 함수를 만든다. fetch(cursor) -> (raw 멤버 목록, next_cursor)"""
+    http = session or requests.Session()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def fetch(cursor=None):
+        params = {"limit": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        response = http.get(f"{api_url}/users.list", headers=headers, params=params, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        if not data.get("ok", False):
+            raise RuntimeError(f"Slack API 오류: {data.get('error')}")
+        return data.get("members", []), data.get("response_metadata", {}).get("next_cursor")
+
+    return fetch
+
+
+def iter_members(fetch_page):
+    """users.list를 페이지 단위로 읽으며 Member를 하나씩 내보낸다.
+
+    소비하는 쪽이 중간에 멈추면 다음 페이지는 요청하지 않는다 (메모리에는 한 페이지만 유지).
+    """
+    cursor = None
+    while True:
+        raw_members, cursor = fetch_page(cursor)
+        for raw in raw_members:
+            yield to_member(raw)
+        if not cursor:
+            return
+
+
+def patch_rows(rows: list, member: Member) -> list:
+    """공유 캐시의 [id, name, deleted, is_bot] 목록에서 member.id 행을 바꾸거나 덧붙인다."""
+    for i, row in enumerate(rows):
+        if row[0] == member.id:
+            rows[i] = list(member)
+            return rows
+    rows.append(list(member))
+    return rows
+
+
+class MemberDirectory:
+    """users.list 결과를 메모리에 캐시하는 멤버 디렉터리.
+
+    - ttl 이내: 캐시를 그대로 사용
+    - ttl ~ stale_ttl: 캐시(stale)를 즉시 돌려주고 백그라운드에서 갱신 (stale-while-revalidate)
+    - stale_ttl 초과 또는 최초 로드: 갱신을 시작하고 최대 cold_wait 초만 기다린다
+    Events API(user_change / team_join)를 받으면 upsert()로 한 명씩 반영하고,
+    member_joined_channel / member_left_channel은 채널별 멤버 집합(channel_members)에 반영한다 (받은 워커에만).
+    이 경우 ttl을 길게 두어 전체 users.list 조회는 가끔 하는 정합성 확인(reconcile)으로만 쓴다.
+    shared_cache(SharedCache)를 주면 전체 목록을 워커들이 공유해 users.list는 한 워커만 조회한다.
+    이벤트는 받은 워커 하나에만 오므로 upsert()는 공유 목록도 고쳐 두고, 다른 워커는 다음 갱신(ttl) 때 받아 간다.
+    """
+
+    def __init__(self, fetch_page, ttl: float = 300, stale_ttl: float = 3600, cold_wait: float = 2.0,
+                 retry_interval: float = 30, shared_cache=None):
+        self._fetch_page = fetch_page
+        self._shared = shared_cache
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.cold_wait = cold_wait
+        self.retry_interval = retry_interval
+        self._failed_at = 0.0
+        self._by_id: dict[str, Member] = {}
+        self._channels: dict[str, set] = {}  # 채널 id -> 이벤트로 알게 된 멤버 id
+        self._dirty: dict[str, Member] = {}  # 전체 갱신 도중 들어온 이벤트 (갱신 결과에 다시 반영)
+        self.events_applied = 0
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._loaded = threading.Event()
+
+    def _age(self) -> float:
+        return time.monotonic() - self._loaded_at if self._loaded_at else float("inf")
+
+    def refresh(self) -> bool:
+        """전체 멤버를 다시 읽어 인덱스를 교체한다. 실패 시 기존 캐시를 유지한다."""
+        with self._lock:
+            self._refreshing = True  # refresh_async를 거치지 않은 직접 호출도 이벤트를 _dirty에 모으도록
+        by_id = {}
+        try:
+            if self._shared is not None:
+                rows = self._shared.get_or_fetch("members", self._fetch_rows)
+                if rows is None:
+                    raise RuntimeError("공유 캐시에서 멤버 목록을 가져오지 못함")
+                members = (Member(*row) for row in rows)
+            else:
+                members = iter_members(self._fetch_page)
+            for member in members:
+                by_id[member.id] = member
+        except Exception as e:
+            self._fail(e)
+            return False
+        self._install(by_id)
+        return True
+
+    def _fail(self, error):
+        logger.error("멤버 조회 실패: %s", str(error))
+        self._failed_at = time.monotonic()
+        with self._lock:
+            self._refreshing = False
+            self._dirty = {}
+
+    def _install(self, by_id: dict):
+        with self._lock:
+            # 페이지를 읽는 동안 들어온 이벤트가 더 최신이므로 덮어쓴다
+            by_id.update(self._dirty)
+            self._dirty = {}
+            self._by_id = by_id
+            self._loaded_at = time.monotonic()
+            self._refreshing = False
+        self._loaded.set()
+        logger.info("멤버 디렉터리 갱신 완료: %d명", len(by_id))
+
+    def _fetch_rows(self):
+        """공유 캐시에 저장할 형태: [id, name, deleted, is_bot] 배열 목록 (필드 이름 없이 작게)"""
+        try:
+            return [list(member) for member in iter_members(self._fetch_page)]
+        except Exception as e:
+            logger.error("멤버 조회 실패: %s", str(e))
+            return MISSING
+
+    def refresh_async(self) -> bool:
+        """갱신 중이 아니면 백그라운드 스레드로 갱신을 시작한다."""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="member-directory-refresh", daemon=True).start()
+        return True
+
+    def start(self):
+        """서버 기동 시 캐시를 미리 채운다."""
+        self.refresh_async()
+
+    def _ensure_fresh(self):
+        age = self._age()
+        if age < self.ttl:
+            return
+        if self._failed_at and time.monotonic() - self._failed_at < self.retry_interval:
+            # 직전 갱신이 실패했다면 잠시 재시도를 미룬다 (rate limit 상황에서 요청 폭주 방지)
+            return
+        self.refresh_async()
+        if age >= self.stale_ttl:
+            # 캐시가 없거나 너무 오래됨 → 짧게만 기다린다 (슬래시 커맨드가 페이지네이션에 묶이지 않도록)
+            self._loaded.wait(self.cold_wait)
+
+    def members(self) -> list[Member]:
+        self._ensure_fresh()
+        return list(self._by_id.values())
+
+    def get(self, user_id: str):
+        self._ensure_fresh()
+        return self._by_id.get(user_id)
+
+    def active_members(self) -> list[Member]:
+        return [m for m in self.members() if not m.deleted and not m.is_bot]
+
+    # ---- 이벤트 기반 증분 갱신 (O(1)) ----
+
+    def upsert(self, raw: dict) -> Member:
+        """users.list 형식의 user 객체 하나를 반영한다 (user_change / team_join)."""
+        member = to_member(raw)
+        with self._lock:
+            self._by_id[member.id] = member
+            if self._refreshing:
+                self._dirty[member.id] = member
+            self.events_applied += 1
+        if self._shared is not None:
+            self._shared.update("members", lambda rows: patch_rows(rows, member))
+        return member
+
+    def join_channel(self, channel_id: str, user_id: str):
+        with self._lock:
+            self._channels.setdefault(channel_id, set()).add(user_id)
+            self.events_applied += 1
+
+    def leave_channel(self, channel_id: str, user_id: str):
+        with self._lock:
+            members = self._channels.get(channel_id)
+            if members is not None:
+                members.discard(user_id)
+                if not members:
+                    del self._channels[channel_id]
+            self.events_applied += 1
+
+    def channel_members(self, channel_id: str) -> set:
+        """이벤트로 알게 된 채널 멤버 id (서버 기동 이후 변경분만 반영된다)"""
+        with self._lock:
+            return set(self._channels.get(channel_id, ()))
+
+    def iter_active(self):
+        """활성 멤버를 하나씩 내보낸다.
+
+        캐시가 stale_ttl 이내면 캐시를 순회한다. 없거나 너무 오래됐으면 users.list를 페이지 단위로 직접
+        스트리밍하면서 끝까지 읽으면 같은 스캔으로 캐시도 채운다 (전체 목록을 두 번 읽지 않는다). 소비하는 쪽이
+        중간에 멈추면 남은 페이지는 요청하지 않고, 일부만 읽은 목록은 캐시로 쓰지 않는다 (캐시는 TTL 갱신이 채운다).
+        다른 스레드가 이미 갱신 중이면 그 결과를 cold_wait초까지 기다리고, 그래도 캐시가 비어 있을 때만 따로
+        스트리밍한다.
+        """
+        if self._age() < self.stale_ttl:
+            self._ensure_fresh()
+            members = list(self._by_id.values())
+        else:
+            with self._lock:
+                scanning = not self._refreshing
+                self._refreshing = True
+            if scanning:
+                yield from self._scan_active()
+                return
+            self._loaded.wait(self.cold_wait)
+            members = list(self._by_id.values()) or iter_members(self._fetch_page)
+        for member in members:
+            if not member.deleted and not member.is_bot:
+                yield member
+
+    def _scan_active(self):
+        """users.list를 스트리밍하며 활성 멤버를 내보내고, 읽은 멤버로 캐시를 교체한다 (_refreshing을 잡은 상태에서 호출)."""
+        if self._shared is not None:
+            rows = self._shared.get("members")
+            if rows is not MISSING and rows is not None:
+                by_id = {row[0]: Member(*row) for row in rows}
+                self._install(by_id)
+                yield from (m for m in by_id.values() if not m.deleted and not m.is_bot)
+                return
+        by_id = {}
+        members = iter_members(self._fetch_page)
+        try:
+            for member in members:
+                by_id[member.id] = member
+                if not member.deleted and not member.is_bot:
+                    yield member
+        except GeneratorExit:
+            # 소비하는 쪽이 중간에 멈춤 (출력 예산 소진) → 남은 페이지는 읽지 않고 갱신도 하지 않는다
+            members.close()
+            with self._lock:
+                self._refreshing = False
+                self._dirty = {}
+            raise
+        except Exception as e:
+            self._fail(e)
+            raise
+        self._store(by_id)
+
+    def _store(self, by_id: dict):
+        if self._shared is not None:
+            self._shared.set("members", [list(member) for member in by_id.values()])
+        self._install(by_id)
+
+    def __len__(self):
+        return len(self._by_id)
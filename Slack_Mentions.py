@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Slack 메시지 text 하나에 넣을 멘션 글자 수 (section/text 권장 한도)
+MESSAGE_BUDGET = 3000
+
+
+def mention_lines(members, suffix: str = " HI"):
+    """멤버 이터러블을 멘션 줄로 바꾼다. (제너레이터: 필요한 만큼만 멤버를 당겨온다)"""
+    for member in members:
+        yield f"<@{member.id}>{suffix}"
+
+
+def take_within_budget(lines, budget: int = MESSAGE_BUDGET):
+    """budget 글자 안에 들어가는 줄만 모은다. -> (줄 목록, 잘림 여부)
+
+    한도를 넘는 첫 줄에서 바로 멈추므로 뒤쪽 멤버(페이지)는 읽지 않는다.
+    """
+    taken = []
+    size = 0
+    for line in lines:
+        extra = len(line) + (1 if taken else 0)
+        if size + extra > budget:
+            return taken, True
+        taken.append(line)
+        size += extra
+    return taken, False
+
+
+def chunk_lines(lines, max_chars: int = MESSAGE_BUDGET):
+    """줄을 max_chars 이하의 메시지 text로 묶어 하나씩 내보낸다 (줄 중간에서 자르지 않는다)."""
+    chunk = []
+    size = 0
+    for line in lines:
+        extra = len(line) + (1 if chunk else 0)
+        if chunk and size + extra > max_chars:
+            yield "\n".join(chunk)
+            chunk = []
+            size = 0
+            extra = len(line)
+        chunk.append(line)
+        size += extra
+    if chunk:
+        yield "\n".join(chunk)
+
+
+class ChunkedDelivery:
+    """긴 멘션 목록을 여러 메시지로 나눠 일정 간격으로 보내는 백그라운드 발송기.
+
+    - 채널마다 동시에 한 번만 진행한다 (같은 채널에 /hi 전체 발송이 겹치지 않도록)
+    - 메시지 사이에 interval 초를 둔다 (Slack: 채널당 약 1건/초)
+    - max_messages 개를 넘으면 멈춘다 (아주 큰 워크스페이스에서도 발송량이 제한되도록)
+    post(channel, text) -> Slack 응답 dict
+    """
+
+    def __init__(self, post, interval: float = 1.1, max_messages: int = 50):
+        self._post = post
+        self.interval = interval
+        self.max_messages = max_messages
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def start(self, channel: str, chunks) -> bool:
+        """발송을 시작한다. 이미 그 채널에 발송 중이면 False."""
+        with self._lock:
+            if channel in self._active:
+                return False
+            self._active.add(channel)
+        threading.Thread(target=self._run, args=(channel, chunks), name="chunked-delivery", daemon=True).start()
+        return True
+
+    def _run(self, channel: str, chunks):
+        sent = 0
+        try:
+            for text in chunks:
+                if sent >= self.max_messages:
+                    logger.warning("%s: 최대 메시지 수(%d) 도달, 나머지 생략", channel, self.max_messages)
+                    self._post(channel, "... (이하 생략)")
+                    break
+                if sent:
+                    time.sleep(self.interval)
+                result = self._post(channel, text)
+                if result.get("error") == "ratelimited":
+                    time.sleep(float(result.get("retry_after", self.interval)))
+                    result = self._post(channel, text)
+                if not result.get("ok"):
+                    logger.error("%s: 분할 발송 실패 (%d번째): %s", channel, sent + 1, result.get("error"))
+                    break
+                sent += 1
+        except Exception:
+            logger.exception("%s: 분할 발송 중 오류", channel)
+        finally:
+            with self._lock:
+                self._active.discard(channel)
+            logger.info("%s: 분할 발송 완료 (%d건)", channel, sent)
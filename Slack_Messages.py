@@ -0,0 +1,138 @@
+from Slack_Config import CHANNEL_MAP, DEFAULT_CC_USER_IDS, MEETING_REQUEST_CHANNEL, PREFIX_MAP, TARGET_CHANNEL
+
+
+def build_work_message(work_type, title, content, period, plan_url, assignee_user_id, cc_user_ids) -> dict:
+    """업무 요청 chat.postMessage payload를 만든다. cc_user_ids는 멘션할 (정규화된) 참조 유저 ID 목록."""
+    prefix = PREFIX_MAP.get(work_type, "")
+    cc_mentions = " ".join([f"<@{uid}>" for uid in cc_user_ids])
+    blocks = [
+        {"type": "divider"},
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": f"{cc_mentions}\n*지라 일감 요청드립니다!*"},
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": (
+                    f"*<{prefix}업무 요청>*\n"
+                    f"*제목:* {prefix}{title}\n"
+                    f"*내용:* {content}\n"
+                    f"*기간:* {period}\n"
+                    f"*기획서:* {plan_url if plan_url else '없음'}\n"
+                    f"*담당자:* <@{assignee_user_id}>"
+                ),
+            },
+        },
+        {"type": "divider"},
+    ]
+
+    target_channel = CHANNEL_MAP.get(work_type, TARGET_CHANNEL)
+    payload = {"channel": target_channel, "blocks": blocks, "text": f"{prefix}업무 요청: {title}"}
+    return payload
+
+
+def message_link(channel, ts) -> str:
+    """채널 메시지 링크 (chat.getPermalink 호출 없이 archives URL로 만든다). ts가 없으면 빈 문자열"""
+    if not channel or not ts:
+        return ""
+    return f"https://slack.com/archives/{channel}/p{ts.replace('.', '')}"
+
+
+def build_meeting_message(title, document, content, assignees) -> dict:
+    """모임요청 chat.postMessage payload를 만든다."""
+    assignee_mentions = " ".join([f"<@{uid}>" for uid in assignees]) if assignees else "없음"
+
+    # 참조: 기본 3명(환경설정 권장)
+    default_refs = DEFAULT_CC_USER_IDS  # 예: ["UAAAAAAA1","UBBBBBBB2","UCCCCCCC3"]
+    cc_mentions = " ".join([f"<@{uid}>" for uid in default_refs])
+
+    # 메시지 텍스트(요청하신 형식)
+    # 굵게/각괄호/화살괄호 등은 mrkdwn에서 그대로 표시 가능
+    lines = [
+        "**[기획 리뷰 요청드립니다.]**",
+        f"제목: << {title} >>",
+        f"기획서: {document if document else '없음'}",
+        f"내용: {content if content else '없음'}",
+        f"담당자: {assignee_mentions}",
+        f"참조: {cc_mentions}",
+    ]
+    msg_text = "\n".join(lines)
+
+    target_channel = MEETING_REQUEST_CHANNEL  # 모임요청을 보낼 채널
+    payload = {"channel": target_channel, "text": msg_text}
+    return payload
+
+
+def meeting_recipients(assignees, cc_user_ids) -> list:
+    """모임요청 DM 대상: 담당자 + 참조 (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys([*(assignees or []), *cc_user_ids]))
+
+
+def build_meeting_dm(channel_id, title, document, content, link="") -> dict:
+    """모임요청을 참석자 한 명에게 DM으로 알리는 payload (channel_id는 conversations.open으로 연 DM 채널)"""
+    lines = [
+        "*[기획 리뷰 요청]* 참석 대상으로 지정되었습니다.",
+        f"제목: << {title} >>",
+        f"기획서: {document if document else '없음'}",
+        f"내용: {content if content else '없음'}",
+    ]
+    if link:
+        lines.append(f"<{link}|채널 메시지 보기>")
+    return {"channel": channel_id, "text": "\n".join(lines)}
+
+
+def build_fanout_report(user_id, title, total, failures: dict) -> dict:
+    """DM을 보내지 못한 참석자(user id → 사유)를 요청자에게 알리는 payload"""
+    listed = ", ".join(f"<@{uid}> ({error})" for uid, error in failures.items())
+    text = f"모임요청 <<{title}>> DM을 {total}명 중 {len(failures)}명에게 보내지 못했습니다: {listed}"
+    return {"channel": user_id, "text": text}
+
+
+def build_jira_issue_message(user_id, summary, result) -> dict:
+    """Jira 이슈 생성 결과를 요청자에게 DM으로 알리는 payload (channel에 user id를 넣으면 앱 DM으로 간다)."""
+    if result.get("ok"):
+        text = f"Jira 이슈가 생성되었습니다: <{result['url']}|{result['key']}> {summary}"
+    else:
+        detail = result.get("detail") or result.get("error")
+        text = f"Jira 이슈 생성에 실패했습니다 ({summary}): {detail}"
+        if result.get("uncertain"):
+            text = (f"Jira 응답을 받지 못해 이슈가 생성됐는지 확인할 수 없습니다 ({summary}): {detail}\n"
+                    "중복 생성을 막기 위해 자동으로 다시 시도하지 않았습니다. Jira에서 확인한 뒤 필요하면 다시 요청해 주세요.")
+    return {"channel": user_id, "text": text}
+
+
+SUBMISSION_LABELS = {
+    "work_create_modal": "업무 요청",
+    "work_bulk_create_modal": "업무 일괄 요청",
+    "meeting_review_modal": "모임요청",
+    "jira_issue_create_modal": "Jira 이슈 생성",
+}
+
+
+def build_submission_failure_message(user_id, kind, data: dict, error) -> dict:
+    """outbox가 처리를 포기한 제출을 요청자에게 알리는 payload. uncertain(응답 유실)은 이미 올라갔을 수 있어 확인을 부탁한다."""
+    label = SUBMISSION_LABELS.get(kind, kind)
+    title = data.get("title") or data.get("summary")
+    subject = f"{label} <<{title}>>" if title else label
+    if str(error).startswith("uncertain"):
+        text = (f"{subject}을(를) 보냈지만 Slack 응답을 받지 못해 게시됐는지 확인할 수 없습니다: {error}\n"
+                "중복 게시를 막기 위해 자동으로 다시 보내지 않았습니다. 채널에서 확인한 뒤 필요하면 다시 요청해 주세요.")
+    else:
+        text = f"{subject}을(를) 처리하지 못했습니다: {error}\n다시 요청해 주세요."
+    return {"channel": user_id, "text": text}
+
+
+def build_reminder_messages(reminder: dict) -> tuple:
+    """마감 리마인더 → (담당자 DM payload, 업무 유형 채널 payload). 둘 다 block 메시지라 같은 채널 대기분은 합쳐 보낸다."""
+    prefix = PREFIX_MAP.get(reminder["work_type"], "")
+    days_left = reminder["days_left"]
+    when = "오늘 마감" if days_left == 0 else f"마감 {days_left}일 전"
+    title = f"{prefix}{reminder['title']}"
+    text = f"*[{when}]* {title} (종료일 {reminder['end_date']}) - 담당자 <@{reminder['assignee_user_id']}>"
+    block = {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+    dm = {"channel": reminder["assignee_user_id"], "blocks": [block], "text": f"{when}: {title}"}
+    channel = reminder.get("channel") or CHANNEL_MAP.get(reminder["work_type"], TARGET_CHANNEL)
+    notice = {"channel": channel, "blocks": [block], "text": f"{when}: {title}"}
+    return dm, notice
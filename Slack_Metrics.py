@@ -0,0 +1,166 @@
+import bisect
+import threading
+
+# 기본 지연 시간 버킷(초): Slack 3초 응답 제한 주변을 촘촘하게
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = list(self._values.items())
+        for label_values, value in items:
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {value}"
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label_values -> [bucket 카운트..., +Inf 카운트, 합계]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        for label_values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, label_values, (le,))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {series[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}"
+
+
+class Gauge:
+    """스크레이프 시점에 콜백으로 값을 읽는 게이지. 콜백은 {라벨값 튜플: 값} 또는 숫자를 돌려준다."""
+
+    def __init__(self, name, help_text, callback, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._callback = callback
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        try:
+            value = self._callback()
+        except Exception:
+            return
+        if isinstance(value, dict):
+            for label_values, v in value.items():
+                yield f"{self.name}{_format_labels(self.labels, label_values)} {v}"
+        else:
+            yield f"{self.name} {value}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help_text, labels=()) -> Counter:
+        metric = Counter(name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help_text, callback, labels=()) -> Gauge:
+        metric = Gauge(name, help_text, callback, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 공용 레지스트리와 메트릭 (Flask / ASGI 서버가 함께 사용)
+registry = Registry()
+request_count = registry.counter(
+    "slack_app_requests_total", "슬래시 커맨드 / 인터랙션 요청 수", ("route", "name", "status"))
+request_latency = registry.histogram(
+    "slack_app_request_duration_seconds", "슬래시 커맨드 / 인터랙션 처리 시간", ("route", "name"))
+slack_api_latency = registry.histogram(
+    "slack_api_call_duration_seconds", "Slack Web API 호출 시간 (재시도 포함)", ("method", "status"))
+slack_api_errors = registry.counter(
+    "slack_api_errors_total", "Slack Web API 오류 응답 수", ("method", "error"))
+
+
+# route별로 name 라벨에 쓸 수 있는 값. 커맨드 / callback_id 등은 요청 본문에서 오므로
+# 등록되지 않은 값은 모두 "other"로 묶어 시계열 수가 늘어나지 않게 한다
+OTHER = "other"
+COMMON_NAMES = frozenset(("", "busy", "duplicate"))
+_known_names = {}
+
+
+def known_names(route: str, names):
+    """route의 name 라벨 허용 목록에 names를 추가한다 (서버 기동 시 한 번 호출)"""
+    _known_names.setdefault(route, set()).update(names)
+
+
+def metric_name(route: str, name) -> str:
+    if name is None:
+        return ""
+    if isinstance(name, str) and (name in COMMON_NAMES or name in _known_names.get(route, ())):
+        return name
+    return OTHER
+
+
+def observe_request(route: str, name: str, status: int, elapsed: float):
+    name = metric_name(route, name)
+    request_count.inc(route, name, str(status))
+    request_latency.observe(elapsed, route, name)
+
+
+def observe_slack_call(method: str, elapsed: float, response: dict):
+    """Slack API 호출 하나를 기록한다. status는 ok / error."""
+    ok = bool(response.get("ok"))
+    slack_api_latency.observe(elapsed, method, "ok" if ok else "error")
+    if not ok:
+        # 오류 코드는 종류가 한정되도록 앞부분만 사용 (예: "request_failed: ConnectionError" → request_failed)
+        slack_api_errors.inc(method, str(response.get("error", "unknown")).split(":")[0])
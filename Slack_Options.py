@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Slack external_select 제한: 응답당 옵션 100개, 옵션 텍스트 75자
+MAX_OPTIONS = 100
+MAX_TEXT = 75
+MAX_PREFIX = 20
+
+Option = namedtuple("Option", ["value", "text", "terms"])
+
+
+def _trigrams(term: str):
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+class OptionIndex:
+    """옵션 목록에 대한 읽기 전용 검색 인덱스 (만든 뒤에는 바꾸지 않으므로 잠금 없이 조회한다).
+
+    - 접두어 인덱스: 검색어(소문자)가 어떤 단어의 앞부분과 같으면 바로 찾는다
+    - 트라이그램 인덱스: 3글자 이상이면 단어 중간에 있는 문자열도 찾는다
+    결과 순서는 접두어 일치 → 부분 일치, 각각 원래 옵션 순서.
+    """
+
+    def __init__(self, options):
+        self.options = list(options)
+        self._prefixes = {}
+        self._trigrams = {}
+        for position, option in enumerate(self.options):
+            for term in option.terms:
+                for i in range(1, min(len(term), MAX_PREFIX) + 1):
+                    self._prefixes.setdefault(term[:i], set()).add(position)
+                for gram in _trigrams(term):
+                    self._trigrams.setdefault(gram, set()).add(position)
+
+    def search(self, query: str, limit: int = MAX_OPTIONS) -> list:
+        query = (query or "").strip().lower()
+        if not query:
+            return self.options[:limit]
+        prefix_hits = self._prefixes.get(query[:MAX_PREFIX], set())
+        if len(query) > MAX_PREFIX:
+            prefix_hits = {p for p in prefix_hits if any(t.startswith(query) for t in self.options[p].terms)}
+        substring_hits = set()
+        if len(query) >= 3:
+            grams = sorted(_trigrams(query), key=lambda g: len(self._trigrams.get(g, ())))
+            candidates = set(self._trigrams.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not candidates:
+                    break
+                candidates &= self._trigrams.get(gram, set())
+            substring_hits = {p for p in candidates - prefix_hits
+                              if any(query in t for t in self.options[p].terms)}
+        ordered = sorted(prefix_hits)[:limit]
+        if len(ordered) < limit:
+            ordered += sorted(substring_hits)[:limit - len(ordered)]
+        return [self.options[p] for p in ordered]
+
+    def __len__(self):
+        return len(self.options)
+
+
+def make_option(value: str, text: str, *extra_terms) -> Option:
+    """검색어: 값, 표시 텍스트, 텍스트의 각 단어, 추가 검색어 (모두 소문자)"""
+    terms = {value.lower(), text.lower(), *(w.lower() for w in text.split()), *(t.lower() for t in extra_terms)}
+    return Option(value, text[:MAX_TEXT], tuple(sorted(t for t in terms if t)))
+
+
+def to_slack_options(options) -> list:
+    return [{"text": {"type": "plain_text", "text": o.text}, "value": o.value} for o in options]
+
+
+class OptionsProvider:
+    """action_id별 OptionIndex를 백그라운드에서 주기적으로 다시 만들어 교체한다.
+
+    sources: {이름: 함수} — 함수는 {인덱스 이름: [Option, ...]}를 돌려준다.
+    keystroke 요청(search)은 메모리의 인덱스만 보고 업스트림 API를 호출하지 않는다.
+    """
+
+    def __init__(self, sources: dict, refresh_interval: float = 60, retry_interval: float = 5):
+        self._sources = sources
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self._indexes = {}
+        self.refreshed_at = 0.0
+
+    def refresh(self) -> bool:
+        """모든 source를 다시 읽는다. 아직 준비되지 않은(빈 결과 / 오류) source가 있으면 False."""
+        indexes = dict(self._indexes)
+        complete = True
+        for name, source in self._sources.items():
+            try:
+                built = source()
+            except Exception as e:
+                logger.error("옵션 인덱스 갱신 실패 (%s): %s", name, e)
+                built = {}
+            if not built:
+                complete = False
+            for key, options in built.items():
+                indexes[key] = OptionIndex(options)
+        self._indexes = indexes  # 통째로 교체 (조회 중인 요청은 이전 인덱스를 계속 사용)
+        self.refreshed_at = time.time()
+        return complete
+
+    def _run(self):
+        while True:
+            complete = self.refresh()
+            time.sleep(self.refresh_interval if complete else self.retry_interval)
+
+    def start(self):
+        threading.Thread(target=self._run, name="options-refresh", daemon=True).start()
+
+    def search(self, key: str, query: str, fallback: str = None) -> list:
+        index = self._indexes.get(key)
+        if index is None and fallback is not None:
+            index = self._indexes.get(fallback)
+        return index.search(query) if index is not None else []
+
+    def stats(self) -> dict:
+        return {"indexes": {k: len(v) for k, v in self._indexes.items()}, "refreshed_at": self.refreshed_at}
+
+
+def work_type_source(work_type_options: dict):
+    def source():
+        return {"work_type": [make_option(k, v, k.replace("_task", "")) for k, v in work_type_options.items()]}
+    return source
+
+
+def jira_source(jira_meta):
+    """Jira 프로젝트 / 프로젝트별 이슈 타입 인덱스. 이슈 타입 전체 목록("issuetype")은 프로젝트 미선택 시 사용."""
+    def source():
+        projects = jira_meta.projects()
+        if not projects:
+            return {}
+        indexes = {"project": [make_option(p["key"], f"{p['key']} - {p['name']}") for p in projects]}
+        all_types = {}
+        for project in projects:
+            types = sorted(project["issuetypes"].values())
+            indexes[f"issuetype:{project['key']}"] = [make_option(t, t) for t in types]
+            for t in types:
+                all_types.setdefault(t, make_option(t, t))
+        indexes["issuetype"] = [all_types[t] for t in sorted(all_types)]
+        return indexes
+    return source
+
+
+# external_select action_id → 인덱스 이름
+ACTION_INDEXES = {
+    "work_type_select": "work_type",
+    "project_select": "project",
+    "issuetype_select": "issuetype",
+}
+
+
+def block_suggestion_options(provider: OptionsProvider, data: dict) -> dict:
+    """block_suggestion payload에 대한 응답({"options": [...]})을 만든다."""
+    key = ACTION_INDEXES.get(data.get("action_id"))
+    if key is None:
+        return {"options": []}
+    fallback = None
+    if key == "issuetype":
+        # 프로젝트를 이미 골랐으면 그 프로젝트에서 쓸 수 있는 이슈 타입만 보여 준다
+        values = (data.get("view") or {}).get("state", {}).get("values", {})
+        selected = (values.get("project", {}).get("project_select", {}) or {}).get("selected_option") or {}
+        if selected.get("value"):
+            key, fallback = f"issuetype:{selected['value']}", "issuetype"
+    return {"options": to_slack_options(provider.search(key, data.get("value", ""), fallback))}
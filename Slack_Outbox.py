@@ -0,0 +1,304 @@
+import logging
+import queue
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import Slack_Json
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    data BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    delivered_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class Outbox:
+    """제출된 요청을 SQLite(WAL)에 먼저 저장하고 백그라운드 디스패처가 발송하는 outbox.
+
+    - enqueue(): 쓰기 스레드가 모아서 한 트랜잭션으로 커밋(group commit)한 뒤 반환 → 제출당 fsync 비용 최소화
+    - 디스패처: 빈 발송 슬롯(concurrency)만큼만 발송 시각이 된 항목을 가져와 하나씩 deliver(kind, data)로 보내고,
+      끝난 항목부터 바로 상태를 저장한다 (느린 항목 하나가 다른 항목을 막지 않는다)
+    - 실패하면 지수 백오프로 재시도하되, retryable(result)가 False인 오류(채널 없음, 이미 게시됐을 수 있는 실패 등)는
+      바로 dead로 남기고 on_dead(kind, data, result)를 부른다 (요청자 알림)
+    - 최소 1회 전달(at-least-once): 발송 후 상태 커밋 전에 프로세스가 죽으면 lease가 끝난 뒤 다시 보낸다
+    - gunicorn 워커 여러 개가 같은 파일을 써도 항목을 lease로 선점하고, 발송 중인 항목은 lease/3마다 연장하므로
+      오래 걸리는 항목(일괄 요청 등)도 다른 워커가 다시 가져가지 않는다
+    - 끝난 항목(sent / dead)은 retention초 뒤 purge_interval마다 지운다 (제출 내용을 계속 쌓아 두지 않는다)
+    """
+
+    def __init__(self, path: str, deliver, concurrency: int = 8, batch_size: int = 100,
+                 max_attempts: int = 10, backoff_base: float = 2.0, max_backoff: float = 600,
+                 poll_interval: float = 1.0, lease: float = 60, lag_window: int = 500, retryable=None,
+                 on_dead=None, retention: float = 7 * 86400, purge_interval: float = 3600):
+        self.path = path
+        self._deliver = deliver
+        self._retryable = retryable or (lambda result: True)
+        self._on_dead = on_dead
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.retention = retention
+        self.purge_interval = purge_interval
+        conn = connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._writes = queue.Queue()
+        self._wakeup = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="outbox-send")
+        self._lock = threading.Lock()
+        self._running = {}  # 발송 중인 row id -> 선점 시점의 attempts (lease 연장 / 상태 저장 조건)
+        self._conns = threading.local()
+        self._lags = deque(maxlen=lag_window)
+        self._delivered = 0
+        self._retried = 0
+        self._dead = 0
+        threading.Thread(target=self._write_loop, name="outbox-writer", daemon=True).start()
+        threading.Thread(target=self._dispatch_loop, name="outbox-dispatcher", daemon=True).start()
+
+    # ---- 저장 ----
+
+    def enqueue(self, kind: str, data: dict, timeout: float = 5.0) -> int:
+        """항목을 저장하고(커밋 완료까지 대기) row id를 돌려준다."""
+        done = threading.Event()
+        item = {"kind": kind, "data": Slack_Json.dumps(data), "done": done, "id": None, "error": None}
+        self._writes.put(item)
+        if not done.wait(timeout):
+            raise TimeoutError("outbox 저장 지연")
+        if item["error"]:
+            raise item["error"]
+        return item["id"]
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            now = time.time()
+            try:
+                with conn:
+                    for item in batch:
+                        cur = conn.execute(
+                            "INSERT INTO outbox (kind, data, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+                            (item["kind"], item["data"], now, now),
+                        )
+                        item["id"] = cur.lastrowid
+            except sqlite3.Error as e:
+                logger.exception("outbox 저장 실패")
+                for item in batch:
+                    item["error"] = e
+            for item in batch:
+                item["done"].set()
+            self._wakeup.set()
+
+    # ---- 발송 ----
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_backoff, self.backoff_base * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _conn(self) -> sqlite3.Connection:
+        """발송 스레드별 연결 (끝난 항목의 상태를 각자 저장한다)"""
+        conn = getattr(self._conns, "conn", None)
+        if conn is None:
+            conn = self._conns.conn = connect(self.path)
+            conn.isolation_level = None
+        return conn
+
+    def _send(self, row):
+        row_id, kind, data, attempts, created_at = row
+        try:
+            try:
+                result = self._deliver(kind, Slack_Json.loads(data))
+            except Exception as e:
+                logger.exception("outbox 발송 오류 (id=%s)", row_id)
+                result = {"ok": False, "error": f"exception: {e}"}
+            if self._complete(row_id, attempts, created_at, result) == "dead" and self._on_dead is not None:
+                try:
+                    self._on_dead(kind, Slack_Json.loads(data), result)
+                except Exception:
+                    logger.exception("outbox 발송 포기 알림 실패 (id=%s)", row_id)
+        finally:
+            with self._lock:
+                self._running.pop(row_id, None)
+            self._wakeup.set()  # 빈 슬롯이 생겼으므로 다음 항목을 가져온다
+
+    def _complete(self, row_id, claimed_attempts, created_at, result):
+        """상태를 저장하고 저장한 상태를 돌려준다 (다른 워커가 다시 가져갔거나 저장에 실패하면 None)"""
+        now = time.time()
+        attempts = claimed_attempts + 1
+        with self._lock:
+            if result.get("ok"):
+                update = ("sent", attempts, now, now, None)
+                self._delivered += 1
+                self._lags.append(now - created_at)
+            elif attempts >= self.max_attempts or not self._retryable(result):
+                update = ("dead", attempts, now, None, result.get("error"))
+                self._dead += 1
+                logger.error("outbox 발송 포기 (id=%s, %d회): %s", row_id, attempts, result.get("error"))
+            else:
+                update = ("pending", attempts, now + self._backoff(attempts), None, result.get("error"))
+                self._retried += 1
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # 선점한 뒤 attempts가 바뀌었으면(lease가 끝나 다른 워커가 다시 가져감) 그쪽 결과를 덮어쓰지 않는다
+            cur = conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, delivered_at = ?, "
+                "last_error = ? WHERE id = ? AND attempts = ?",
+                (*update, row_id, claimed_attempts),
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            # 상태 저장 실패 시 lease 만료 후 다시 발송된다 (at-least-once)
+            logger.exception("outbox 상태 저장 실패 (id=%s)", row_id)
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            return None
+        return update[0] if cur.rowcount else None
+
+    def _claim(self, conn, limit: int) -> list:
+        """발송할 항목을 가져오면서 next_attempt_at을 lease만큼 미뤄 다른 프로세스가 가져가지 못하게 한다."""
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, kind, data, attempts, created_at FROM outbox "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ? WHERE id = ?",
+                [(now + self.lease, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def _renew(self, conn):
+        """발송 중인 항목의 lease를 연장한다 (상태가 이미 저장된 항목은 attempts가 달라 건너뛴다)."""
+        with self._lock:
+            running = list(self._running.items())
+        if not running:
+            return
+        until = time.time() + self.lease
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ? WHERE id = ? AND status = 'pending' AND attempts = ?",
+                [(until, row_id, attempts) for row_id, attempts in running],
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def purge(self, conn=None) -> int:
+        """끝난 지 retention초가 지난 sent / dead 항목을 지우고 지운 수를 돌려준다 (끝난 시각 = next_attempt_at)"""
+        own = conn is None
+        conn = conn or connect(self.path)
+        try:
+            with conn:
+                cur = conn.execute(
+                    "DELETE FROM outbox WHERE status IN ('sent', 'dead') AND next_attempt_at < ?",
+                    (time.time() - self.retention,),
+                )
+        finally:
+            if own:
+                conn.close()
+        if cur.rowcount:
+            logger.info("outbox 보존 기간이 지난 항목 %d건 삭제", cur.rowcount)
+        return cur.rowcount
+
+    def _dispatch_loop(self):
+        conn = connect(self.path)
+        conn.isolation_level = None  # 트랜잭션을 직접 관리 (BEGIN IMMEDIATE)
+        renew_at = time.monotonic() + self.lease / 3
+        purge_at = time.monotonic()
+        while True:
+            self._wakeup.clear()
+            if time.monotonic() >= purge_at:
+                purge_at = time.monotonic() + self.purge_interval
+                try:
+                    self.purge(conn)
+                except sqlite3.Error:
+                    logger.exception("outbox 만료 항목 정리 실패")
+            if time.monotonic() >= renew_at:
+                renew_at = time.monotonic() + self.lease / 3
+                try:
+                    self._renew(conn)
+                except sqlite3.Error:
+                    logger.exception("outbox lease 연장 실패")
+            with self._lock:
+                free = min(self.concurrency - len(self._running), self.batch_size)
+            if free <= 0:
+                self._wakeup.wait(max(0.0, renew_at - time.monotonic()))
+                continue
+            try:
+                rows = self._claim(conn, free)
+            except sqlite3.Error:
+                logger.exception("outbox 조회 실패")
+                self._wakeup.wait(self.poll_interval)
+                continue
+            if not rows:
+                self._wakeup.wait(min(self.poll_interval, max(0.0, renew_at - time.monotonic())))
+                continue
+            with self._lock:
+                for row in rows:
+                    self._running[row[0]] = row[3]
+            for row in rows:
+                self._pool.submit(self._send, row)
+
+    def stats(self) -> dict:
+        conn = connect(self.path)
+        try:
+            backlog, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM outbox WHERE status = 'pending'"
+            ).fetchone()
+        finally:
+            conn.close()
+        with self._lock:
+            lags = sorted(self._lags)
+            return {
+                "backlog": backlog,
+                "in_flight": len(self._running),
+                "oldest_pending_age_s": round(time.time() - oldest, 1) if oldest else 0.0,
+                "delivered": self._delivered,
+                "retried": self._retried,
+                "dead": self._dead,
+                "delivery_lag_ms": {
+                    "p50": round(lags[len(lags) // 2] * 1000, 1) if lags else 0.0,
+                    "p95": round(lags[min(len(lags) - 1, int(len(lags) * 0.95))] * 1000, 1) if lags else 0.0,
+                },
+            }
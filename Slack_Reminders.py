@@ -0,0 +1,272 @@
+"""업무 마감 리마인더
+
+업무 요청(단건 / 일괄)이 채널에 올라가면 종료일 기준 리마인더를 SQLite에 저장해 두고,
+예정 시각이 되면 담당자에게 DM을, 업무 유형 채널(CHANNEL_MAP)에 알림을 보낸다.
+
+- 저장: reminders 테이블 (status, due_at) 인덱스 → 재기동 시 곧 울릴 항목만 범위 조회로 복구한다
+- 타이머: 앞으로 horizon초 안에 울릴 항목만 메모리 힙(due_at, id)에 올려 두고 가장 이른 항목까지 잠든다.
+  추가는 O(log n)이고, 매 tick마다 전체 업무를 훑지 않는다. 구간이 끝나 가면 다음 구간을 한 번 조회해 채운다.
+  이때 이미 지난 pending 항목도 다시 올린다 (다른 워커가 저장한 뒤 죽었거나, 그 워커만 구간을 읽은 항목을 넘겨받는다)
+- 같은 시각(예: 오전 10시)에 몰린 항목은 batch_size개씩 묶어 send(목록)으로 한 번에 넘긴다
+- 여러 gunicorn 워커가 같은 파일을 써도 status를 pending → sent로 바꾸는 데 성공한 워커만 보낸다
+- 발송 실패 시 retry_delay 뒤 다시 시도하고 max_attempts번 실패하면 failed로 남긴다.
+  발송 도중 프로세스가 죽으면 그 리마인더는 다시 보내지 않는다 (중복 알림보다 누락을 택함)
+- 예정 시각보다 max_delay초 넘게 지난 항목(오래 꺼져 있다 재기동한 경우)은 보내지 않고 expired로 남긴다
+- 끝난 항목(sent / expired / failed)은 retention초 뒤 purge_interval마다 지운다 (outbox와 같은 방식)
+"""
+import heapq
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from Slack_Outbox import connect
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    due_at REAL NOT NULL,
+    days_left INTEGER NOT NULL,
+    work_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    assignee_user_id TEXT NOT NULL,
+    channel TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders (status, due_at);
+"""
+
+COLUMNS = ("id", "due_at", "days_left", "work_type", "title", "end_date", "assignee_user_id", "channel", "attempts")
+
+_PERIOD = re.compile(r"^\s*(\S+)\s*~\s*(\S+)\s*$")
+
+
+def period_dates(period: str):
+    """업무 메시지의 기간 문자열("2025-01-01 ~ 2025-01-09") → (시작일, 종료일). 기간 미설정이면 ("", "")"""
+    match = _PERIOD.match(period or "")
+    return match.groups() if match else ("", "")
+
+
+def parse_days(spec: str) -> tuple:
+    """REMINDER_DAYS_BEFORE 형식("3,1,0") → 종료일 며칠 전에 알릴지 (내림차순, 중복 제거)"""
+    days = {int(part) for part in (spec or "").split(",") if part.strip()}
+    return tuple(sorted((d for d in days if d >= 0), reverse=True))
+
+
+class ReminderScheduler:
+    """종료일 기준 리마인더 저장 + 힙 타이머. send(reminders) → reminders와 같은 순서의 결과 dict 목록"""
+
+    def __init__(self, path: str, send, days_before=(1, 0), hour: int = 10, tz=None,
+                 horizon: float = 3600, batch_size: int = 500, max_attempts: int = 3,
+                 retry_delay: float = 300, max_delay: float = 86400,
+                 retention: float = 7 * 86400, purge_interval: float = 3600):
+        self.path = path
+        self._send = send
+        self.days_before = tuple(days_before)
+        self.hour = hour
+        self.tz = tz
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._conn = connect(path)
+        self._conn.executescript(SCHEMA)
+        self._heap = []             # (due_at, id) — loaded_until 이전에 울릴 항목만
+        self._loaded_until = 0.0    # 이 시각 전의 pending 항목은 모두 힙에 올라와 있다
+        self._cond = threading.Condition()
+        self.sent = 0
+        self.failed = 0
+        self.expired = 0
+        threading.Thread(target=self._run, name="reminder-timer", daemon=True).start()
+
+    def due_times(self, end_date: str) -> list:
+        """종료일 → [(남은 일수, 알림 시각 epoch)] (days_before마다 그날 hour시)"""
+        end = date.fromisoformat(end_date)
+        result = []
+        for days in self.days_before:
+            day = end - timedelta(days=days)
+            result.append((days, datetime(day.year, day.month, day.day, self.hour, tzinfo=self.tz).timestamp()))
+        return result
+
+    def schedule(self, items: list) -> int:
+        """items: [{"work_type", "title", "end_date", "assignee_user_id", "channel"}] → 저장한 리마인더 수
+
+        이미 지난 알림 시각은 건너뛴다 (종료일이 내일인데 오늘 알림 시각이 지났으면 당일 알림만 남는다).
+        """
+        now = time.time()
+        rows = []
+        for item in items:
+            try:
+                times = self.due_times(item["end_date"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            for days_left, due_at in times:
+                if due_at > now:
+                    rows.append((due_at, days_left, item["work_type"], item["title"], item["end_date"],
+                                 item["assignee_user_id"], item.get("channel"), now))
+        if not rows:
+            return 0
+        with self._cond:
+            # 구간 경계 판단과 저장을 같은 락 안에서 해야 _refill과 엇갈려 빠지는 항목이 없다
+            with self._conn:
+                ids = []
+                for row in rows:
+                    cur = self._conn.execute(
+                        "INSERT INTO reminders (due_at, days_left, work_type, title, end_date, assignee_user_id, "
+                        "channel, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        row,
+                    )
+                    ids.append(cur.lastrowid)
+            for row_id, row in zip(ids, rows):
+                if row[0] < self._loaded_until:
+                    heapq.heappush(self._heap, (row[0], row_id))
+            self._cond.notify()
+        return len(rows)
+
+    def _refill(self, now):
+        """[loaded_until, now + horizon) 구간과 이미 지난 pending 항목을 힙에 올린다 (첫 호출 = 재기동 복구)
+
+        지난 항목이 이미 힙에 있어도 선점(_claim)에서 한 번만 보내진다.
+        """
+        until = now + self.horizon
+        rows = self._conn.execute(
+            "SELECT due_at, id FROM reminders WHERE status = 'pending' AND due_at < ? AND (due_at >= ? OR due_at <= ?)",
+            (until, self._loaded_until, now),
+        ).fetchall()
+        for row in rows:
+            heapq.heappush(self._heap, row)
+        self._loaded_until = until
+        if rows:
+            logger.info("리마인더 %d건 로드 (%s까지)", len(rows), time.strftime("%H:%M:%S", time.localtime(until)))
+
+    def _claim(self, ids, now) -> list:
+        """pending → sent로 바꾼 항목만 돌려준다 (다른 워커가 먼저 가져갔거나 재시도로 미뤄진 항목은 빠진다)"""
+        claimed = []
+        with self._conn:
+            for row_id in ids:
+                cur = self._conn.execute(
+                    "UPDATE reminders SET status = 'sent', attempts = attempts + 1, sent_at = ? "
+                    "WHERE id = ? AND status = 'pending' AND due_at <= ?",
+                    (now, row_id, now),
+                )
+                if cur.rowcount:
+                    claimed.append(row_id)
+            if not claimed:
+                return []
+            marks = ",".join("?" * len(claimed))
+            rows = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM reminders WHERE id IN ({marks})",
+                                      claimed).fetchall()
+            reminders = [dict(zip(COLUMNS, row)) for row in rows]
+            stale = [r["id"] for r in reminders if now - r["due_at"] > self.max_delay]
+            if stale:
+                self._conn.executemany("UPDATE reminders SET status = 'expired' WHERE id = ?", [(i,) for i in stale])
+                self.expired += len(stale)
+                logger.warning("리마인더 %d건 만료 (예정 시각보다 %ss 넘게 지남)", len(stale), self.max_delay)
+        return [r for r in reminders if now - r["due_at"] <= self.max_delay]
+
+    def _finish(self, reminders, results):
+        now = time.time()
+        retries = []
+        updates = []
+        for reminder, result in zip(reminders, results):
+            if result.get("ok"):
+                self.sent += 1
+            elif reminder["attempts"] >= self.max_attempts:  # 선점 시 이미 1 늘어난 값
+                updates.append(("failed", reminder["due_at"], result.get("error"), reminder["id"]))
+                self.failed += 1
+                logger.error("리마인더 발송 포기 (id=%s): %s", reminder["id"], result.get("error"))
+            else:
+                updates.append(("pending", now + self.retry_delay, result.get("error"), reminder["id"]))
+                retries.append((now + self.retry_delay, reminder["id"]))
+        if not updates:
+            return
+        with self._cond:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE reminders SET status = ?, due_at = ?, last_error = ? WHERE id = ?", updates,
+                )
+            for due_at, row_id in retries:
+                if due_at < self._loaded_until:
+                    heapq.heappush(self._heap, (due_at, row_id))
+
+    def purge(self) -> int:
+        """끝난 지 retention초가 지난 sent / expired / failed 항목을 지우고 지운 수를 돌려준다 (끝난 시각 = sent_at)"""
+        with self._cond:
+            with self._conn:
+                cur = self._conn.execute(
+                    "DELETE FROM reminders WHERE status IN ('sent', 'expired', 'failed') AND sent_at < ?",
+                    (time.time() - self.retention,),
+                )
+        if cur.rowcount:
+            logger.info("리마인더 보존 기간이 지난 항목 %d건 삭제", cur.rowcount)
+        return cur.rowcount
+
+    def _run(self):
+        purge_at = time.monotonic()
+        while True:
+            if time.monotonic() >= purge_at:
+                purge_at = time.monotonic() + self.purge_interval
+                try:
+                    self.purge()
+                except sqlite3.Error:
+                    logger.exception("리마인더 만료 항목 정리 실패")
+            with self._cond:
+                now = time.time()
+                if now + self.horizon / 2 >= self._loaded_until:
+                    try:
+                        self._refill(now)
+                    except sqlite3.Error:
+                        logger.exception("리마인더 조회 실패")
+                ids = []
+                while self._heap and self._heap[0][0] <= now and len(ids) < self.batch_size:
+                    ids.append(heapq.heappop(self._heap)[1])
+                if not ids:
+                    wake = self._loaded_until - self.horizon / 2
+                    if self._heap:
+                        wake = min(wake, self._heap[0][0])
+                    self._cond.wait(max(0.05, min(wake - now, self.horizon / 2)))
+                    continue
+                try:
+                    reminders = self._claim(ids, now)
+                except sqlite3.Error:
+                    # 상태를 못 바꿨으면 DB에는 pending으로 남아 있으므로 처음부터 다시 조회한다 (힙 중복은 선점에서 걸러진다)
+                    logger.exception("리마인더 선점 실패")
+                    self._loaded_until = 0.0
+                    continue
+            if not reminders:
+                continue
+            try:
+                results = self._send(reminders)
+            except Exception as e:
+                logger.exception("리마인더 발송 오류")
+                results = [{"ok": False, "error": str(e)}] * len(reminders)
+            try:
+                self._finish(reminders, results)
+            except sqlite3.Error:
+                logger.exception("리마인더 상태 저장 실패")
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending, next_due = self._conn.execute(
+                "SELECT COUNT(*), MIN(due_at) FROM reminders WHERE status = 'pending'"
+            ).fetchone()
+            return {
+                "pending": pending,
+                "loaded": len(self._heap),
+                "next_due_in_s": round(next_due - time.time(), 1) if next_due else None,
+                "sent": self.sent,
+                "failed": self.failed,
+                "expired": self.expired,
+            }
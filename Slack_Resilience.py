@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+# 일시적인 업스트림 오류 (회로 차단기 실패로 세고, negative 캐시하지 않음)
+# uncertain: 전송 뒤 응답을 못 받은 non-idempotent 호출 (이미 처리됐을 수 있어 다시 보내지 않는다)
+TRANSIENT_ERROR_PREFIXES = ("request_failed", "http_", "ratelimited", "invalid_response", "circuit_open", "uncertain")
+
+# 요청 스레드에서 호출하는 메서드의 전체 시간 예산(초, 재시도 포함). Slack은 3초 안에 응답해야 하고
+# views.open의 trigger_id도 3초 뒤 만료되므로 그보다 짧게 둔다. 나머지 메서드는 클라이언트 기본 timeout/재시도.
+METHOD_BUDGETS = {
+    "views.open": 2.5,
+    "views.update": 2.5,
+    "chat.postEphemeral": 2.5,
+}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def not_sent(error: requests.RequestException) -> bool:
+    """연결을 맺지 못해 요청이 서버에 닿지 않은 실패인지 (연결 거부 / 연결 타임아웃 → POST도 다시 보내도 안전하다)"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError):
+        return False
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def retry_after(response, default: float = 1.0) -> float:
+    """429 응답의 Retry-After(초). 헤더가 없거나 숫자가 아니면 default"""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def is_failure(response: dict) -> bool:
+    """업스트림 장애로 볼 응답인지 (ok=False여도 channel_not_found 같은 API 오류는 정상 응답으로 본다)"""
+    if response.get("ok", True):
+        return False
+    error = str(response.get("error"))
+    return error.startswith(TRANSIENT_ERROR_PREFIXES) and not error.startswith(("ratelimited", "circuit_open"))
+
+
+class CircuitBreaker:
+    """최근 window초 동안의 실패율로 열리고 닫히는 회로 차단기.
+
+    - closed: 호출 허용. 최근 호출이 min_calls 이상이고 실패율이 failure_ratio 이상이면 open
+    - open: open_seconds 동안 호출하지 않고 바로 실패시킨다 (요청 스레드가 타임아웃을 기다리지 않도록)
+    - half_open: 시험 호출 하나만 허용하고, 성공하면 closed / 실패하면 다시 open
+    """
+
+    def __init__(self, name: str, failure_ratio: float = 0.5, min_calls: int = 10, window: float = 30,
+                 open_seconds: float = 30):
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self._calls = deque()  # (시각, 실패 여부)
+        self._failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _trim(self, now):
+        while self._calls and self._calls[0][0] < now - self.window:
+            _, failed = self._calls.popleft()
+            self._failures -= failed
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, failed: bool):
+        now = time.monotonic()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+                if failed:
+                    self._open(now)
+                else:
+                    logger.info("회로 차단기 닫힘: %s", self.name)
+                    self._state = CLOSED
+                    self._calls.clear()
+                    self._failures = 0
+                return
+            self._calls.append((now, failed))
+            self._failures += failed
+            self._trim(now)
+            if (self._state == CLOSED and len(self._calls) >= self.min_calls
+                    and self._failures >= self.failure_ratio * len(self._calls)):
+                self._open(now)
+
+    def _open(self, now):
+        logger.warning("회로 차단기 열림: %s (최근 %d건 중 실패 %d건, %ss 동안 차단)",
+                       self.name, len(self._calls), self._failures, self.open_seconds)
+        self._state = OPEN
+        self._opened_at = now
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {"state": state, "calls": len(self._calls), "failures": self._failures, "rejected": self.rejected}
+
+
+class BreakerRegistry:
+    """엔드포인트(메서드) 이름별 CircuitBreaker. 설정은 모두 같은 값을 쓴다."""
+
+    def __init__(self, **settings):
+        self._settings = settings
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    breaker = self._breakers[name] = CircuitBreaker(name, **self._settings)
+        return breaker
+
+    def is_open(self, name: str) -> bool:
+        breaker = self._breakers.get(name)
+        return breaker is not None and breaker.state == OPEN
+
+    def stats(self) -> dict:
+        return {name: breaker.stats() for name, breaker in list(self._breakers.items())}
+
+
+def breaker_settings(environ) -> dict:
+    """환경 변수(BREAKER_*)에서 CircuitBreaker 설정을 읽는다."""
+    return {
+        "failure_ratio": float(environ.get("BREAKER_FAILURE_RATIO", "0.5")),
+        "min_calls": int(environ.get("BREAKER_MIN_CALLS", "10")),
+        "window": float(environ.get("BREAKER_WINDOW", "30")),
+        "open_seconds": float(environ.get("BREAKER_OPEN_SECONDS", "30")),
+    }
@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# 한 메시지에 넣을 수 있는 최대 block 수 (Slack 제한)
+MAX_BLOCKS = 50
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def _fill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self, now: float) -> float:
+        """토큰을 가져가면 0, 아니면 토큰이 찰 때까지 남은 시간(초)을 돌려준다."""
+        self._fill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def pause(self, now: float, seconds: float):
+        """429 Retry-After 등으로 잠시 발송을 멈춘다."""
+        self._fill(now)
+        self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+    def full(self, now: float) -> bool:
+        """토큰이 다 찼는지 (새로 만든 버킷과 같은 상태)"""
+        self._fill(now)
+        return self._tokens >= self.capacity
+
+
+class _Pending:
+    __slots__ = ("payload", "future", "coalesce", "attempts")
+
+    def __init__(self, payload, coalesce):
+        self.payload = payload
+        self.future = Future()
+        self.coalesce = coalesce
+        self.attempts = 0
+
+
+class MessageScheduler:
+    """채널별 토큰 버킷으로 chat.postMessage 발송 속도를 맞추는 스케줄러.
+
+    - 채널마다 rate(초당 건수)를 넘지 않는다 (Slack: 채널당 약 1건/초)
+    - 발송 가능한 채널들을 라운드로빈으로 돌아가며 처리해 한 채널이 다른 채널을 막지 않는다
+    - 같은 채널에 대기 중인 block 메시지들은 (coalesce=True인 경우) 한 메시지로 합쳐 보낸다
+    - 429(ratelimited)를 받으면 그 채널만 Retry-After 동안 멈추고 같은 메시지를 대기열 맨 앞에 다시 넣는다
+      (max_rate_retries번까지, 그 뒤에는 ratelimited 결과를 돌려준다)
+    - 대기 메시지도 발송 중인 것도 없고 토큰이 다 찬 채널은 evict_interval마다 지운다 (DM 채널이 계속 쌓이지 않도록)
+    post()는 Future를 돌려주며, 결과는 Slack 응답 dict다. 아직 대기열에 있는 메시지는 future.cancel()로 취소할 수 있다
+    (발송을 시작한 메시지는 취소되지 않는다 → cancel()이 False면 그 결과를 기다려야 한다).
+    """
+
+    def __init__(self, send, rate: float = 1.0, burst: float = 1.0, coalesce: bool = True,
+                 senders: int = 8, max_blocks: int = MAX_BLOCKS, max_rate_retries: int = 3,
+                 evict_interval: float = 60):
+        self._send = send
+        self.rate = rate
+        self.burst = burst
+        self.coalesce = coalesce
+        self.max_blocks = max_blocks
+        self.max_rate_retries = max_rate_retries
+        self.evict_interval = evict_interval
+        self._queues: dict[str, deque] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._busy = set()          # 발송 중인 채널 (채널당 동시 발송 1건)
+        self._ring = deque()        # 대기 메시지가 있는 채널 (라운드로빈 순서)
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=senders, thread_name_prefix="post-sender")
+        self._sent = 0
+        self._coalesced = 0
+        self._rate_limited = 0
+        self._evict_at = time.monotonic() + evict_interval
+        threading.Thread(target=self._run, name="message-scheduler", daemon=True).start()
+
+    def post(self, channel: str, payload: dict, coalesce: bool = None) -> Future:
+        pending = _Pending(payload, self.coalesce if coalesce is None else coalesce)
+        with self._cond:
+            queue = self._queues.get(channel)
+            if queue is None:
+                queue = self._queues[channel] = deque()
+                self._buckets[channel] = TokenBucket(self.rate, self.burst)
+            if not queue and channel not in self._busy:
+                self._ring.append(channel)
+            queue.append(pending)
+            self._cond.notify()
+        return pending.future
+
+    def _take_batch(self, queue: deque) -> list:
+        """채널 대기열에서 한 번에 보낼 메시지를 꺼낸다 (취소된 메시지는 버린다). 꺼낸 메시지는 더 이상 취소되지 않는다.
+
+        429로 다시 넣은 메시지는 이미 running 상태다.
+        """
+        batch = []
+        blocks = 0
+        while queue:
+            pending = queue[0]
+            if pending.future.cancelled():
+                queue.popleft()
+                continue
+            if batch:
+                if not (batch[0].coalesce and pending.coalesce and "blocks" in pending.payload):
+                    break
+                if blocks + len(pending.payload["blocks"]) > self.max_blocks:
+                    break
+            queue.popleft()
+            if not (pending.future.running() or pending.future.set_running_or_notify_cancel()):
+                continue
+            batch.append(pending)
+            if not pending.coalesce or "blocks" not in pending.payload:
+                break
+            blocks += len(pending.payload["blocks"])
+        return batch
+
+    @staticmethod
+    def _merge(channel: str, batch: list) -> dict:
+        if len(batch) == 1:
+            return batch[0].payload
+        return {
+            "channel": channel,
+            "blocks": [block for p in batch for block in p.payload["blocks"]],
+            "text": "\n".join(p.payload.get("text", "") for p in batch),
+        }
+
+    def _evict_idle(self, now):
+        """쉬고 있는 채널의 대기열과 버킷을 지운다. 토큰이 다 찬 버킷만 지우므로 다시 만들어도 속도 제한은 같다."""
+        idle = [channel for channel, queue in self._queues.items()
+                if not queue and channel not in self._busy and self._buckets[channel].full(now)]
+        for channel in idle:
+            del self._queues[channel]
+            del self._buckets[channel]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                if now >= self._evict_at:
+                    self._evict_idle(now)
+                    self._evict_at = now + self.evict_interval
+                if not self._ring:
+                    self._cond.wait(self.evict_interval)
+                    continue
+                next_wait = None
+                # 라운드로빈: 토큰이 있는 채널을 하나 찾아 발송, 없으면 가장 빠른 시점까지 대기
+                for _ in range(len(self._ring)):
+                    channel = self._ring.popleft()
+                    wait = self._buckets[channel].try_take(now)
+                    if wait == 0:
+                        batch = self._take_batch(self._queues[channel])
+                        if batch:
+                            self._busy.add(channel)
+                            self._pool.submit(self._deliver, channel, batch)
+                        break
+                    self._ring.append(channel)
+                    next_wait = wait if next_wait is None else min(next_wait, wait)
+                else:
+                    self._cond.wait(next_wait)
+
+    def _deliver(self, channel: str, batch: list):
+        try:
+            result = self._send(self._merge(channel, batch))
+        except Exception as e:
+            logger.exception("메시지 발송 실패 (%s)", channel)
+            result = {"ok": False, "error": str(e)}
+        retry = []
+        if result.get("error") == "ratelimited":
+            # 이 채널만 Retry-After 동안 멈춘다 (다른 채널은 계속 보낸다). Slack에 올라가지 않았으므로 다시 보내도 된다
+            for pending in batch:
+                pending.attempts += 1
+            retry = [pending for pending in batch if pending.attempts <= self.max_rate_retries]
+            with self._cond:
+                self._buckets[channel].pause(time.monotonic(), result.get("retry_after") or 1.0 / self.rate)
+        for pending in batch:
+            if pending not in retry:
+                pending.future.set_result(result)
+        with self._cond:
+            self._sent += 1
+            self._coalesced += len(batch) - 1
+            self._rate_limited += bool(retry)
+            self._busy.discard(channel)
+            self._queues[channel].extendleft(reversed(retry))
+            if self._queues[channel]:
+                self._ring.append(channel)
+                self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": {ch: len(q) for ch, q in self._queues.items() if q},
+                "channels": len(self._queues),
+                "sent": self._sent,
+                "coalesced": self._coalesced,
+                "rate_limited": self._rate_limited,
+            }
@@ -0,0 +1,257 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+
+import Slack_Json
+from Slack_Cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_cache (
+    key TEXT PRIMARY KEY,
+    value BLOB,
+    expires_at REAL NOT NULL DEFAULT 0,
+    stale_until REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+# 이 크기(bytes)를 넘는 값은 zlib으로 압축해서 저장한다
+COMPRESS_THRESHOLD = 512
+
+
+def encode(value) -> bytes:
+    """JSON(orjson이면 orjson) 직렬화 + 큰 값은 zlib 압축. 첫 바이트로 형식을 구분한다."""
+    data = Slack_Json.dumps(value)
+    if len(data) > COMPRESS_THRESHOLD:
+        return b"z" + zlib.compress(data, 6)
+    return b"j" + data
+
+
+def decode(blob: bytes):
+    if blob[:1] == b"z":
+        return Slack_Json.loads(zlib.decompress(blob[1:]))
+    return Slack_Json.loads(blob[1:])
+
+
+class SharedCache:
+    """한 노드의 gunicorn 워커들이 같이 쓰는 SQLite(WAL) 캐시. TTLCache와 같은 get/set 인터페이스.
+
+    - 값은 압축 JSON으로 저장하고, 워커 안에서는 local_ttl 동안 디코딩된 값을 메모리에 둔다 (0이면 사용 안 함)
+    - get_or_fetch(): 키마다 lease를 잡은 호출 하나만 fetch 하고, 나머지는 stale 값을 쓰거나 결과를 기다린다.
+      lease 소유자는 호출마다 새로 만든다 (같은 워커의 다른 스레드도 서로의 lease를 잡거나 풀지 못한다)
+    - None은 negative_ttl 동안만 캐시한다 (TTLCache와 동일)
+    - purge_interval마다 stale 기간까지 지난 행을 지운다 (set()에서 확인, 모든 namespace 대상)
+    """
+
+    def __init__(self, path: str, namespace: str, ttl: float = 3600, negative_ttl: float = 60,
+                 stale_ttl: float = 0, lease: float = 10, wait: float = 2.0, local_ttl: float = 60,
+                 max_size: int = 10000, purge_interval: float = 600):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.lease = lease
+        self.wait = wait
+        self.purge_interval = purge_interval
+        self._purged_at = time.time()
+        self._local = TTLCache(ttl=min(ttl, local_ttl), negative_ttl=min(negative_ttl, local_ttl),
+                               max_size=max_size) if local_ttl > 0 else None
+        self._conns = threading.local()
+        self.fetches = 0
+        self.shared_hits = 0
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._conns, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conns.conn = conn
+        return conn
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _read(self, key):
+        """(값 또는 MISSING, 만료 시각, stale 허용 시각)"""
+        row = self._conn().execute(
+            "SELECT value, expires_at, stale_until FROM shared_cache WHERE key = ?", (self._key(key),)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return MISSING, 0.0, 0.0
+        return decode(row[0]), row[1], row[2]
+
+    def get(self, key, default=MISSING):
+        if self._local is not None:
+            value = self._local.get(key)
+            if value is not MISSING:
+                return value
+        try:
+            value, expires_at, _ = self._read(key)
+        except sqlite3.Error:
+            logger.exception("공유 캐시 조회 실패")
+            return default
+        if value is MISSING or expires_at < time.time():
+            return default
+        self.shared_hits += 1
+        if self._local is not None:
+            self._local.set(key, value)
+        return value
+
+    def peek(self, key):
+        """워커 메모리에 있는 값만 본다 (SQLite 조회 없음). 없으면 MISSING"""
+        return self._local.get(key) if self._local is not None else MISSING
+
+    def set(self, key, value):
+        now = time.time()
+        ttl = self.ttl if value is not None else self.negative_ttl
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO shared_cache (key, value, expires_at, stale_until, lease_owner, lease_until) "
+                "VALUES (?, ?, ?, ?, NULL, 0)",
+                (self._key(key), encode(value), now + ttl, now + ttl + self.stale_ttl),
+            )
+        except sqlite3.Error:
+            logger.exception("공유 캐시 저장 실패")
+        if self._local is not None:
+            self._local.set(key, value)
+        if now - self._purged_at > self.purge_interval:
+            self._purged_at = now
+            self.purge()
+
+    def update(self, key, func) -> bool:
+        """저장된 값을 func(값)의 결과로 바꾼다. 만료 시각은 그대로 둔다.
+
+        읽기와 쓰기를 한 트랜잭션(BEGIN IMMEDIATE)에서 하므로 여러 워커가 동시에 고쳐도 서로 덮어쓰지 않는다.
+        값이 없거나 만료됐으면 아무것도 하지 않고 False (다음 get_or_fetch()가 새로 가져온다).
+        """
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM shared_cache WHERE key = ?", (self._key(key),)
+                ).fetchone()
+                if row is None or row[0] is None or row[1] < time.time():
+                    conn.execute("COMMIT")
+                    return False
+                value = func(decode(row[0]))
+                conn.execute("UPDATE shared_cache SET value = ? WHERE key = ?", (encode(value), self._key(key)))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            logger.exception("공유 캐시 갱신 실패")
+            return False
+        if self._local is not None:
+            self._local.set(key, value)
+        return True
+
+    def delete(self, key):
+        try:
+            self._conn().execute("DELETE FROM shared_cache WHERE key = ?", (self._key(key),))
+        except sqlite3.Error:
+            logger.exception("공유 캐시 삭제 실패")
+        if self._local is not None:
+            self._local.delete(key)
+
+    def purge(self) -> int:
+        """stale 기간까지 지나고 lease도 없는 행을 지운다. 지운 행 수를 돌려준다."""
+        now = time.time()
+        try:
+            cur = self._conn().execute(
+                "DELETE FROM shared_cache WHERE stale_until < ? AND expires_at < ? AND lease_until < ?", (now, now, now),
+            )
+        except sqlite3.Error:
+            logger.exception("공유 캐시 만료 행 정리 실패")
+            return 0
+        return cur.rowcount
+
+    def _acquire(self, key, owner, now) -> bool:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT lease_owner, lease_until FROM shared_cache WHERE key = ?", (self._key(key),)
+            ).fetchone()
+            if row is not None and row[0] and row[1] > now:
+                conn.execute("COMMIT")
+                return False
+            if row is None:
+                conn.execute(
+                    "INSERT INTO shared_cache (key, lease_owner, lease_until) VALUES (?, ?, ?)",
+                    (self._key(key), owner, now + self.lease),
+                )
+            else:
+                conn.execute(
+                    "UPDATE shared_cache SET lease_owner = ?, lease_until = ? WHERE key = ?",
+                    (owner, now + self.lease, self._key(key)),
+                )
+            conn.execute("COMMIT")
+            return True
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _release(self, key, owner):
+        self._conn().execute(
+            "UPDATE shared_cache SET lease_owner = NULL, lease_until = 0 WHERE key = ? AND lease_owner = ?",
+            (self._key(key), owner),
+        )
+
+    def _fetch(self, key, fetch):
+        self.fetches += 1
+        value = fetch()
+        if value is MISSING:
+            return None  # 일시적 실패: 캐시하지 않는다
+        self.set(key, value)
+        return value
+
+    def get_or_fetch(self, key, fetch):
+        """캐시된 값을 돌려주고, 없으면 한 워커만 fetch() 한다.
+
+        fetch()는 캐시할 값(None이면 negative 캐시)을 돌려주고, 일시적 실패면 MISSING을 돌려준다.
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        now = time.time()
+        owner = f"{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex[:8]}"
+        try:
+            if self._acquire(key, owner, now):
+                try:
+                    return self._fetch(key, fetch)
+                finally:
+                    try:
+                        self._release(key, owner)
+                    except sqlite3.Error:
+                        logger.exception("공유 캐시 lease 해제 실패 (lease 시간이 지나면 풀린다)")
+            # 다른 워커가 가져오는 중: stale 값이 있으면 그것을, 없으면 결과를 잠깐 기다린다
+            stale, _, stale_until = self._read(key)
+            if stale is not MISSING and stale_until >= now:
+                return stale
+            deadline = now + self.wait
+            while time.time() < deadline:
+                time.sleep(0.05)
+                value = self.get(key)
+                if value is not MISSING:
+                    return value
+        except sqlite3.Error:
+            logger.exception("공유 캐시 lease 처리 실패, 직접 조회")
+        return self._fetch(key, fetch)
+
+    def stats(self) -> dict:
+        return {"fetches": self.fetches, "shared_hits": self.shared_hits}
+
+    def __contains__(self, key):
+        return self.get(key) is not MISSING
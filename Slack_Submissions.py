@@ -0,0 +1,143 @@
+"""view_submission payload → callback_id별 요청 객체
+
+모달 정의(Slack_Views)에서 input 블록의 block_id / action_id / 요소 type / optional을 import 시 한 번 읽어 두고,
+제출 시에는 필요한 값만 꺼내 __slots__ dataclass로 만든다.
+- 블록이 없거나 값이 비어 있으면 KeyError 대신 view_submission errors 형식({block_id: 메시지})으로 돌려준다
+- 필드 매핑이 모달 정의와 어긋나면(block_id / action_id 변경 등) import 시점에 실패한다
+- payload JSON은 Slack_Json(orjson이 있으면 orjson)으로 한 번만 파싱한다
+"""
+from dataclasses import dataclass, field
+
+import Slack_Json
+from Slack_Views import jira_issue_create_view, meeting_request_view, work_bulk_create_view, work_create_view
+
+# 입력 요소 type → state value에서 읽을 키
+ELEMENT_VALUE_KEYS = {
+    "plain_text_input": "value",
+    "external_select": "selected_option",
+    "static_select": "selected_option",
+    "users_select": "selected_user",
+    "multi_users_select": "selected_users",
+    "datepicker": "selected_date",
+}
+SELECT_KEYS = {"selected_option", "selected_user", "selected_users", "selected_date"}
+
+
+@dataclass(slots=True)
+class WorkRequest:
+    user_id: str
+    work_type: str
+    title: str
+    content: str
+    assignee_user_id: str
+    start_date: str = ""
+    end_date: str = ""
+    plan_url: str = ""
+
+    @property
+    def period(self) -> str:
+        return f"{self.start_date} ~ {self.end_date}" if self.start_date and self.end_date else "기간 미설정"
+
+    def fields(self) -> dict:
+        """process_work_request 인자"""
+        return {"work_type": self.work_type, "title": self.title, "content": self.content, "period": self.period,
+                "plan_url": self.plan_url, "assignee_user_id": self.assignee_user_id, "user_id": self.user_id}
+
+
+@dataclass(slots=True)
+class MeetingRequest:
+    user_id: str
+    title: str
+    assignees: list = field(default_factory=list)
+    document: str = ""
+    content: str = ""
+
+    def fields(self) -> dict:
+        """process_meeting_request 인자"""
+        return {"title": self.title, "document": self.document, "content": self.content, "assignees": self.assignees,
+                "user_id": self.user_id}
+
+
+@dataclass(slots=True)
+class JiraIssueRequest:
+    user_id: str
+    summary: str
+    project_key: str
+    issuetype: str
+    description: str = ""
+
+
+@dataclass(slots=True)
+class WorkBulkRequest:
+    user_id: str
+    rows_text: str
+
+
+def _get(value, key):
+    return value.get(key) if isinstance(value, dict) else None
+
+
+class SubmissionParser:
+    """모달 하나의 state.values → 요청 객체. attrs: {속성 이름: block_id}"""
+
+    def __init__(self, cls, view: dict, attrs: dict):
+        self.cls = cls
+        blocks = {b["block_id"]: b for b in view["blocks"] if b.get("type") == "input"}
+        self._fields = []
+        for attr, block_id in attrs.items():
+            block = blocks.get(block_id)
+            if block is None:
+                raise ValueError(f"{view['callback_id']}: 모달에 없는 block_id {block_id}")
+            element = block["element"]
+            key = ELEMENT_VALUE_KEYS[element["type"]]
+            label = block["label"]["text"]
+            message = f"{label}을(를) 선택하세요" if key in SELECT_KEYS else f"{label}을(를) 입력하세요"
+            self._fields.append((attr, block_id, element["action_id"], key, not block.get("optional", False), message))
+
+    def parse(self, values: dict, user_id: str):
+        """(요청 객체 또는 None, 오류 dict). 형식이 맞지 않는 값은 입력하지 않은 것으로 본다 (필수 항목 오류)"""
+        kwargs = {"user_id": user_id}
+        errors = {}
+        for attr, block_id, action_id, key, required, message in self._fields:
+            value = _get(_get(_get(values, block_id), action_id), key)
+            if key == "selected_option":
+                value = _get(value, "value")
+            if not value or (key == "value" and not (isinstance(value, str) and value.strip())):
+                if required:
+                    errors[block_id] = message
+                continue
+            kwargs[attr] = value
+        if errors:
+            return None, errors
+        return self.cls(**kwargs), {}
+
+
+PARSERS = {
+    "work_create_modal": SubmissionParser(WorkRequest, work_create_view(), {
+        "work_type": "work_type", "title": "title", "content": "content", "start_date": "start_date",
+        "end_date": "end_date", "plan_url": "plan_url", "assignee_user_id": "assignee",
+    }),
+    "meeting_review_modal": SubmissionParser(MeetingRequest, meeting_request_view(), {
+        "title": "title", "assignees": "assignee", "document": "document", "content": "content",
+    }),
+    "jira_issue_create_modal": SubmissionParser(JiraIssueRequest, jira_issue_create_view(), {
+        "summary": "summary", "description": "description", "project_key": "project", "issuetype": "issuetype",
+    }),
+    "work_bulk_create_modal": SubmissionParser(WorkBulkRequest, work_bulk_create_view(), {"rows_text": "rows"}),
+}
+
+
+def parse_submission(data: dict):
+    """view_submission payload(dict) → (callback_id, 요청 객체 또는 None, 오류 dict). 모르는 callback_id면 (id, None, {})"""
+    view = data.get("view") or {}
+    callback_id = view.get("callback_id")
+    parser = PARSERS.get(callback_id)
+    if parser is None:
+        return callback_id, None, {}
+    request, errors = parser.parse((view.get("state") or {}).get("values") or {}, (data.get("user") or {}).get("id"))
+    return callback_id, request, errors
+
+
+def decode_submission(payload):
+    """interactions 요청의 payload 필드(str/bytes)를 파싱해 parse_submission 한다."""
+    return parse_submission(Slack_Json.loads(payload))
@@ -4,45 +4,71 @@ import json
 import requests
 from flask import Flask, request, jsonify
 
+import Slack_Logging
+from Slack_Events import handle_envelope, verify_signature
+from Slack_Members import MemberDirectory, users_list_page_fetcher
+from Slack_Mentions import ChunkedDelivery, chunk_lines, mention_lines, take_within_budget
+
+Slack_Logging.setup_logging()
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s")
 
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 if not SLACK_BOT_TOKEN:
     raise ValueError("Slack Bot Token이 설정되지 않았습니다. 환경변수 확인 필요")
 
+SLACK_SIGNING_SECRET = os.environ.get("SLACK_SIGNING_SECRET")
 SLACK_API_URL = "https://slack.com/api"
 TARGET_CHANNEL = "C09C4S28412" # #업무생성채널  # 메시지 보낼 채널을 변경
 
 app = Flask(__name__)
 
+# 멤버 디렉터리: users.list 결과를 TTL 캐시 + 백그라운드 갱신으로 유지
+# MEMBER_EVENTS=1: /slack/events로 변경분을 받으므로 전체 조회는 MEMBER_RECONCILE_INTERVAL마다만
+if os.environ.get("MEMBER_EVENTS", "0") == "1":
+    MEMBER_CACHE_TTL = int(os.environ.get("MEMBER_RECONCILE_INTERVAL", "21600"))
+    MEMBER_CACHE_STALE_TTL = MEMBER_CACHE_TTL * 4
+else:
+    MEMBER_CACHE_TTL = int(os.environ.get("MEMBER_CACHE_TTL", "300"))
+    MEMBER_CACHE_STALE_TTL = int(os.environ.get("MEMBER_CACHE_STALE_TTL", "3600"))
+member_directory = MemberDirectory(
+    users_list_page_fetcher(SLACK_API_URL, SLACK_BOT_TOKEN),
+    ttl=MEMBER_CACHE_TTL,
+    stale_ttl=MEMBER_CACHE_STALE_TTL,
+)
+
 def get_all_members():
-    logger.info("Slack 전체 멤버 조회 시작")
-    base_url = f"{SLACK_API_URL}/users.list"
-    headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
-    all_members = []
-    cursor = None
-    while True:
-        params = {"limit": 1000}
-        if cursor:
-            params["cursor"] = cursor
-        try:
-            response = requests.get(base_url, headers=headers, params=params)
-            response.raise_for_status()
-        except Exception as e:
-            logger.error("멤버 조회 실패: %s", str(e))
-            break
-        data = response.json()
-        if not data.get("ok", False):
-            logger.error("Slack API 오류: %s", data.get("error"))
-            break
-        all_members.extend(data.get("members", []))
-        cursor = data.get("response_metadata", {}).get("next_cursor")
-        if not cursor:
-            break
-    logger.info("전체 멤버 수: %d", len(all_members))
-    return all_members
+    """캐시된 멤버 목록(Member 레코드)을 돌려준다. 만료 시 백그라운드에서 갱신된다."""
+    members = member_directory.members()
+    logger.info("전체 멤버 수: %d", len(members))
+    return members
+
+def get_member(user_id):
+    """user id로 멤버를 O(1) 조회한다."""
+    return member_directory.get(user_id)
+
+member_directory.start()
+
+# /hi 전체 발송: 멘션을 여러 메시지로 나눠 채널당 약 1건/초로 보낸다
+HI_MAX_CHARS = int(os.environ.get("HI_MAX_CHARS", "3000"))
+HI_POST_INTERVAL = float(os.environ.get("HI_POST_INTERVAL", "1.1"))
+HI_MAX_MESSAGES = int(os.environ.get("HI_MAX_MESSAGES", "50"))
+http = requests.Session()
+
+def post_text(channel, text):
+    headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}", "Content-type": "application/json"}
+    try:
+        resp = http.post(f"{SLACK_API_URL}/chat.postMessage", headers=headers,
+                         json={"channel": channel, "text": text}, timeout=10)
+    except requests.RequestException as e:
+        return {"ok": False, "error": f"request_failed: {e.__class__.__name__}"}
+    if resp.status_code == 429:
+        return {"ok": False, "error": "ratelimited", "retry_after": resp.headers.get("Retry-After", "1")}
+    try:
+        return resp.json()
+    except ValueError:
+        return {"ok": False, "error": f"invalid_response: HTTP {resp.status_code}"}
+
+hi_delivery = ChunkedDelivery(post_text, interval=HI_POST_INTERVAL, max_messages=HI_MAX_MESSAGES)
 
 def open_create_new_work_modal(trigger_id):
     modal_view = {
@@ -77,17 +103,17 @@ def open_create_new_work_modal(trigger_id):
     payload = {"trigger_id": trigger_id, "view": modal_view}
     headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}", "Content-Type": "application/json; charset=utf-8"}
     response = requests.post(f"{SLACK_API_URL}/views.open", headers=headers, json=payload)
-    logger.info("Modal open response: %s", response.text)
+    logger.info("Modal open response: HTTP %d", response.status_code)
     return response.json()
 
 
 @app.before_request
 def log_request_info():
-    logger.info(f"Received request: {request.method} {request.path} from {request.remote_addr}")
+    logger.info("Received request: %s %s from %s", request.method, request.path, request.remote_addr)
 
 @app.errorhandler(404)
 def page_not_found(e):
-    logger.warning(f"404 Not Found: {request.method} {request.path} from {request.remote_addr}")
+    logger.warning("404 Not Found: %s %s from %s", request.method, request.path, request.remote_addr)
     return "요청한 URL이 존재하지 않습니다.", 404
 
 
@@ -97,42 +123,69 @@ def slash_command_router():
     command_text = data.get("command")
     user_name = data.get("user_name", "Guest")
     trigger_id = data.get("trigger_id")
-    logger.info(f"Slash Command 요청: {data}")
+    logger.info("Slash Command 요청: %s by %s", command_text, data.get("user_id"))
+    Slack_Logging.log_payload(logger, "command", command_text, data)
 
     if command_text == "/hi":
-        members = get_all_members()
-        mentions = [f"<@{m.get('id')}> HI" for m in members if not m.get("deleted") and not m.get("is_bot")]
-        MAX_CHARS = 3000
-        mentions_text = "\n".join(mentions)
-        if len(mentions_text) > MAX_CHARS:
-            mentions_text = mentions_text[:MAX_CHARS] + "\n... (이하 생략)"
-        response_text = f"hi {user_name}! 전체 멤버에게 인사합니다:\n{mentions_text}"
-        logger.info(f"응답 메시지 길이: {len(response_text)}")
+        header = f"hi {user_name}! 전체 멤버에게 인사합니다:"
+        mentions = mention_lines(member_directory.iter_active())
+        if data.get("text", "").strip() in ("all", "전체"):
+            # 전체 발송: 응답은 바로 하고 멘션은 백그라운드에서 나눠 보낸다
+            channel_id = data.get("channel_id")
+            if not channel_id:
+                return jsonify({"response_type": "ephemeral", "text": "channel_id가 없습니다."})
+            if not hi_delivery.start(channel_id, chunk_lines(mentions, HI_MAX_CHARS)):
+                return jsonify({"response_type": "ephemeral", "text": "이 채널에서 이미 전체 인사를 보내는 중입니다."})
+            return jsonify({"response_type": "in_channel", "text": f"{header} (여러 메시지로 나눠 보냅니다)"})
+
+        # 기본: 한 메시지에 들어가는 만큼만 멘션을 만들고 나머지 페이지는 읽지 않는다
+        lines, truncated = take_within_budget(mentions, HI_MAX_CHARS - len(header) - 20)
+        mentions.close()
+        mentions_text = "\n".join(lines)
+        if truncated:
+            mentions_text += "\n... (이하 생략, `/hi all`로 전체 발송)"
+        response_text = f"{header}\n{mentions_text}"
+        logger.info("응답 메시지 길이: %d", len(response_text))
         return jsonify({"response_type": "in_channel", "text": response_text})
 
     elif command_text == "/create_new_work":
-        logger.info(f"/create_new_work")
         if trigger_id:
-            logger.info(f"/create_new_work1")
             modal_resp = open_create_new_work_modal(trigger_id)
-            logger.info(f"/create_new_work2")
             if not modal_resp.get("ok"):
-                logger.error(f"Modal open 실패: {modal_resp.get('error')}")
+                logger.error("Modal open 실패: %s", modal_resp.get("error"))
                 return jsonify({"response_type": "ephemeral", "text": f"모달을 띄우는 데 실패했습니다: {modal_resp.get('error')}"})
             return "", 200
         return jsonify({"response_type": "ephemeral", "text": "trigger_id가 없습니다. Slack 인터랙티브 명령에서만 동작합니다."})
 
     return jsonify({"response_type": "ephemeral", "text": f"알 수 없는 커맨드({command_text})입니다."})
 
+@app.route("/slack/events", methods=["POST"])
+def events():
+    if not SLACK_SIGNING_SECRET:
+        return "", 404  # 서명 검증 없이는 멤버 목록을 바꾸지 못하게 한다
+    body = request.get_data()
+    if not verify_signature(
+        SLACK_SIGNING_SECRET,
+        request.headers.get("X-Slack-Request-Timestamp"),
+        body,
+        request.headers.get("X-Slack-Signature"),
+    ):
+        return "", 401
+    try:
+        envelope = json.loads(body)
+    except ValueError:
+        return "", 400
+    status, result = handle_envelope(member_directory, envelope)
+    if result is None:
+        return "", status
+    return jsonify(result), status
+
 @app.route("/slack/interactions", methods=["POST"])
 def interactions():
-    logger.info(f"interactions")
     payload_str = request.form.get("payload")
-    logger.info(f"interactions1")
     if not payload_str:
         return "", 400
     data = json.loads(payload_str)
-    logger.info(f"interactions2")
     if data.get("type") == "view_submission" and data.get("view", {}).get("callback_id") == "work_create_modal":
         state_values = data["view"]["state"]["values"]
         title = state_values["title"]["title_input"]["value"]
@@ -154,7 +207,7 @@ def interactions():
         headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}", "Content-type": "application/json"}
         payload = {"channel": TARGET_CHANNEL, "text": message}
         resp = requests.post(f"{SLACK_API_URL}/chat.postMessage", headers=headers, json=payload)
-        logger.info(f"chat.postMessage status: {resp.status_code}, response:{resp.text}")
+        logger.info("chat.postMessage status: %d, ok=%s", resp.status_code, resp.ok)
 
         # modal 닫힘 위해 빈 json 응답
         return jsonify({})
@@ -0,0 +1,336 @@
+import logging
+
+import Slack_Json
+
+logger = logging.getLogger(__name__)
+
+
+class Field:
+    """템플릿에서 요청마다 바뀌는 값의 자리 표시자"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.marker = f"\u0000{name}\u0000"
+
+
+class ViewTemplate:
+    """모달 view를 한 번만 JSON으로 직렬화해 두고, 요청마다 trigger_id와 Field 값만 끼워 넣는다."""
+
+    def __init__(self, view: dict, fields=()):
+        body = Slack_Json.dumps(view)
+        self.fields = []
+        self._segments = []
+        # Field 자리(JSON 문자열 "\u0000name\u0000")를 기준으로 직렬화 결과를 조각낸다
+        markers = {Slack_Json.dumps(f.marker): f.name for f in fields}
+        rest = body
+        while True:
+            hits = [(rest.find(m), m) for m in markers if rest.find(m) >= 0]
+            if not hits:
+                break
+            pos, marker = min(hits)
+            self._segments.append(rest[:pos])
+            self.fields.append(markers[marker])
+            rest = rest[pos + len(marker):]
+        self._segments.append(rest)
+
+    def render(self, trigger_id: str, **values) -> bytes:
+        """views.open 요청 본문(JSON bytes)을 만든다."""
+        parts = [b'{"trigger_id":', Slack_Json.dumps(trigger_id), b',"view":', self._segments[0]]
+        for name, segment in zip(self.fields, self._segments[1:]):
+            parts.append(Slack_Json.dumps(values.get(name)))
+            parts.append(segment)
+        parts.append(b"}")
+        return b"".join(parts)
+
+    def render_view(self, **values) -> dict:
+        """trigger_id 없이 view dict만 만든다 (slack_sdk 클라이언트처럼 dict를 받는 호출용)."""
+        parts = [self._segments[0]]
+        for name, segment in zip(self.fields, self._segments[1:]):
+            parts.append(Slack_Json.dumps(values.get(name)))
+            parts.append(segment)
+        return Slack_Json.loads(b"".join(parts))
+
+
+class ViewRegistry:
+    def __init__(self):
+        self._templates = {}
+
+    def register(self, callback_id: str, view: dict, fields=()) -> ViewTemplate:
+        template = self._templates[callback_id] = ViewTemplate(view, fields)
+        logger.info("모달 템플릿 등록: %s (%s)", callback_id, Slack_Json.BACKEND)
+        return template
+
+    def render(self, callback_id: str, trigger_id: str, **values) -> bytes:
+        return self._templates[callback_id].render(trigger_id, **values)
+
+    def view(self, callback_id: str, **values) -> dict:
+        return self._templates[callback_id].render_view(**values)
+
+    def __contains__(self, callback_id):
+        return callback_id in self._templates
+
+
+def build_view_registry() -> ViewRegistry:
+    """서버에서 여는 모달들을 등록한 레지스트리를 만든다 (import 시 한 번)."""
+    initial_user = Field("initial_user")
+    registry = ViewRegistry()
+    registry.register(
+        "work_create_modal",
+        work_create_view(initial_user=initial_user.marker),
+        fields=[initial_user],
+    )
+    registry.register("work_bulk_create_modal", work_bulk_create_view())
+    registry.register("jira_issue_create_modal", jira_issue_create_view())
+    registry.register("meeting_review_modal", meeting_request_view())
+    return registry
+
+
+# ---- 모달 정의 ----
+
+
+def notice_view(title: str, text: str) -> dict:
+    """제출 후 모달을 닫지 않고 안내 문구로 바꿀 때 쓰는 view (response_action: update)"""
+    return {
+        "type": "modal",
+        "title": {"type": "plain_text", "text": title},
+        "close": {"type": "plain_text", "text": "닫기"},
+        "blocks": [{"type": "section", "text": {"type": "mrkdwn", "text": text}}],
+    }
+
+
+def work_create_view(initial_user=None) -> dict:
+    return {
+        "type": "modal",
+        "callback_id": "work_create_modal",
+        "title": {"type": "plain_text", "text": "새 업무 요청"},
+        "submit": {"type": "plain_text", "text": "등록"},
+        "close": {"type": "plain_text", "text": "취소"},
+        "blocks": [
+            {
+                "type": "input",
+                "block_id": "work_type",
+                "label": {"type": "plain_text", "text": "담당 부서"},
+                "element": {
+                    # 옵션은 /slack/options 엔드포인트가 검색어에 맞춰 돌려준다
+                    "type": "external_select",
+                    "action_id": "work_type_select",
+                    "placeholder": {"type": "plain_text", "text": "선택 또는 검색"},
+                    "min_query_length": 0,
+                },
+            },
+            {
+                "type": "input",
+                "block_id": "title",
+                "element": {"type": "plain_text_input", "action_id": "title_input"},
+                "label": {"type": "plain_text", "text": "제목"},
+            },
+            {
+                "type": "input",
+                "block_id": "content",
+                "element": {
+                    "type": "plain_text_input",
+                    "multiline": True,
+                    "action_id": "content_input",
+                },
+                "label": {"type": "plain_text", "text": "내용"},
+            },
+
+            {
+                "type": "input",
+                "block_id": "start_date",
+                "optional": True,
+                "element": {
+                    "type": "datepicker",
+                    "action_id": "start_date_input",
+                    "placeholder": {
+                        "type": "plain_text",
+                        "text": "시작일 선택"
+                    }
+                },
+                "label": {
+                    "type": "plain_text",
+                    "text": "시작일"
+                }
+            },
+            {
+                "type": "input",
+                "block_id": "end_date",
+                "optional": True,
+                "element": {
+                    "type": "datepicker",
+                    "action_id": "end_date_input",
+                    "placeholder": {
+                        "type": "plain_text",
+                        "text": "종료일 선택"
+                    }
+                },
+                "label": {
+                    "type": "plain_text",
+                    "text": "종료일"
+                }
+            },
+            {
+                "type": "input",
+                "block_id": "plan_url",
+                "element": {"type": "plain_text_input", "action_id": "plan_url_input"},
+                "label": {"type": "plain_text", "text": "기획서 (URL)"},
+                "optional": True,
+            },
+            {
+                "type": "input",
+                "block_id": "assignee",
+                "element": {
+                    "type": "users_select",
+                    "action_id": "assignee_input",
+                    "placeholder": {"type": "plain_text", "text": "담당자를 선택하세요"},
+                    "initial_user": initial_user,  # 작성자를 기본 선택
+                },
+                "label": {"type": "plain_text", "text": "담당자 (실명)"},
+            },
+        ],
+    }
+
+
+def work_bulk_create_view() -> dict:
+    return {
+        "type": "modal",
+        "callback_id": "work_bulk_create_modal",
+        "title": {"type": "plain_text", "text": "업무 일괄 요청"},
+        "submit": {"type": "plain_text", "text": "등록"},
+        "close": {"type": "plain_text", "text": "취소"},
+        "blocks": [
+            {
+                "type": "context",
+                "elements": [{
+                    "type": "mrkdwn",
+                    "text": "한 줄에 한 건씩 스프레드시트에서 붙여넣거나(TSV) 쉼표로 구분해 입력하세요.\n"
+                            "`업무유형, 제목, 시작일(YYYY-MM-DD), 종료일, 담당자(@이름), 내용, 기획서 URL`",
+                }],
+            },
+            {
+                "type": "input",
+                "block_id": "rows",
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "rows_input",
+                    "multiline": True,
+                    "max_length": 3000,
+                    "placeholder": {"type": "plain_text", "text": "클라\t로그인 개선\t2025-01-06\t2025-01-10\t@hong"},
+                },
+                "label": {"type": "plain_text", "text": "업무 목록"},
+            },
+        ],
+    }
+
+
+def jira_issue_create_view() -> dict:
+    return {
+        "type": "modal",
+        "callback_id": "jira_issue_create_modal",
+        "title": {"type": "plain_text", "text": "Jira 이슈 생성"},
+        "submit": {"type": "plain_text", "text": "생성"},
+        "close": {"type": "plain_text", "text": "취소"},
+        "blocks": [
+            {
+                "type": "input",
+                "block_id": "summary",
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "summary_input",
+                    "placeholder": {"type": "plain_text", "text": "이슈 제목 입력"}
+                },
+                "label": {"type": "plain_text", "text": "제목"},
+                "optional": False
+            },
+            {
+                "type": "input",
+                "block_id": "description",
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "description_input",
+                    "multiline": True,
+                    "placeholder": {"type": "plain_text", "text": "이슈 상세 설명"}
+                },
+                "label": {"type": "plain_text", "text": "설명"},
+                "optional": True
+            },
+            {
+                "type": "input",
+                "block_id": "project",
+                "element": {
+                    "type": "external_select",
+                    "action_id": "project_select",
+                    "placeholder": {"type": "plain_text", "text": "프로젝트 검색 (키 또는 이름)"},
+                    "min_query_length": 0
+                },
+                "label": {"type": "plain_text", "text": "프로젝트"},
+                "optional": False
+            },
+            {
+                "type": "input",
+                "block_id": "issuetype",
+                "element": {
+                    "type": "external_select",
+                    "action_id": "issuetype_select",
+                    "placeholder": {"type": "plain_text", "text": "이슈 타입 검색 (예: Task)"},
+                    "min_query_length": 0
+                },
+                "label": {"type": "plain_text", "text": "이슈 타입"},
+                "optional": False
+            }
+        ]
+    }
+
+
+def meeting_request_view() -> dict:
+    return {
+        "type": "modal",
+        "callback_id": "meeting_review_modal",
+        "title": {"type": "plain_text", "text": "모임요청"},
+        "submit": {"type": "plain_text", "text": "보내기"},
+        "close": {"type": "plain_text", "text": "취소"},
+        "blocks": [
+            {
+                "type": "input",
+                "block_id": "title",
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "title_input",
+                },
+                "label": {"type": "plain_text", "text": "제목"},
+                "optional": False,
+            },
+            {
+                "type": "input",
+                "block_id": "assignee",
+                "element": {
+                    "type": "multi_users_select",
+                    "action_id": "assignee_input",
+                    "placeholder": {"type": "plain_text", "text": "담당자를 선택하세요"},
+                },
+                "label": {"type": "plain_text", "text": "담당자"},
+                "optional": False,
+            },
+            {
+                "type": "input",
+                "block_id": "document",
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "document_input",
+                },
+                "label": {"type": "plain_text", "text": "기획서 링크"},
+                "optional": True,
+            },
+            {
+                "type": "input",
+                "block_id": "content",
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "content_input",
+                    "multiline": True,
+                },
+                "label": {"type": "plain_text", "text": "내용"},
+                "optional": True,
+            },
+        ],
+    }
@@ -1,371 +1,370 @@
 import os
 import logging
-import json
-import requests
-from flask import Flask, request, jsonify
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from zoneinfo import ZoneInfo
+from flask import Flask, Response, g, request, jsonify
+
+import Slack_Json
+import Slack_Logging
+import Slack_Metrics
+from Slack_Admission import AdmissionController, busy_response, parse_limits
+from Slack_Api import SlackApiClient
+from Slack_Bulk import BulkRow, format_errors, group_by_channel, summary_text, validate_rows
+from Slack_Cache import MISSING, TTLCache
+from Slack_Capture import TrafficRecorder
+from Slack_Config import (
+    DEFAULT_CC_USER_IDS, JIRA_API_TOKEN, JIRA_URL, JIRA_USER_EMAIL, SLACK_API_URL, SLACK_BOT_TOKEN,
+    SLACK_SIGNING_SECRET, WORK_TYPE_OPTIONS, data_path,
+)
+from Slack_Events import EVENT_TYPES, handle_envelope, parse_payload, verify_signature
+from Slack_Idempotency import DONE, NEW, CachedResponse, IdempotencyCache, command_key, interaction_key, should_store
+from Slack_Jira import CreateMetaIndex, JiraClient
+from Slack_Ledger import COMMANDS as LEDGER_COMMANDS, MEETING, TaskLedger, ledger_command
+from Slack_Members import MemberDirectory
+from Slack_Messages import (
+    build_fanout_report, build_jira_issue_message, build_meeting_dm, build_meeting_message, build_reminder_messages,
+    build_submission_failure_message, build_work_message, meeting_recipients, message_link,
+)
+from Slack_Options import ACTION_INDEXES, OptionsProvider, block_suggestion_options, jira_source, work_type_source
+from Slack_Outbox import Outbox
+from Slack_Reminders import ReminderScheduler, parse_days, period_dates
+from Slack_Resilience import OPEN, TRANSIENT_ERROR_PREFIXES, BreakerRegistry, CircuitBreaker, breaker_settings
+from Slack_Scheduler import MessageScheduler
+from Slack_SharedCache import SharedCache
+from Slack_Submissions import PARSERS, JiraIssueRequest, MeetingRequest, WorkBulkRequest, WorkRequest, parse_submission
+from Slack_Views import build_view_registry, notice_view
+from Slack_Worker import WorkerPool
 
 app = Flask(__name__)
 
-logging.basicConfig(level=logging.INFO)
+Slack_Logging.setup_logging()
 logger = logging.getLogger(__name__)
 
-SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
-SLACK_API_URL = "https://slack.com/api"
-conversations_client = WebClient(token=SLACK_BOT_TOKEN)
-
-
-JIRA_URL = os.environ.get("JIRA_URL")
-JIRA_API_TOKEN = os.environ.get("JIRA_API_TOKEN")
-
-
-# 업무 유형 → 슬랙 채널 ID 매핑 (예시, 실제 채널 ID로 변경 필요)
-CHANNEL_MAP = {
-    "client_task": "C09QEGZ4W92",
-    "planning_task": "C09PVGS3U31",
-    "qa_task": "C09Q4JY193M",
-    "character_task": "C09Q7H0QB0D",
-    "background_task": "C09Q4J03Y1Z",
-    "concept_task": "C09Q4JJ1AM9",
-    "animation_task": "C09QB1AJBCJ",
-    "effect_task": "C09QPTJ3KMX",
-#   "art_task": "C09C4S28412", # 주석처리
-    "server_task": "C09QB1H753L",
-    "ta_task": "C09Q7H3QA1K",
-    "test_task": "C09PWF7SGKH",
-    "ui_task": "C09QPTE5BSM"
-}
+# 업스트림 회로 차단기: 최근 실패율이 높으면 잠시 호출하지 않고 바로 실패시킨다 (Slack은 메서드별, Jira는 하나)
+BREAKER_SETTINGS = breaker_settings(os.environ)
+slack_breakers = BreakerRegistry(**BREAKER_SETTINGS)
+
+# 모든 Slack Web API 호출이 공유하는 클라이언트 (커넥션 풀 + rate limit + 재시도 + 시간 예산 + 회로 차단기)
+slack_api = SlackApiClient(
+    SLACK_BOT_TOKEN,
+    SLACK_API_URL,
+    rate_limit_scale=float(os.environ.get("SLACK_RATE_LIMIT_SCALE", "1")),
+    on_call=Slack_Metrics.observe_slack_call,
+    breakers=slack_breakers,
+)
+
+# 워커 간 공유 캐시 (SQLite, 같은 노드의 gunicorn 워커들이 한 파일을 쓴다). 경로가 없으면 워커별 메모리 캐시
+SHARED_CACHE_PATH = data_path("SHARED_CACHE_PATH", "shared_cache.db")
+
+# user id → DM 채널 id 캐시 (CC 정규화 / DM 발송 공용). 실패는 짧게 negative 캐시
+DM_CACHE_TTL = int(os.environ.get("DM_CACHE_TTL", "86400"))
+DM_CACHE_NEGATIVE_TTL = int(os.environ.get("DM_CACHE_NEGATIVE_TTL", "300"))
+if SHARED_CACHE_PATH:
+    dm_channel_cache = SharedCache(SHARED_CACHE_PATH, "dm", ttl=DM_CACHE_TTL, negative_ttl=DM_CACHE_NEGATIVE_TTL)
+else:
+    dm_channel_cache = TTLCache(ttl=DM_CACHE_TTL, negative_ttl=DM_CACHE_NEGATIVE_TTL)
+dm_resolve_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("DM_RESOLVE_CONCURRENCY", "4")),
+    thread_name_prefix="dm-resolve",
+)
+
+# chat.postMessage 발송 스케줄러: 채널별 토큰 버킷(기본 1건/초) + 채널 간 라운드로빈 + 대기 메시지 합치기
+message_scheduler = MessageScheduler(
+    lambda payload: slack_api.call("chat.postMessage", payload),
+    rate=float(os.environ.get("CHANNEL_POST_RATE", "1.0")),
+    burst=float(os.environ.get("CHANNEL_POST_BURST", "1")),
+    coalesce=os.environ.get("CHANNEL_POST_COALESCE", "1") == "1",
+    senders=int(os.environ.get("CHANNEL_POST_SENDERS", "8")),  # 서로 다른 채널(DM 포함)에 동시에 보낼 수 있는 수
+)
+POST_TIMEOUT = float(os.environ.get("POST_TIMEOUT", "30"))
+# 모임요청을 채널에 올린 뒤 담당자 + 참조 인원에게 DM으로도 보낼지
+MEETING_DM_FANOUT = os.environ.get("MEETING_DM_FANOUT", "0") == "1"
+
+# ack 모드: view_submission을 검증 후 바로 닫고(response_action: clear) Slack 호출은 워커 풀에서 처리
+INTERACTION_ACK_MODE = os.environ.get("INTERACTION_ACK_MODE", "1") == "1"
+submission_pool = WorkerPool(
+    "submission",
+    workers=int(os.environ.get("SUBMISSION_WORKERS", "4")),
+    max_queue=int(os.environ.get("SUBMISSION_QUEUE_SIZE", "100")),
+)
+
+# 멤버 디렉터리: users.list 결과를 TTL 캐시 + 백그라운드 갱신으로 유지
+# MEMBER_EVENTS=1: /slack/events로 변경분을 받으므로 전체 조회는 MEMBER_RECONCILE_INTERVAL마다 정합성 확인용으로만
+# (/slack/events는 SLACK_SIGNING_SECRET이 있어야 열린다)
+MEMBER_EVENTS = os.environ.get("MEMBER_EVENTS", "0") == "1"
+if MEMBER_EVENTS:
+    MEMBER_CACHE_TTL = int(os.environ.get("MEMBER_RECONCILE_INTERVAL", "21600"))
+    MEMBER_CACHE_STALE_TTL = MEMBER_CACHE_TTL * 4
+else:
+    MEMBER_CACHE_TTL = int(os.environ.get("MEMBER_CACHE_TTL", "300"))
+    MEMBER_CACHE_STALE_TTL = int(os.environ.get("MEMBER_CACHE_STALE_TTL", "3600"))
+def fetch_members_page(cursor=None):
+    params = {"limit": 1000}
+    if cursor:
+        params["cursor"] = cursor
+    data = slack_api.call("users.list", params=params, http_method="GET")
+    if not data.get("ok", False):
+        raise RuntimeError(f"Slack API 오류: {data.get('error')}")
+    return data.get("members", []), data.get("response_metadata", {}).get("next_cursor")
+
+member_directory = MemberDirectory(
+    fetch_members_page,
+    ttl=MEMBER_CACHE_TTL,
+    stale_ttl=MEMBER_CACHE_STALE_TTL,
+    # 전체 목록은 압축해서 공유하고, 조회는 lease를 잡은 워커 하나만 한다 (나머지는 결과를 기다림)
+    shared_cache=SharedCache(SHARED_CACHE_PATH, "members", ttl=MEMBER_CACHE_TTL, wait=60, lease=120,
+                             local_ttl=0) if SHARED_CACHE_PATH else None,
+)
 
-# 기본 채널을 client_task 채널로 지정
-TARGET_CHANNEL = CHANNEL_MAP["client_task"]
-
-
-WORK_TYPE_OPTIONS = {
-    "client_task": "클라",
-    "planning_task": "기획",
-    "qa_task": "품질",
-    "character_task": "캐릭터",
-    "background_task": "배경",
-    "concept_task": "컨셉",
-    "animation_task": "애니",
-    "effect_task": "VFX",
-#   "art_task": "아트", # 주석처리
-    "server_task": "서버",
-    "ta_task": "TA",
-    "test_task": "테스트",
-    "ui_task": "UI"
-}
+def get_all_members():
+    """캐시된 멤버 목록(Member 레코드)을 돌려준다. 만료 시 백그라운드에서 갱신된다."""
+    members = member_directory.members()
+    logger.info("전체 멤버 수: %d", len(members))
+    return members
 
-PREFIX_MAP = {k: f"{v}-" for k, v in WORK_TYPE_OPTIONS.items()}
+def get_member(user_id):
+    """user id로 멤버를 O(1) 조회한다."""
+    return member_directory.get(user_id)
 
-# 기획리뷰 채널
-MEETING_REQUEST_CHANNEL = "C09QF1TKQQ4"
+def member_names() -> dict:
+    """Slack 표시 이름(소문자) → user id (일괄 등록의 담당자 열 해석용)"""
+    return {m.name.lower(): m.id for m in member_directory.active_members() if m.name}
 
-DEFAULT_CC_USER_IDS = ["U09Q5HLF3R6","U09Q13V4E75","U09Q7GTU0BU"]# 예: 홍석기,노승한,김주현 PM님들
+# 기동 시 멤버 캐시를 미리 채움 (첫 요청이 users.list 페이지네이션을 기다리지 않도록)
+if SLACK_BOT_TOKEN:
+    member_directory.start()
 
-def get_all_members():
-    logger.info("Slack 전체 멤버 조회 시작")
-    base_url = f"{SLACK_API_URL}/users.list"
-    headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
-    all_members = []
-    cursor = None
-    while True:
-        params = {"limit": 1000}
-        if cursor:
-            params["cursor"] = cursor
-        try:
-            response = requests.get(base_url, headers=headers, params=params)
-            response.raise_for_status()
-        except Exception as e:
-            logger.error("멤버 조회 실패: %s", str(e))
-            break
-        data = response.json()
-        if not data.get("ok", False):
-            logger.error("Slack API 오류: %s", data.get("error"))
-            break
-        all_members.extend(data.get("members", []))
-        cursor = data.get("response_metadata", {}).get("next_cursor")
-        if not cursor:
-            break
-    logger.info("전체 멤버 수: %d", len(all_members))
-    return all_members
+# 모달 view는 import 시 한 번만 만들고 직렬화한다 (요청마다 trigger_id / initial_user만 교체)
+view_templates = build_view_registry()
 
 def open_create_new_work_modal(trigger_id, user_id):
-    modal_view = {
-        "type": "modal",
-        "callback_id": "work_create_modal",
-        "title": {"type": "plain_text", "text": "새 업무 요청"},
-        "submit": {"type": "plain_text", "text": "등록"},
-        "close": {"type": "plain_text", "text": "취소"},
-        "blocks": [
-            {
-                "type": "input",
-                "block_id": "work_type",
-                "label": {"type": "plain_text", "text": "담당 부서"},
-                "element": {
-                    "type": "static_select",
-                    "action_id": "work_type_select",
-                    "placeholder": {"type": "plain_text", "text": "선택"},
-                    "options": [
-                        {
-                            "text": {"type": "plain_text", "text": v},
-                            "value": k,
-                        } for k, v in WORK_TYPE_OPTIONS.items()
-                    ],
-                },
-            },
-            {
-                "type": "input",
-                "block_id": "title",
-                "element": {"type": "plain_text_input", "action_id": "title_input"},
-                "label": {"type": "plain_text", "text": "제목"},
-            },
-            {
-                "type": "input",
-                "block_id": "content",
-                "element": {
-                    "type": "plain_text_input",
-                    "multiline": True,
-                    "action_id": "content_input",
-                },
-                "label": {"type": "plain_text", "text": "내용"},
-            },
+    body = view_templates.render("work_create_modal", trigger_id, initial_user=user_id)  # 작성자를 기본 선택
+    response = slack_api.call("views.open", body=body)
+    logger.info("모달 열기 응답: ok=%s error=%s", response.get("ok"), response.get("error"))
+    return response
 
-            {
-                "type": "input",
-                "block_id": "start_date",
-                "optional": True,
-                "element": {
-                    "type": "datepicker",
-                    "action_id": "start_date_input",
-                    "placeholder": {
-                        "type": "plain_text",
-                        "text": "시작일 선택"
-                    }
-                },
-                "label": {
-                    "type": "plain_text",
-                    "text": "시작일"
-                }
-            },
-            {
-                "type": "input",
-                "block_id": "end_date",
-                "optional": True,
-                "element": {
-                    "type": "datepicker",
-                    "action_id": "end_date_input",
-                    "placeholder": {
-                        "type": "plain_text",
-                        "text": "종료일 선택"
-                    }
-                },
-                "label": {
-                    "type": "plain_text",
-                    "text": "종료일"
-                }
-            },
-            {
-                "type": "input",
-                "block_id": "plan_url",
-                "element": {"type": "plain_text_input", "action_id": "plan_url_input"},
-                "label": {"type": "plain_text", "text": "기획서 (URL)"},
-                "optional": True,
-            },
-            {
-                "type": "input",
-                "block_id": "assignee",
-                "element": {
-                    "type": "users_select",
-                    "action_id": "assignee_input",
-                    "placeholder": {"type": "plain_text", "text": "담당자를 선택하세요"},
-                    "initial_user": user_id,  # 작성자를 기본 선택
-                },
-                "label": {"type": "plain_text", "text": "담당자 (실명)"},
-            },
-        ],
-    }
-
-    headers = {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        "Content-Type": "application/json; charset=utf-8",
-    }
-    payload = {"trigger_id": trigger_id, "view": modal_view}
-    response = requests.post(f"{SLACK_API_URL}/views.open", headers=headers, json=payload)
-    logger.info(f"모달 열기 응답: {response.text}")
-    return response.json()
+def open_work_bulk_create_modal(trigger_id):
+    body = view_templates.render("work_bulk_create_modal", trigger_id)
+    response = slack_api.call("views.open", body=body)
+    logger.info("일괄 요청 모달 열기 응답: ok=%s error=%s", response.get("ok"), response.get("error"))
+    return response
 
 def open_create_jira_issue_create_modal(trigger_id):
-    modal_view = {
-        "type": "modal",
-        "callback_id": "jira_issue_create_modal",
-        "title": {"type": "plain_text", "text": "Jira 이슈 생성"},
-        "submit": {"type": "plain_text", "text": "생성"},
-        "close": {"type": "plain_text", "text": "취소"},
-        "blocks": [
-            {
-                "type": "input",
-                "block_id": "summary",
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "summary_input",
-                    "placeholder": {"type": "plain_text", "text": "이슈 제목 입력"}
-                },
-                "label": {"type": "plain_text", "text": "제목"},
-                "optional": False
-            },
-            {
-                "type": "input",
-                "block_id": "description",
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "description_input",
-                    "multiline": True,
-                    "placeholder": {"type": "plain_text", "text": "이슈 상세 설명"}
-                },
-                "label": {"type": "plain_text", "text": "설명"},
-                "optional": True
-            },
-            {
-                "type": "input",
-                "block_id": "project",
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "project_input",
-                    "placeholder": {"type": "plain_text", "text": "프로젝트 키 입력 (예: PROJ)"}
-                },
-                "label": {"type": "plain_text", "text": "프로젝트 키"},
-                "optional": False
-            },
-            {
-                "type": "input",
-                "block_id": "issuetype",
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "issuetype_input",
-                    "placeholder": {"type": "plain_text", "text": "이슈 타입 입력 (예: Task)"}
-                },
-                "label": {"type": "plain_text", "text": "이슈 타입"},
-                "optional": False
-            }
-        ]
-    }
-
-    headers = {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        "Content-Type": "application/json; charset=utf-8"
-    }
-    payload = {
-        "trigger_id": trigger_id,
-        "view": modal_view
-    }
-    response = requests.post(f"{SLACK_API_URL}/views.open", headers=headers, json=payload)
-    logger.info(f"Jira 이슈 생성 모달 열기 응답: {response.text}")
-    return response.json()
+    body = view_templates.render("jira_issue_create_modal", trigger_id)
+    response = slack_api.call("views.open", body=body)
+    logger.info("Jira 이슈 생성 모달 열기 응답: ok=%s error=%s", response.get("ok"), response.get("error"))
+    return response
 
 def open_meeting_request_modal(trigger_id):
-    modal_view = {
-        "type": "modal",
-        "callback_id": "meeting_review_modal",
-        "title": {"type": "plain_text", "text": "모임요청"},
-        "submit": {"type": "plain_text", "text": "보내기"},
-        "close": {"type": "plain_text", "text": "취소"},
-        "blocks": [
-            {
-                "type": "input",
-                "block_id": "title",
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "title_input",
-                },
-                "label": {"type": "plain_text", "text": "제목"},
-                "optional": False,
-            },
-            {
-                "type": "input",
-                "block_id": "assignee",
-                "element": {
-                    "type": "multi_users_select",
-                    "action_id": "assignee_input",
-                    "placeholder": {"type": "plain_text", "text": "담당자를 선택하세요"},
-                },
-                "label": {"type": "plain_text", "text": "담당자"},
-                "optional": False,
-            },
-            {
-                "type": "input",
-                "block_id": "document",
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "document_input",
-                },
-                "label": {"type": "plain_text", "text": "기획서 링크"},
-                "optional": True,
-            },
-            {
-                "type": "input",
-                "block_id": "content",
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "content_input",
-                    "multiline": True,
-                },
-                "label": {"type": "plain_text", "text": "내용"},
-                "optional": True,
-            },
-        ],
-    }
-
-    headers = {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        "Content-Type": "application/json; charset=utf-8"
-    }
-    payload = {"trigger_id": trigger_id, "view": modal_view}
-    response = requests.post(f"{SLACK_API_URL}/views.open", headers=headers, json=payload)
-    logger.info(f"모임요청 모달 열기 응답: {response.text}")
-    return response.json()
+    body = view_templates.render("meeting_review_modal", trigger_id)
+    response = slack_api.call("views.open", body=body)
+    logger.info("모임요청 모달 열기 응답: ok=%s error=%s", response.get("ok"), response.get("error"))
+    return response
+
+UNAVAILABLE_TEXT = "Slack 응답이 지연되고 있어 지금은 처리할 수 없습니다. 잠시 후 다시 시도해 주세요."
+
+def modal_failure_response(modal_resp):
+    """모달 열기 실패 시 요청자에게만 보이는 안내 (업스트림 장애 / 시간 초과면 오류 코드 대신 안내 문구)"""
+    error = str(modal_resp.get("error"))
+    if error.startswith(TRANSIENT_ERROR_PREFIXES):
+        text = UNAVAILABLE_TEXT
+        g.idempotency_store = False  # Slack 재시도가 다시 모달을 열어 볼 수 있도록
+    else:
+        text = f"모달을 띄우는 데 실패했습니다: {error}"
+    return jsonify({"response_type": "ephemeral", "text": text})
 
 # 필요 권한: conversations:read
-def dm_channel_to_user_id(conversations_client, channel_id):
+def dm_channel_to_user_id(channel_id):
     # conversations.info로 IM 채널 정보 조회하면 'user' 필드에 상대방 user id가 있습니다.
-    resp = conversations_client.conversations_info(channel=channel_id)
+    resp = slack_api.call("conversations.info", params={"channel": channel_id}, http_method="GET")
     if not resp.get("ok"):
         raise RuntimeError(f"conversations.info 실패: {resp.get('error')}")
     channel = resp.get("channel", {})
     # IM(D...) 채널이면 'user' 키에 상대 사용자(U...)가 들어있음
     return channel.get("user")
 
-# 예: DEFAULT_CC_IDS 안에 D... 가 섞여 있을 때 정규화
-def normalize_cc_user_ids(conversations_client: WebClient, user_ids: list[str]) -> list[str]:
-    """유저 ID 목록을 받아 DM 채널을 열어 멘션 가능한 ID 리스트를 리턴한다"""
-    normalized_ids = []
+# 일시적인 오류(네트워크, 5xx, rate limit, 회로 차단)는 negative 캐시하지 않는다 (TRANSIENT_ERROR_PREFIXES)
+def _fetch_dm_channel(user_id: str):
+    """conversations.open 결과: 채널 id / None(영구 실패, negative 캐시) / MISSING(일시적 실패, 캐시 안 함)"""
+    resp = slack_api.call("conversations.open", {"users": user_id})
+    if resp.get("ok"):
+        return resp["channel"]["id"]
+    error = str(resp.get("error"))
+    logger.warning("DM open 실패 %s: %s", user_id, error)
+    if error.startswith(TRANSIENT_ERROR_PREFIXES):
+        return MISSING
+    return None
+
+def _open_dm_channel(user_id: str):
+    # 같은 user id는 한 스레드(공유 캐시면 한 워커)만 conversations.open 한다
+    return dm_channel_cache.get_or_fetch(user_id, lambda: _fetch_dm_channel(user_id))
 
+def resolve_dm_channels(user_ids: list[str]) -> dict:
+    """user id → DM 채널 id. 캐시에 없는 것만 동시에(최대 DM_RESOLVE_CONCURRENCY) conversations.open 한다.
+    실패한 user id는 None으로 매핑되며 잠시(negative TTL) 캐시된다."""
+    resolved = {}
+    misses = []
     for user_id in user_ids:
-        try:
-            # DM 채널 열기 (기존 conversations.info → conversations.open 으로 변경)
-            resp = conversations_client.conversations_open(users=[user_id])
-            if resp["ok"]:
-                normalized_ids.append(user_id)  # <@user_id> 형태로 Slack에서 렌더링됨
-            else:
-                logger.warning(f"DM open 실패 {user_id}: {resp}")
-        except SlackApiError as e:
-            logger.warning(
-                f"DM open 실패 {user_id}: {e.response['error'] if e.response else e}"
-            )
+        channel_id = dm_channel_cache.get(user_id)
+        if channel_id is MISSING:
+            misses.append(user_id)
+        else:
+            resolved[user_id] = channel_id
+    if len(misses) == 1:
+        resolved[misses[0]] = _open_dm_channel(misses[0])
+    elif misses:
+        resolved.update(zip(misses, dm_resolve_pool.map(_open_dm_channel, misses)))
+    return resolved
 
-    return normalized_ids
+# 예: DEFAULT_CC_IDS 안에 D... 가 섞여 있을 때 정규화
+def normalize_cc_user_ids(user_ids: list[str]) -> list[str]:
+    """유저 ID 목록을 받아 DM 채널을 열어 멘션 가능한 ID 리스트를 리턴한다 (결과는 캐시됨)"""
+    resolved = resolve_dm_channels(user_ids)
+    # <@user_id> 형태로 Slack에서 렌더링됨
+    return [user_id for user_id in user_ids if resolved.get(user_id)]
 
 def get_dm_channel_id(user_id: str):
-    try:
-        response = client.conversations_open(users=[user_id])
-        if response["ok"]:
-            return response["channel"]["id"]
-    except SlackApiError as e:
-        logger.warning(f"DM open 실패 {user_id}: {e.response['error']}")
-    return None
+    return resolve_dm_channels([user_id]).get(user_id)
+
+# 기동 시 CC 대상 DM 채널을 미리 열어 둠 → 제출 처리 중에는 CC 확인용 Slack 호출이 없음
+if SLACK_BOT_TOKEN:
+    threading.Thread(target=normalize_cc_user_ids, args=(DEFAULT_CC_USER_IDS,), name="cc-warmup", daemon=True).start()
     
 
+# 커맨드 / callback_id별 요청 수와 처리 시간을 /metrics 로 노출
+METERED_ROUTES = {
+    "/slack/command": "command", "/slack/interactions": "interaction", "/slack/options": "options",
+    "/slack/events": "events",
+}
+# name 라벨은 요청 본문에서 오므로 아래 목록에 없는 값은 "other"로 기록한다
+Slack_Metrics.known_names("command", ("/create_new_work", "/jira_issue_create", "/모임요청", "/heartbeat", *LEDGER_COMMANDS))
+Slack_Metrics.known_names("interaction", PARSERS)
+Slack_Metrics.known_names("options", ACTION_INDEXES)
+Slack_Metrics.known_names("events", EVENT_TYPES)
+
+# 부하 제어: route 종류별 동시 처리 한도를 넘으면 기다리지 않고 "busy" 응답을 바로 돌려준다
+# heartbeat / healthz는 한도 없이 여기서 바로 응답한다 (다른 훅, 로그, 멱등성 처리를 거치지 않음)
+# 한도 합계는 워커 스레드 수(gunicorn --threads)보다 작게 두어 우선 처리용 스레드를 남긴다
+admission = AdmissionController(parse_limits(os.environ.get("ADMISSION_LIMITS", "")))
+rejected_requests = Slack_Metrics.registry.counter(
+    "slack_app_rejected_requests_total", "동시 처리 한도 초과로 거절한 요청 수", ("route",))
+Slack_Metrics.registry.gauge(
+    "slack_app_in_flight_requests", "route 종류별 처리 중인 요청 수",
+    lambda: {(route,): n for route, n in admission.in_flight().items()},
+    labels=("route",),
+)
+
+def is_priority_request() -> bool:
+    return request.path == "/slack/command" and request.form.get("command") == "/heartbeat"
+
+@app.before_request
+def admit_request():
+    # 가장 먼저 등록된 before_request 훅이어야 한다 (여기서 응답하면 뒤의 훅은 실행되지 않는다)
+    if request.path == "/healthz":
+        return healthz()
+    g.request_started = time.perf_counter()
+    route = METERED_ROUTES.get(request.path)
+    if route is None or request.method != "POST":
+        return None
+    if is_priority_request():
+        g.metric_name = "/heartbeat"
+        return jsonify({"status": "alive"}), 200
+    if not admission.try_acquire(route):
+        rejected_requests.inc(route)
+        g.metric_name = "busy"
+        status, result = busy_response(route, interaction_payload() if route == "interaction" else None)
+        logger.warning("동시 처리 한도 초과로 거절: %s", route)
+        return (jsonify(result) if result is not None else ""), status
+    g.admitted_route = route
+    return None
+
+@app.teardown_request
+def release_admission(exc):
+    route = g.pop("admitted_route", None)
+    if route is not None:
+        admission.release(route)
+
+@app.after_request
+def record_request_metrics(response):
+    route = METERED_ROUTES.get(request.path)
+    if route and "request_started" in g:
+        Slack_Metrics.observe_request(
+            route, g.get("metric_name"), response.status_code, time.perf_counter() - g.request_started
+        )
+    return response
+
+# 멱등성: Slack 재시도(X-Slack-Retry-Num) / 중복 제출은 처음 응답을 그대로 돌려주고 다시 처리하지 않는다
+# IDEMPOTENCY_DB를 지정하면 gunicorn 워커들이 SQLite로 키를 공유한다
+idempotency = IdempotencyCache(
+    ttl=int(os.environ.get("IDEMPOTENCY_TTL", "600")),
+    max_size=int(os.environ.get("IDEMPOTENCY_MAX_KEYS", "10000")),
+    path=os.environ.get("IDEMPOTENCY_DB") or None,
+)
+duplicate_requests = Slack_Metrics.registry.counter(
+    "slack_app_duplicate_requests_total", "재시도 / 중복으로 걸러낸 요청 수", ("route", "state"))
+
+def interaction_payload():
+    """interactions 요청의 payload(JSON)를 한 번만 파싱해 재사용한다. 깨진 payload는 None (→ 400)"""
+    if "interaction_payload" not in g:
+        g.interaction_payload = parse_payload(request.form.get("payload"))
+    return g.interaction_payload
+
+@app.before_request
+def check_idempotency():
+    route = METERED_ROUTES.get(request.path)
+    if route not in ("command", "interaction") or request.method != "POST":
+        return None
+    if route == "command":
+        key = command_key(request.form)
+    else:
+        data = interaction_payload()
+        key = interaction_key(data) if data else None
+    if key is None:
+        if request.headers.get("X-Slack-Retry-Num"):
+            # 키를 만들 수 없는 재시도는 처음 요청이 이미 처리 중이라고 보고 버린다
+            duplicate_requests.inc(route, "retry")
+            return "", 200
+        return None
+    state, cached = idempotency.begin(key)
+    if state == NEW:
+        g.idempotency_key = key
+        return None
+    duplicate_requests.inc(route, state)
+    g.metric_name = "duplicate"
+    logger.info("중복 요청 무시 (%s): %s retry=%s", state, key, request.headers.get("X-Slack-Retry-Num"))
+    if state == DONE:
+        return Response(cached.body, status=cached.status, content_type=cached.content_type)
+    return "", 200
+
+@app.after_request
+def store_idempotent_response(response):
+    key = g.pop("idempotency_key", None)
+    if key is not None:
+        body = response.get_data()
+        if g.pop("idempotency_store", True) and should_store(response.status_code, body):
+            idempotency.complete(key, CachedResponse(response.status_code, body, response.content_type))
+        else:
+            idempotency.release(key)
+    return response
+
+# 요청 캡처: CAPTURE_PATH를 지정하면 command / interaction 요청을 가려서 JSONL로 남긴다 (benchmarks/replay.py로 재생)
+CAPTURE_PATH = os.environ.get("CAPTURE_PATH")
+traffic_recorder = None
+if CAPTURE_PATH:
+    traffic_recorder = TrafficRecorder(CAPTURE_PATH, sample=float(os.environ.get("CAPTURE_SAMPLE", "1")))
+
+@app.after_request
+def capture_request(response):
+    if traffic_recorder is not None and request.method == "POST" and "request_started" in g \
+            and METERED_ROUTES.get(request.path) in ("command", "interaction"):
+        traffic_recorder.record(
+            request.path, request.form.to_dict(), g.get("interaction_payload"),
+            response.status_code, time.perf_counter() - g.request_started,
+        )
+    return response
+
 @app.route("/slack/command", methods=["POST"])
 def slash_command_router():
     data = request.form.to_dict()
@@ -373,26 +372,29 @@ def slash_command_router():
     user_name = data.get("user_name", "Guest")
     user_id = data.get("user_id")  # 슬랙 사용자 ID 추출
     trigger_id = data.get("trigger_id")
-    logger.info(f"Slash Command 요청: {data}")
-
-        #  Heartbeat 커맨드 추가
-    if command_text == "/heartbeat":
-        logger.info("💓 Heartbeat 요청 수신됨")
-        return jsonify({"status": "alive"}), 200
-        
-
-    elif command_text == "/create_new_work":
-        logger.info(f"/create_new_work 호출 by {user_id}")
+    g.metric_name = command_text
+    logger.info("Slash Command 요청: %s by %s", command_text, user_id)
+    Slack_Logging.log_payload(logger, "command", command_text, data)
+
+    # /heartbeat는 admit_request 훅에서 바로 응답한다 (부하 제어 우선 처리 대상)
+    if command_text == "/create_new_work":
+        logger.info("/create_new_work 호출 by %s", user_id)
+        args = data.get("text", "").split(None, 1)
+        if args and args[0] in ("bulk", "일괄"):
+            # /create_new_work bulk [행...]: 행이 있으면 바로 등록, 없으면 일괄 입력 모달
+            rows_text = args[1] if len(args) > 1 else ""
+            if rows_text.strip():
+                return jsonify({"response_type": "ephemeral", "text": submit_work_bulk(rows_text, user_id)})
+            if trigger_id:
+                modal_resp = open_work_bulk_create_modal(trigger_id)
+                if not modal_resp.get("ok"):
+                    return modal_failure_response(modal_resp)
+                return "", 200
         if trigger_id:
             modal_resp = open_create_new_work_modal(trigger_id, user_id) # trigger_id , user_id 전달
             if not modal_resp.get("ok"):
-                logger.error(f"Modal open 실패: {modal_resp.get('error')}")
-                return jsonify(
-                    {
-                        "response_type": "ephemeral",
-                        "text": f"모달을 띄우는 데 실패했습니다: {modal_resp.get('error')}",
-                    }
-                )
+                logger.error("Modal open 실패: %s", modal_resp.get("error"))
+                return modal_failure_response(modal_resp)
             return "", 200
         return jsonify(
             {
@@ -401,19 +403,20 @@ def slash_command_router():
             }
         )
     elif command_text == "/jira_issue_create":
-        logger.info(f"/jira_issue_create")
         if not trigger_id:
             return jsonify({
                 "response_type": "ephemeral",
                 "text": "trigger_id가 필요합니다. Slack 인터랙티브 명령에서만 동작합니다."
             })
 
+        if jira_breaker is not None and jira_breaker.state == OPEN:
+            # Jira 장애 중에는 모달을 열어도 생성이 밀리기만 하므로 바로 안내한다
+            return jsonify({"response_type": "ephemeral",
+                            "text": "Jira 응답이 없어 지금은 이슈를 만들 수 없습니다. 잠시 후 다시 시도해 주세요."})
+
         modal_resp = open_create_jira_issue_create_modal(trigger_id)
         if not modal_resp.get("ok"):
-            return jsonify({
-                "response_type": "ephemeral",
-                "text": f"모달을 띄우는 데 실패했습니다: {modal_resp.get('error')}"
-            })
+            return modal_failure_response(modal_resp)
         return "", 200
 
     elif command_text == "/모임요청":
@@ -427,128 +430,497 @@ def slash_command_router():
         modal_resp = open_meeting_request_modal(trigger_id)
 
         if not modal_resp.get("ok"):
-            return jsonify({
-
-                "response_type": "ephemeral",
-
-                "text": f"모달 열기에 실패했습니다: {modal_resp.get('error')}"
-
-            }), 200
+            return modal_failure_response(modal_resp)
 
         return "", 200
 
+    elif command_text in LEDGER_COMMANDS:
+        # /my_tasks [페이지], /team_tasks <업무유형> [페이지]: 원장 인덱스 조회만 한다 (Slack API 호출 없음)
+        if task_ledger is None:
+            return jsonify({"response_type": "ephemeral", "text": "업무 원장이 설정되지 않았습니다."})
+        return jsonify(ledger_command(task_ledger, command_text, user_id, data.get("text", "")))
+
     return jsonify(
         {"response_type": "ephemeral", "text": f"알 수 없는 커맨드({command_text})입니다."}
     )
 
 
+def wait_post(future, timeout: float) -> dict:
+    """스케줄러 발송 결과를 기다린다. 시간 안에 못 받으면 대기열에서 취소해 나중에 따로 나가지 않게 한다 (post_timeout).
+
+    이미 발송을 시작해 취소할 수 없으면 그 호출이 끝날 때까지 기다린다 (API 클라이언트 timeout으로 끝나고,
+    429로 다시 대기열에 들어간 메시지는 스케줄러의 max_rate_retries번까지).
+    그래서 post_timeout은 "보내지 않았음"이고, outbox가 다시 보내도 중복되지 않는다.
+    """
+    try:
+        return future.result(timeout=max(0.0, timeout))
+    except FutureTimeoutError:
+        if future.cancel():
+            return {"ok": False, "error": "post_timeout"}
+        return future.result()
+
+def post_message(payload: dict, coalesce: bool = None) -> dict:
+    """채널별 발송 속도 제한을 지키며 chat.postMessage 한다. Slack 응답 dict를 돌려준다."""
+    return wait_post(message_scheduler.post(payload["channel"], payload, coalesce=coalesce), POST_TIMEOUT)
+
+def process_work_request(work_type, title, content, period, plan_url, assignee_user_id, user_id=None):
+    """업무 요청 메시지를 채널에 전송하고 Slack 응답을 돌려준다. user_id(요청자)는 outbox 실패 알림에만 쓴다."""
+    normalized = normalize_cc_user_ids(DEFAULT_CC_USER_IDS)
+    payload = build_work_message(work_type, title, content, period, plan_url, assignee_user_id, normalized)
+    response = post_message(payload)
+    if response.get("ok"):
+        logger.info("신규 잡 메시지 전송 성공")
+        schedule_reminders([(work_type, title, period, assignee_user_id, payload["channel"])])
+        record_tasks([{"kind": "work", "work_type": work_type, "title": title, "assignee_user_id": assignee_user_id,
+                       "period": period, "channel": response.get("channel"), "ts": response.get("ts")}])
+    else:
+        logger.error("Slack 메시지 전송 실패: %s", response.get("error"))
+    return response
+
+def process_work_bulk(rows, user_id):
+    """검증된 일괄 요청(BulkRow dict 목록)을 채널별로 동시에 보내고, 결과 요약을 요청자에게 DM으로 알린다.
+
+    채널 간에는 스케줄러가 라운드로빈으로 동시에 보내고, 같은 채널은 채널별 속도 제한에 맞춰 보낸다
+    (대기 중인 메시지는 block 50개까지 한 메시지로 합쳐진다). 일부만 실패해도 다시 보내지 않고 요약에 남긴다.
+    """
+    rows = [BulkRow(**row) for row in rows]
+    normalized = normalize_cc_user_ids(DEFAULT_CC_USER_IDS)  # 행마다가 아니라 한 번만
+    groups = group_by_channel(rows)
+    pending = []
+    for channel_rows in groups.values():
+        for row in channel_rows:
+            payload = build_work_message(row.work_type, row.title, row.content, row.period, row.plan_url,
+                                         row.assignee_user_id, normalized)
+            pending.append((row, message_scheduler.post(payload["channel"], payload)))
+    # 가장 긴 채널 대기열이 다 나갈 시간 + POST_TIMEOUT까지 기다린다
+    longest = max(len(channel_rows) for channel_rows in groups.values())
+    deadline = time.monotonic() + POST_TIMEOUT + longest / message_scheduler.rate
+    results = []
+    for row, future in pending:
+        results.append((row, wait_post(future, deadline - time.monotonic())))
+    failed = sum(1 for _, response in results if not response.get("ok"))
+    logger.info("일괄 업무 요청 전송: %d건 (채널 %d개, 실패 %d건)", len(rows), len(groups), failed)
+    schedule_reminders([(row.work_type, row.title, row.period, row.assignee_user_id, response.get("channel"))
+                        for row, response in results if response.get("ok")])
+    record_tasks([{"kind": "work", "work_type": row.work_type, "title": row.title,
+                   "assignee_user_id": row.assignee_user_id, "period": row.period,
+                   "channel": response.get("channel"), "ts": response.get("ts")}
+                  for row, response in results if response.get("ok")])
+    notify = post_message({"channel": user_id, "text": summary_text(results)}, coalesce=False)
+    if not notify.get("ok"):
+        logger.warning("일괄 요청 결과 DM 전송 실패: %s", notify.get("error"))
+    return {"ok": True, "sent": len(rows) - failed, "failed": failed}
+
+def fan_out_meeting_dms(title, document, content, assignees, link="") -> dict:
+    """담당자 + 참조 인원에게 모임요청 DM을 보낸다. 실패한 user id → 사유 dict를 돌려준다.
+
+    DM 채널은 캐시에 없는 것만 동시에 열고(resolve_dm_channels), 발송은 채널(사람)마다 따로인 스케줄러
+    대기열에 한꺼번에 넣는다 → 인원이 늘어도 전체 지연은 가장 느린 호출 하나에 가깝다 (발송 스레드 수 이내).
+    """
+    recipients = meeting_recipients(assignees, DEFAULT_CC_USER_IDS)
+    channels = resolve_dm_channels(recipients)
+    failures = {}
+    pending = []
+    for user_id in recipients:
+        channel_id = channels.get(user_id)
+        if not channel_id:
+            failures[user_id] = "dm_open_failed"
+            continue
+        payload = build_meeting_dm(channel_id, title, document, content, link)
+        pending.append((user_id, message_scheduler.post(channel_id, payload, coalesce=False)))
+    deadline = time.monotonic() + POST_TIMEOUT
+    for user_id, future in pending:
+        response = wait_post(future, deadline - time.monotonic())
+        if not response.get("ok"):
+            failures[user_id] = response.get("error")
+    logger.info("모임요청 DM 발송: %d명 (실패 %d명)", len(recipients), len(failures))
+    return failures
+
+def process_meeting_request(title, document, content, assignees, user_id=None):
+    """모임요청 메시지를 기획리뷰 채널에 전송하고 Slack 응답을 돌려준다.
+
+    MEETING_DM_FANOUT이면 채널 전송이 성공한 뒤 참석자에게 DM도 보내고, 실패한 대상은 요청자에게 알린다.
+    DM 실패는 응답에 반영하지 않는다 (outbox가 채널 메시지를 다시 보내지 않도록).
+    """
+    payload = build_meeting_message(title, document, content, assignees)
+    response = post_message(payload)
+    if response.get("ok"):
+        logger.info("모임요청 메시지 전송 성공")
+        record_tasks([{"kind": MEETING, "work_type": MEETING, "title": title, "assignee_user_id": uid,
+                       "channel": response.get("channel"), "ts": response.get("ts")} for uid in assignees or []])
+        if MEETING_DM_FANOUT:
+            link = message_link(response.get("channel"), response.get("ts"))
+            failures = fan_out_meeting_dms(title, document, content, assignees, link)
+            if failures:
+                logger.warning("모임요청 DM 실패: %s", failures)
+                if user_id:
+                    recipients = meeting_recipients(assignees, DEFAULT_CC_USER_IDS)
+                    notify = post_message(build_fanout_report(user_id, title, len(recipients), failures),
+                                          coalesce=False)
+                    if not notify.get("ok"):
+                        logger.warning("모임요청 DM 실패 알림 전송 실패: %s", notify.get("error"))
+    else:
+        logger.error("슬랙 모임요청 메시지 전송 실패: %s", response.get("error"))
+    return response
+
+# Jira: 커넥션 풀 클라이언트 + createmeta(프로젝트 / 이슈 타입) 캐시
+jira_client = None
+jira_meta = None
+jira_breaker = None
+if JIRA_URL:
+    jira_breaker = CircuitBreaker("jira", **BREAKER_SETTINGS)
+    jira_client = JiraClient(
+        JIRA_URL, JIRA_API_TOKEN, email=JIRA_USER_EMAIL,
+        pool_size=int(os.environ.get("JIRA_POOL_SIZE", "10")),
+        max_retries=int(os.environ.get("JIRA_MAX_RETRIES", "3")),
+        breaker=jira_breaker,
+    )
+    jira_meta = CreateMetaIndex(jira_client.createmeta, ttl=int(os.environ.get("JIRA_META_TTL", "600")))
+    jira_meta.start()
+
+# external_select 옵션 검색 인덱스 (업무 유형 / Jira 프로젝트 / 이슈 타입), 백그라운드에서 주기적으로 다시 만든다
+option_sources = {"work_type": work_type_source(WORK_TYPE_OPTIONS)}
+if jira_meta is not None:
+    option_sources["jira"] = jira_source(jira_meta)
+options_provider = OptionsProvider(option_sources, refresh_interval=int(os.environ.get("OPTIONS_REFRESH_INTERVAL", "60")))
+options_provider.start()
+
+def process_jira_issue(project_key, issuetype, summary, description, user_id, retry_later: bool = False):
+    """Jira 이슈를 만들고 결과를 요청자에게 DM으로 알린다. 이슈 생성 결과를 돌려준다.
+
+    retry_later: outbox에서 호출됨 → 요청이 Jira에 닿지 않은 실패(retryable)는 알리지 않고 outbox 재시도에 맡긴다.
+    워커 풀 / 요청 스레드에서는 다시 시도할 곳이 없으므로 바로 알린다.
+    """
+    result = jira_client.create_issue(project_key, issuetype, summary, description)
+    if result.get("ok"):
+        logger.info("Jira 이슈 생성 성공: %s", result["key"])
+    else:
+        logger.error("Jira 이슈 생성 실패: %s %s", result.get("error"), result.get("detail"))
+        if result.get("retryable") and retry_later:
+            return result  # 요청이 Jira에 닿지 않음 → outbox가 재시도 (중복 생성 없음)
+    notify = post_message(build_jira_issue_message(user_id, summary, result), coalesce=False)
+    if not notify.get("ok"):
+        logger.warning("Jira 결과 DM 전송 실패: %s", notify.get("error"))
+    # 생성 성공 / 입력 오류(4xx)는 다시 보내도 결과가 같고, 응답을 못 받은 경우(uncertain)는 다시 보내면
+    # 중복 생성될 수 있으므로 사용자에게 알리고 처리 완료로 본다
+    return {"ok": True, "issue": result}
+
+# outbox에 저장된 항목(kind)을 실제로 처리하는 함수
+SUBMISSION_PROCESSORS = {
+    "work_create_modal": process_work_request,
+    "work_bulk_create_modal": process_work_bulk,
+    "meeting_review_modal": process_meeting_request,
+    "jira_issue_create_modal": process_jira_issue,
+}
+
+# outbox에서 다시 보낼 오류: Slack에 아무것도 올라가지 않은 실패만 (대기열에서 취소된 발송, 연결 실패,
+# rate limit, 회로 차단). 5xx / 응답 유실(uncertain) / 처리 중 예외는 이미 게시됐을 수 있고,
+# channel_not_found 같은 API 오류는 다시 보내도 같으므로 dead로 남기고 요청자에게 알린다
+OUTBOX_RETRY_ERRORS = ("post_timeout", "request_failed", "ratelimited", "circuit_open")
+
+def outbox_retryable(result: dict) -> bool:
+    """Jira 생성처럼 처리 함수가 retryable을 직접 정한 결과는 그 값을 따른다"""
+    return bool(result.get("retryable")) or str(result.get("error")).startswith(OUTBOX_RETRY_ERRORS)
+
+def notify_outbox_dead(kind, data, result):
+    """outbox가 처리를 포기한 제출을 요청자에게 DM으로 알린다"""
+    user_id = data.get("user_id")
+    if not user_id:
+        return
+    notify = post_message(build_submission_failure_message(user_id, kind, data, result.get("error")), coalesce=False)
+    if not notify.get("ok"):
+        logger.warning("outbox 실패 알림 전송 실패: %s", notify.get("error"))
+
+def deliver_from_outbox(kind, data):
+    if kind == "jira_issue_create_modal":
+        return process_jira_issue(**data, retry_later=True)
+    return SUBMISSION_PROCESSORS[kind](**data)
+
+# outbox: 제출 내용을 SQLite에 먼저 저장하고 백그라운드에서 재시도하며 발송 (재기동/Slack 장애에도 유실 없음)
+# 경로(OUTBOX_PATH 또는 DATA_DIR)가 없으면 쓰지 않는다
+OUTBOX_PATH = data_path("OUTBOX_PATH", "outbox.db")
+outbox = None
+if OUTBOX_PATH and os.environ.get("OUTBOX_ENABLED", "1") == "1":
+    outbox = Outbox(
+        OUTBOX_PATH,
+        deliver_from_outbox,
+        concurrency=int(os.environ.get("OUTBOX_CONCURRENCY", "8")),
+        max_attempts=int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "10")),
+        lease=float(os.environ.get("OUTBOX_LEASE", "60")),
+        retryable=outbox_retryable,
+        on_dead=notify_outbox_dead,
+        retention=float(os.environ.get("OUTBOX_RETENTION_DAYS", "7")) * 86400,
+    )
+
+def submit_background(kind, always: bool = False, **fields) -> bool:
+    """outbox(또는 ack 모드 / always면 워커 풀)에 넘겼으면 True"""
+    if outbox is not None:
+        try:
+            outbox.enqueue(kind, fields)
+            return True
+        except Exception as e:
+            logger.error("outbox 저장 실패, 직접 처리: %s", e)
+    return (INTERACTION_ACK_MODE or always) and submission_pool.submit(kind, SUBMISSION_PROCESSORS[kind], **fields)
+
+def send_reminders(reminders):
+    """리마인더 묶음을 담당자 DM + 업무 유형 채널로 보낸다. 같은 채널에 몰린 알림은 스케줄러가 block을 합쳐 보낸다.
+
+    DM과 채널 알림 중 하나라도 나갔으면 성공으로 본다 (다시 보내면 나간 쪽이 중복된다).
+    """
+    pending = []
+    for reminder in reminders:
+        dm, notice = build_reminder_messages(reminder)
+        pending.append((message_scheduler.post(dm["channel"], dm), message_scheduler.post(notice["channel"], notice)))
+    deadline = time.monotonic() + POST_TIMEOUT + len(reminders) / message_scheduler.rate
+    results = []
+    for futures in pending:
+        errors = []
+        for future in futures:
+            response = wait_post(future, deadline - time.monotonic())
+            if not response.get("ok"):
+                errors.append(response.get("error"))
+        if len(errors) == len(futures):
+            results.append({"ok": False, "error": errors[0]})
+        else:
+            if errors:
+                logger.warning("리마인더 일부 발송 실패: %s", errors[0])
+            results.append({"ok": True})
+    return results
+
+# 마감 리마인더: 채널에 올라간 업무의 종료일 REMINDER_DAYS_BEFORE일 전 REMINDER_HOUR시에 담당자 DM + 채널 알림
+REMINDER_PATH = data_path("REMINDER_PATH", "reminders.db")
+reminder_scheduler = None
+if REMINDER_PATH and os.environ.get("REMINDER_ENABLED", "1") == "1":
+    reminder_scheduler = ReminderScheduler(
+        REMINDER_PATH,
+        send_reminders,
+        days_before=parse_days(os.environ.get("REMINDER_DAYS_BEFORE", "1,0")),
+        hour=int(os.environ.get("REMINDER_HOUR", "10")),
+        tz=ZoneInfo(os.environ.get("REMINDER_TZ", "Asia/Seoul")),
+        retention=float(os.environ.get("REMINDER_RETENTION_DAYS", "7")) * 86400,
+    )
+
+def schedule_reminders(works):
+    """works: [(work_type, title, period, assignee_user_id, channel)] — 기간이 있는 업무만 리마인더를 저장한다.
+
+    저장에 실패해도 업무 요청 자체는 성공으로 둔다 (outbox가 메시지를 다시 보내지 않도록).
+    """
+    if reminder_scheduler is None:
+        return
+    items = []
+    for work_type, title, period, assignee_user_id, channel in works:
+        _, end_date = period_dates(period)
+        if end_date:
+            items.append({"work_type": work_type, "title": title, "end_date": end_date,
+                          "assignee_user_id": assignee_user_id, "channel": channel})
+    if not items:
+        return
+    try:
+        count = reminder_scheduler.schedule(items)
+        logger.info("마감 리마인더 %d건 저장 (업무 %d건)", count, len(items))
+    except Exception:
+        logger.exception("마감 리마인더 저장 실패")
+
+# 업무 원장: 채널에 올라간 업무 / 모임요청을 담당자별로 저장해 /my_tasks, /team_tasks에 바로 답한다
+LEDGER_PATH = data_path("LEDGER_PATH", "ledger.db")
+task_ledger = None
+if LEDGER_PATH and os.environ.get("LEDGER_ENABLED", "1") == "1":
+    task_ledger = TaskLedger(LEDGER_PATH, undated_days=int(os.environ.get("LEDGER_UNDATED_DAYS", "14")))
+
+def record_tasks(tasks):
+    """원장에 기록한다. 실패해도 요청 처리는 성공으로 둔다 (schedule_reminders와 같은 이유)."""
+    if task_ledger is None or not tasks:
+        return
+    try:
+        task_ledger.record(tasks)
+    except Exception:
+        logger.exception("업무 원장 저장 실패")
+
+def upstream_unavailable(kind) -> bool:
+    """제출 처리에 필요한 업스트림의 회로 차단기가 열려 있는지"""
+    if kind == "jira_issue_create_modal":
+        return jira_breaker is not None and jira_breaker.state == OPEN
+    return slack_breakers.is_open("chat.postMessage")
+
+DEFERRED_TEXT = "업스트림 응답이 지연되고 있어 요청을 접수만 해 두었습니다. 복구되는 대로 자동으로 처리됩니다."
+
+def dispatch_submission(kind, **fields):
+    """제출 처리 방식 선택
+    - outbox 사용 시: SQLite에 저장만 하고 바로 모달을 닫는다
+    - ack 모드: 워커 풀에 넘기고 바로 모달을 닫는다
+    - 업스트림 회로 차단기가 열려 있으면: 요청 스레드에서 기다리지 않는다. outbox에 넣고(복구 후 재시도) 안내 문구를
+      보여 주거나, outbox가 없으면 바로 "지금은 처리할 수 없음"을 알린다
+    - 그 외(또는 저장/큐 실패 시): 요청 스레드에서 처리한다
+    """
+    func = SUBMISSION_PROCESSORS[kind]
+    block_id = "summary" if kind == "jira_issue_create_modal" else "title"
+    if upstream_unavailable(kind):
+        if outbox is not None and submit_background(kind, **fields):
+            return jsonify({"response_action": "update", "view": notice_view("접수됨", DEFERRED_TEXT)})
+        return jsonify({"response_action": "errors", "errors": {block_id: UNAVAILABLE_TEXT}})
+    if submit_background(kind, **fields):
+        return jsonify({"response_action": "clear"})
+    if func(**fields).get("ok"):
+        return jsonify({"response_action": "clear"})
+    return jsonify({"response_action": "errors", "errors": {block_id: "메시지 전송 실패"}})
+
+def submit_work_bulk(rows_text, user_id):
+    """일괄 입력을 한 번에 검증해 백그라운드로 넘기고 요청자에게 보여 줄 안내 문구를 돌려준다.
+    오류가 있는 줄이 하나라도 있으면 아무것도 보내지 않는다 (고쳐서 다시 붙여넣기)."""
+    rows, errors = validate_rows(rows_text, member_names())
+    if errors:
+        return "입력 오류가 있어 등록하지 않았습니다.\n" + format_errors(errors)
+    if outbox is None and upstream_unavailable("work_bulk_create_modal"):
+        return UNAVAILABLE_TEXT
+    if not submit_background("work_bulk_create_modal", always=True,
+                             rows=[row._asdict() for row in rows], user_id=user_id):
+        return "요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도하세요."
+    return f"{len(rows)}건을 접수했습니다 (채널 {len(group_by_channel(rows))}개). 결과는 DM으로 알려 드립니다."
+
+
 @app.route("/slack/interactions", methods=["POST"])
 def interactions():
-    logger.info("interactions1")
-    payload_str = request.form.get("payload")
-    if not payload_str:
+    data = interaction_payload()
+    if not data:
         return "", 400
-    data = json.loads(payload_str)
-    logger.info("interactions2")
 
     if data.get("type") == "view_submission":
-        callback_id = data.get("view", {}).get("callback_id")
-        state_values = data["view"]["state"]["values"]
+        # 모달 정의에 맞춰 필요한 값만 꺼낸 요청 객체 (필수 항목이 비어 있으면 errors)
+        callback_id, submission, errors = parse_submission(data)
+        g.metric_name = callback_id
+        logger.info("view_submission: %s by %s", callback_id, data.get("user", {}).get("id"))
+        Slack_Logging.log_payload(logger, "interaction", callback_id, data)
+        if errors:
+            return jsonify({"response_action": "errors", "errors": errors})
 
         # 1) 기존 업무 생성 모달 처리
-        if callback_id == "work_create_modal":
-            work_type = state_values["work_type"]["work_type_select"]["selected_option"]["value"]
-            title = state_values["title"]["title_input"]["value"]
-            content = state_values["content"]["content_input"]["value"]
-            plan_url = state_values["plan_url"]["plan_url_input"].get("value", "")
-            assignee_user_id = state_values["assignee"]["assignee_input"]["selected_user"]
-
-            start_date = state_values.get("start_date", {}).get("start_date_input", {}).get("selected_date", "")
-            end_date = state_values.get("end_date", {}).get("end_date_input", {}).get("selected_date", "")
-            period = f"{start_date} ~ {end_date}" if start_date and end_date else "기간 미설정"
-
-            prefix = PREFIX_MAP.get(work_type, "")
-            
-            # conversations_client는 slack_sdk WebClient 예: WebClient(token=SLACK_BOT_TOKEN)
-            normalized = normalize_cc_user_ids(conversations_client, DEFAULT_CC_USER_IDS)
-            cc_mentions = " ".join([f"<@{uid}>" for uid in normalized])
-            blocks = [
-                {"type": "divider"},
-                {
-                    "type": "section",
-                    "text": {"type": "mrkdwn", "text": f"{cc_mentions}\n*지라 일감 요청드립니다!*"},
-                },
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": (
-                            f"*<{prefix}업무 요청>*\n"
-                            f"*제목:* {prefix}{title}\n"
-                            f"*내용:* {content}\n"
-                            f"*기간:* {period}\n"
-                            f"*기획서:* {plan_url if plan_url else '없음'}\n"
-                            f"*담당자:* <@{assignee_user_id}>"
-                        ),
-                    },
-                },
-                {"type": "divider"},
-            ]
-
-            headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}", "Content-Type": "application/json"}
-            target_channel = CHANNEL_MAP.get(work_type, TARGET_CHANNEL)
-            payload = {"channel": target_channel, "blocks": blocks, "text": f"{prefix}업무 요청: {title}"}
-            response = requests.post(f"{SLACK_API_URL}/chat.postMessage", headers=headers, json=payload)
-            if response.status_code == 200:
-                logger.info("신규 잡 메시지 전송 성공")
-                return jsonify({"response_action": "clear"})
-            else:
-                logger.error(f"Slack 메시지 전송 실패: {response.text}")
-                return jsonify({"response_action": "errors", "errors": {"title": "메시지 전송 실패"}})
+        if isinstance(submission, WorkRequest):
+            return dispatch_submission("work_create_modal", **submission.fields())
+
+        # 1-1) 업무 일괄 요청 모달: 모든 줄을 검증하고, 오류가 있으면 모달에 줄 번호와 함께 보여 준다
+        elif isinstance(submission, WorkBulkRequest):
+            rows, errors = validate_rows(submission.rows_text, member_names())
+            if errors:
+                return jsonify({"response_action": "errors", "errors": {"rows": format_errors(errors)}})
+            if not submit_background("work_bulk_create_modal", always=True,
+                                     rows=[row._asdict() for row in rows], user_id=submission.user_id):
+                return jsonify({"response_action": "errors", "errors": {"rows": "요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도하세요"}})
+            return jsonify({"response_action": "clear"})
 
         # 2) 모임요청 모달 처리
-        elif callback_id == "meeting_review_modal":
-            # 필드 추출: block_id / action_id는 모달을 만든 블록 정의와 정확히 일치해야 함
-            title = state_values["title"]["title_input"]["value"]
-            document = state_values.get("document", {}).get("document_input", {}).get("value", "")
-            content = state_values.get("content", {}).get("content_input", {}).get("value", "")
-            # 장소 블록을 모달에 추가했다면 다음과 같이 읽음(없다면 빈 문자열 처리)
-            place = state_values.get("place", {}).get("place_input", {}).get("value", "")
-
-            # 담당자: multi_users_select
-            assignees = state_values["assignee"]["assignee_input"].get("selected_users", [])
-            assignee_mentions = " ".join([f"<@{uid}>" for uid in assignees]) if assignees else "없음"
-
-            # 참조: 기본 3명(환경설정 권장)
-            default_refs = DEFAULT_CC_USER_IDS  # 예: ["UAAAAAAA1","UBBBBBBB2","UCCCCCCC3"]
-            cc_mentions = " ".join([f"<@{uid}>" for uid in default_refs])
-
-            # 메시지 텍스트(요청하신 형식)
-            # 굵게/각괄호/화살괄호 등은 mrkdwn에서 그대로 표시 가능
-            lines = [
-                "**[기획 리뷰 요청드립니다.]**",
-                f"제목: << {title} >>",
-                f"기획서: {document if document else '없음'}",
-                f"내용: {content if content else '없음'}",
-                f"담당자: {assignee_mentions}",
-                f"참조: {cc_mentions}",
-            ]
-            msg_text = "\n".join(lines)
-
-            headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}", "Content-Type": "application/json"}
-            target_channel = MEETING_REQUEST_CHANNEL  # 모임요청을 보낼 채널
-            payload = {"channel": target_channel, "text": msg_text}
-            response = requests.post(f"{SLACK_API_URL}/chat.postMessage", headers=headers, json=payload)
-            if response.status_code == 200:
-                logger.info("모임요청 메시지 전송 성공")
-                return jsonify({"response_action": "clear"})
-            else:
-                logger.error(f"슬랙 모임요청 메시지 전송 실패: {response.text}")
-                return jsonify({"response_action": "errors", "errors": {"title": "메시지 전송 실패"}})
+        elif isinstance(submission, MeetingRequest):
+            return dispatch_submission("meeting_review_modal", **submission.fields())
+
+        # 3) Jira 이슈 생성 모달 처리: 프로젝트 / 이슈 타입을 createmeta 캐시로 검증하고 생성은 백그라운드에서
+        elif isinstance(submission, JiraIssueRequest):
+            if jira_client is None:
+                return jsonify({"response_action": "errors", "errors": {"summary": "Jira 연동이 설정되지 않았습니다"}})
+            project_key, issuetype, errors = jira_meta.validate(submission.project_key, submission.issuetype)
+            if errors:
+                return jsonify({"response_action": "errors", "errors": errors})
+
+            return dispatch_submission(
+                "jira_issue_create_modal",
+                project_key=project_key, issuetype=issuetype, summary=submission.summary,
+                description=submission.description, user_id=submission.user_id,
+            )
 
     return "", 200
 
 
+@app.route("/slack/options", methods=["POST"])
+def options():
+    """external_select 검색어(block_suggestion)에 맞는 옵션을 메모리 인덱스에서 돌려준다 (업스트림 호출 없음)."""
+    data = interaction_payload()
+    if not data:
+        return "", 400
+    g.metric_name = data.get("action_id")
+    return Response(Slack_Json.dumps(block_suggestion_options(options_provider, data)), mimetype="application/json")
+
+
+@app.route("/slack/events", methods=["POST"])
+def events():
+    """Events API: url_verification 응답, 멤버 변경(user_change / team_join)과 채널 입퇴장을 디렉터리에 바로 반영
+
+    서명 없이는 멤버 목록(일괄 요청의 @이름 → 담당자 매핑)을 누구나 바꿀 수 있으므로,
+    SLACK_SIGNING_SECRET이 없으면 엔드포인트를 열지 않는다 (404).
+    """
+    if not SLACK_SIGNING_SECRET:
+        return "", 404
+    body = request.get_data()
+    if not verify_signature(
+        SLACK_SIGNING_SECRET,
+        request.headers.get("X-Slack-Request-Timestamp"),
+        body,
+        request.headers.get("X-Slack-Signature"),
+    ):
+        logger.warning("Events API 서명 검증 실패")
+        return "", 401
+    envelope = parse_payload(body)
+    if envelope is None:
+        return "", 400
+    status, result = handle_envelope(member_directory, envelope)
+    event = envelope.get("event")
+    g.metric_name = (event.get("type") if isinstance(event, dict) else None) or envelope.get("type")
+    if result is None:
+        return "", status
+    return jsonify(result), status
+
+
+Slack_Metrics.registry.gauge(
+    "slack_app_submission_queue_depth", "ack 모드 워커 풀 대기 작업 수",
+    lambda: submission_pool.stats()["queue_depth"],
+)
+Slack_Metrics.registry.gauge(
+    "slack_app_post_queue_depth", "채널별 chat.postMessage 대기 메시지 수",
+    lambda: {(channel,): n for channel, n in message_scheduler.stats()["queued"].items()},
+    labels=("channel",),
+)
+if outbox is not None:
+    Slack_Metrics.registry.gauge(
+        "slack_app_outbox_backlog", "outbox 미발송 항목 수", lambda: outbox.stats()["backlog"],
+    )
+
+if reminder_scheduler is not None:
+    Slack_Metrics.registry.gauge(
+        "slack_app_reminders_pending", "발송 대기 중인 마감 리마인더 수", lambda: reminder_scheduler.stats()["pending"],
+    )
+
+@app.route("/healthz", methods=["GET"])
+def healthz():
+    """로드밸런서 / 오케스트레이터용 헬스 체크 (Slack / DB 호출 없음, 부하 제어 한도와 무관)"""
+    return Response(b'{"status":"ok"}', mimetype="application/json")
+
+Slack_Metrics.registry.gauge(
+    "slack_app_circuit_open", "업스트림 회로 차단기 상태 (1=열림)",
+    lambda: {(name,): int(stats["state"] == OPEN) for name, stats in slack_breakers.stats().items()}
+    | ({("jira",): int(jira_breaker.state == OPEN)} if jira_breaker else {}),
+    labels=("endpoint",),
+)
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus text format (gunicorn 워커별 값)"""
+    return Response(Slack_Metrics.registry.render(), mimetype=Slack_Metrics.CONTENT_TYPE)
+
+@app.route("/slack/worker/stats", methods=["GET"])
+def worker_stats():
+    """ack 모드 워커 풀의 큐 길이 / 작업 지연 시간"""
+    return jsonify({
+        "ack_mode": INTERACTION_ACK_MODE,
+        "admission": admission.stats(),
+        "capture": traffic_recorder.stats() if traffic_recorder is not None else None,
+        "breakers": {**slack_breakers.stats(), **({"jira": jira_breaker.stats()} if jira_breaker else {})},
+        "submissions": submission_pool.stats(),
+        "messages": message_scheduler.stats(),
+        "outbox": outbox.stats() if outbox is not None else None,
+        "reminders": reminder_scheduler.stats() if reminder_scheduler is not None else None,
+        "ledger": task_ledger.stats() if task_ledger is not None else None,
+        "options": options_provider.stats(),
+        "members": {"count": len(member_directory), "events_applied": member_directory.events_applied},
+    })
+
+
 
 
 if __name__ == "__main__":
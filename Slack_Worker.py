@@ -0,0 +1,97 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """응답(ack)을 먼저 보내고 Slack 호출은 나중에 처리하기 위한 고정 크기 스레드 풀.
+
+    큐 크기가 제한되어 있어 꽉 차면 submit()이 False를 돌려준다 (호출 측에서 동기 처리 등으로 대체).
+    """
+
+    def __init__(self, name: str = "worker", workers: int = 4, max_queue: int = 100, latency_window: int = 500):
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)   # 실행 시간(초)
+        self._waits = deque(maxlen=latency_window)       # 큐 대기 시간(초)
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._threads = []
+        for i in range(workers):
+            t = threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, label: str, func, *args, **kwargs) -> bool:
+        try:
+            self._queue.put_nowait((label, func, args, kwargs, time.monotonic()))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            logger.warning("[%s] 작업 큐가 가득 참 (%s)", self.name, label)
+            return False
+
+    def _run(self):
+        while True:
+            label, func, args, kwargs, enqueued_at = self._queue.get()
+            started = time.monotonic()
+            with self._lock:
+                self._in_flight += 1
+                self._waits.append(started - enqueued_at)
+            ok = True
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                ok = False
+                logger.exception("[%s] 작업 실패 (%s)", self.name, label)
+            finally:
+                elapsed = time.monotonic() - started
+                with self._lock:
+                    self._in_flight -= 1
+                    self._latencies.append(elapsed)
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+                self._queue.task_done()
+            logger.info("[%s] %s 처리 완료 (%.1fms)", self.name, label, elapsed * 1000)
+
+    def join(self):
+        """큐에 쌓인 작업이 모두 끝날 때까지 기다린다."""
+        self._queue.join()
+
+    @staticmethod
+    def _percentile(samples, pct):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = list(self._latencies)
+            waits = list(self._waits)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "latency_ms": {
+                    "p50": round(self._percentile(latencies, 0.50) * 1000, 1),
+                    "p95": round(self._percentile(latencies, 0.95) * 1000, 1),
+                    "max": round(max(latencies, default=0.0) * 1000, 1),
+                },
+                "queue_wait_ms": {
+                    "p50": round(self._percentile(waits, 0.50) * 1000, 1),
+                    "p95": round(self._percentile(waits, 0.95) * 1000, 1),
+                },
+            }
@@ -0,0 +1,129 @@
+"""view_submission 파싱 비용 비교 (json.loads + dict 연쇄 조회 vs Slack_Json + Slack_Submissions)
+
+Slack이 보내는 것과 비슷한 크기의 payload(모달 blocks 전체 + state)를 만들어
+제출 한 건당 CPU 시간과 tracemalloc 기준 메모리 할당(피크 / 블록 수)을 잰다.
+
+사용법: python benchmarks/bench_submissions.py [반복 횟수]
+"""
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import Slack_Json  # noqa: E402
+from Slack_Submissions import decode_submission  # noqa: E402
+from Slack_Views import jira_issue_create_view, meeting_request_view, work_create_view  # noqa: E402
+
+
+def payload(view: dict, values: dict) -> str:
+    view = dict(view, id="V0123456789", hash="1700000000.abcdef12", team_id="T0123", app_id="A0123",
+                state={"values": values}, private_metadata="", root_view_id="V0123456789")
+    return json.dumps({
+        "type": "view_submission",
+        "team": {"id": "T0123", "domain": "example"},
+        "user": {"id": "U0123456", "username": "bench", "name": "bench", "team_id": "T0123"},
+        "api_app_id": "A0123",
+        "token": "verification-token",
+        "trigger_id": "1234.5678.abcdef",
+        "view": view,
+        "response_urls": [],
+        "is_enterprise_install": False,
+    }, ensure_ascii=False)
+
+
+WORK = payload(work_create_view("U0123456"), {
+    "work_type": {"work_type_select": {"type": "external_select", "selected_option": {
+        "text": {"type": "plain_text", "text": "클라"}, "value": "client_task"}}},
+    "title": {"title_input": {"type": "plain_text_input", "value": "로그인 화면 개선"}},
+    "content": {"content_input": {"type": "plain_text_input", "value": "소셜 로그인 버튼 배치 변경\n" * 5}},
+    "start_date": {"start_date_input": {"type": "datepicker", "selected_date": "2026-11-02"}},
+    "end_date": {"end_date_input": {"type": "datepicker", "selected_date": "2026-11-13"}},
+    "plan_url": {"plan_url_input": {"type": "plain_text_input", "value": "https://example.com/plan"}},
+    "assignee": {"assignee_input": {"type": "users_select", "selected_user": "U0654321"}},
+})
+MEETING = payload(meeting_request_view(), {
+    "title": {"title_input": {"type": "plain_text_input", "value": "기획 리뷰"}},
+    "assignee": {"assignee_input": {"type": "multi_users_select", "selected_users": ["U01", "U02", "U03"]}},
+    "document": {"document_input": {"type": "plain_text_input", "value": "https://example.com/doc"}},
+    "content": {"content_input": {"type": "plain_text_input", "value": None}},
+})
+JIRA = payload(jira_issue_create_view(), {
+    "summary": {"summary_input": {"type": "plain_text_input", "value": "크래시 수정"}},
+    "description": {"description_input": {"type": "plain_text_input", "value": "재현 절차 ..."}},
+    "project": {"project_select": {"type": "external_select", "selected_option": {
+        "text": {"type": "plain_text", "text": "GAME - Game Client"}, "value": "GAME"}}},
+    "issuetype": {"issuetype_select": {"type": "external_select", "selected_option": {
+        "text": {"type": "plain_text", "text": "Bug"}, "value": "Bug"}}},
+})
+
+
+def legacy(raw: str):
+    # 기존 방식: 표준 json으로 전체 파싱 후 dict 연쇄 조회 (블록이 없으면 KeyError)
+    data = json.loads(raw)
+    callback_id = data.get("view", {}).get("callback_id")
+    state_values = data["view"]["state"]["values"]
+    if callback_id == "work_create_modal":
+        start_date = state_values.get("start_date", {}).get("start_date_input", {}).get("selected_date", "")
+        end_date = state_values.get("end_date", {}).get("end_date_input", {}).get("selected_date", "")
+        return dict(
+            work_type=state_values["work_type"]["work_type_select"]["selected_option"]["value"],
+            title=state_values["title"]["title_input"]["value"],
+            content=state_values["content"]["content_input"]["value"],
+            plan_url=state_values["plan_url"]["plan_url_input"].get("value", ""),
+            assignee_user_id=state_values["assignee"]["assignee_input"]["selected_user"],
+            period=f"{start_date} ~ {end_date}" if start_date and end_date else "기간 미설정",
+        )
+    if callback_id == "meeting_review_modal":
+        return dict(
+            title=state_values["title"]["title_input"]["value"],
+            document=state_values.get("document", {}).get("document_input", {}).get("value", ""),
+            content=state_values.get("content", {}).get("content_input", {}).get("value", ""),
+            assignees=state_values["assignee"]["assignee_input"].get("selected_users", []),
+        )
+    return dict(
+        summary=state_values["summary"]["summary_input"]["value"],
+        description=state_values.get("description", {}).get("description_input", {}).get("value") or "",
+        project_key=state_values["project"]["project_select"]["selected_option"]["value"],
+        issuetype=state_values["issuetype"]["issuetype_select"]["selected_option"]["value"],
+    )
+
+
+def allocations(func, number: int = 200):
+    """(한 건 파싱 중 메모리 피크 bytes, 결과 객체 하나가 붙잡고 있는 메모리 블록 수)"""
+    func()
+    tracemalloc.start()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    before = tracemalloc.take_snapshot()
+    results = [func() for _ in range(number)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    del results
+    return peak - current, blocks / number
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cases = [("work_create_modal", WORK), ("meeting_review_modal", MEETING), ("jira_issue_create_modal", JIRA)]
+    print(f"JSON backend: {Slack_Json.BACKEND}, 반복: {number}")
+    print(f"{'modal':<26}{'bytes':>7}{'us before':>11}{'after':>8}{'peak KB before':>16}{'after':>7}"
+          f"{'kept blocks before':>20}{'after':>7}")
+    for name, raw in cases:
+        before = lambda: legacy(raw)  # noqa: E731
+        after = lambda: decode_submission(raw)  # noqa: E731
+        t_before = min(timeit.repeat(before, number=number, repeat=3)) / number * 1e6
+        t_after = min(timeit.repeat(after, number=number, repeat=3)) / number * 1e6
+        peak_before, blocks_before = allocations(before)
+        peak_after, blocks_after = allocations(after)
+        print(f"{name:<26}{len(raw.encode()):>7}{t_before:>11.2f}{t_after:>8.2f}"
+              f"{peak_before / 1024:>16.1f}{peak_after / 1024:>7.1f}{blocks_before:>20.1f}{blocks_after:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
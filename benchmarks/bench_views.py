@@ -0,0 +1,57 @@
+"""모달 views.open 요청 본문을 만드는 CPU 비용 비교 (매번 dict 생성 + json.dumps vs 미리 직렬화한 템플릿)
+
+사용법: python benchmarks/bench_views.py [반복 횟수]
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import Slack_Json  # noqa: E402
+from Slack_Views import (  # noqa: E402
+    Field, ViewRegistry, jira_issue_create_view, meeting_request_view, work_create_view,
+)
+
+
+def legacy_work(trigger_id, user_id):
+    # 기존 방식: 요청마다 dict를 새로 만들고 requests의 json= 처럼 json.dumps로 직렬화
+    return json.dumps({"trigger_id": trigger_id, "view": work_create_view(user_id)}).encode("utf-8")
+
+
+def legacy_jira(trigger_id):
+    return json.dumps({"trigger_id": trigger_id, "view": jira_issue_create_view()}).encode("utf-8")
+
+
+def legacy_meeting(trigger_id):
+    return json.dumps({"trigger_id": trigger_id, "view": meeting_request_view()}).encode("utf-8")
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    initial_user = Field("initial_user")
+    registry = ViewRegistry()
+    registry.register("work_create_modal", work_create_view(initial_user.marker), [initial_user])
+    registry.register("jira_issue_create_modal", jira_issue_create_view())
+    registry.register("meeting_review_modal", meeting_request_view())
+
+    cases = [
+        ("work_create_modal", lambda: legacy_work("1234.5678.abcdef", "U0123456"),
+         lambda: registry.render("work_create_modal", "1234.5678.abcdef", initial_user="U0123456")),
+        ("jira_issue_create_modal", lambda: legacy_jira("1234.5678.abcdef"),
+         lambda: registry.render("jira_issue_create_modal", "1234.5678.abcdef")),
+        ("meeting_review_modal", lambda: legacy_meeting("1234.5678.abcdef"),
+         lambda: registry.render("meeting_review_modal", "1234.5678.abcdef")),
+    ]
+    print(f"JSON backend: {Slack_Json.BACKEND}, 반복: {number}")
+    print(f"{'modal':<26}{'before(us)':>12}{'after(us)':>12}{'speedup':>10}")
+    for name, before, after in cases:
+        assert json.loads(before()) == json.loads(after())
+        t_before = min(timeit.repeat(before, number=number, repeat=3)) / number * 1e6
+        t_after = min(timeit.repeat(after, number=number, repeat=3)) / number * 1e6
+        print(f"{name:<26}{t_before:>12.2f}{t_after:>12.2f}{t_before / t_after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""벤치마크/로컬 테스트용 가짜 Slack Web API + Jira REST 서버
+
+지연 시간, 오류율, 429(rate limit) 비율을 설정할 수 있다.
+
+사용법:
+    python benchmarks/fake_slack.py --port 8900 --latency-ms 80 --error-rate 0.01 --ratelimit-rate 0.02
+    SLACK_API_URL=http://127.0.0.1:8900/api JIRA_URL=http://127.0.0.1:8900 gunicorn Slack_WebServer:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeConfig:
+    def __init__(self, latency_ms=50.0, jitter_ms=20.0, error_rate=0.0, ratelimit_rate=0.0,
+                 retry_after=1, members=2000, page_size=1000):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.ratelimit_rate = ratelimit_rate
+        self.retry_after = retry_after
+        self.members = members
+        self.page_size = page_size
+
+
+def slack_response(method: str, params: dict, body: dict, config: FakeConfig) -> dict:
+    if method == "users.list":
+        start = int(params.get("cursor") or 0)
+        limit = min(int(params.get("limit") or config.page_size), config.page_size)
+        end = min(start + limit, config.members)
+        members = [
+            {"id": f"U{i:08d}", "name": f"user{i}", "deleted": i % 50 == 0, "is_bot": i % 97 == 0}
+            for i in range(start, end)
+        ]
+        return {"ok": True, "members": members,
+                "response_metadata": {"next_cursor": str(end) if end < config.members else ""}}
+    if method == "conversations.open":
+        users = body.get("users", "")
+        user = users[0] if isinstance(users, list) else users.split(",")[0]
+        return {"ok": True, "channel": {"id": "D" + user[1:]}}
+    if method == "conversations.info":
+        channel = params.get("channel") or body.get("channel", "")
+        return {"ok": True, "channel": {"id": channel, "user": "U" + channel[1:]}}
+    if method in ("chat.postMessage", "chat.postEphemeral", "chat.scheduleMessage"):
+        return {"ok": True, "channel": body.get("channel"), "ts": f"{time.time():.6f}"}
+    if method in ("views.open", "views.update", "views.push"):
+        return {"ok": True, "view": {"id": "V" + str(random.randint(10 ** 8, 10 ** 9))}}
+    return {"ok": True}
+
+
+JIRA_PROJECTS = [
+    {"id": "10000", "key": "PROJ", "name": "Project"},
+    {"id": "10001", "key": "GAME", "name": "Game Client"},
+    {"id": "10002", "key": "SRV", "name": "Server"},
+]
+JIRA_ISSUE_TYPES = [
+    {"id": "10100", "name": "Task"},
+    {"id": "10101", "name": "Bug"},
+    {"id": "10102", "name": "Story"},
+]
+
+
+def jira_response(path: str, body: dict):
+    if path.endswith("/issue/createmeta"):
+        return 200, {"projects": [dict(p, issuetypes=JIRA_ISSUE_TYPES) for p in JIRA_PROJECTS]}
+    if path.endswith("/project"):
+        return 200, JIRA_PROJECTS
+    if path.endswith("/issue"):
+        fields = body.get("fields", {})
+        key = fields.get("project", {}).get("key", "PROJ")
+        errors = {}
+        if not fields.get("summary"):
+            errors["summary"] = "You must specify a summary of the issue."
+        if key not in {p["key"] for p in JIRA_PROJECTS}:
+            errors["project"] = "project is required"
+        if fields.get("issuetype", {}).get("name") not in {t["name"] for t in JIRA_ISSUE_TYPES}:
+            errors["issuetype"] = "issue type is required"
+        if errors:
+            return 400, {"errorMessages": [], "errors": errors}
+        number = random.randint(1, 99999)
+        return 201, {"id": str(number), "key": f"{key}-{number}", "self": f"/rest/api/2/issue/{number}"}
+    if path.endswith("/myself"):
+        return 200, {"name": "bot", "displayName": "Bot"}
+    return 404, {"errorMessages": ["not found"]}
+
+
+class FakeSlackServer:
+    """백그라운드 스레드에서 동작하는 가짜 Slack/Jira 서버"""
+
+    def __init__(self, host="127.0.0.1", port=0, config: FakeConfig = None):
+        self.config = config or FakeConfig()
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, obj, headers=None):
+                data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {k: v[0] for k, v in parse_qs(raw.decode("utf-8")).items()}
+                cfg = server.config
+                time.sleep(max(0.0, random.gauss(cfg.latency_ms, cfg.jitter_ms)) / 1000.0)
+
+                if url.path.startswith("/api/"):
+                    method = url.path[len("/api/"):]
+                    server._count(method)
+                    roll = random.random()
+                    if roll < cfg.ratelimit_rate:
+                        server._count(f"{method}:429")
+                        return self._reply(429, {"ok": False, "error": "ratelimited"},
+                                           {"Retry-After": str(cfg.retry_after)})
+                    if roll < cfg.ratelimit_rate + cfg.error_rate:
+                        server._count(f"{method}:500")
+                        return self._reply(500, {"ok": False, "error": "internal_error"})
+                    return self._reply(200, slack_response(method, params, body, cfg))
+                if url.path.startswith("/rest/api/"):
+                    server._count("jira" + url.path[len("/rest/api/2"):])
+                    if random.random() < cfg.error_rate:
+                        return self._reply(503, {"errorMessages": ["unavailable"]})
+                    status, obj = jira_response(url.path, body)
+                    return self._reply(status, obj)
+                return self._reply(404, {"ok": False, "error": "unknown_method"})
+
+            do_GET = _handle
+            do_POST = _handle
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    def _count(self, key):
+        with self._lock:
+            self.calls[key] += 1
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    @property
+    def slack_api_url(self):
+        return f"http://127.0.0.1:{self.port}/api"
+
+    @property
+    def jira_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, name="fake-slack", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="업스트림 평균 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="지연 표준편차(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="5xx 응답 비율 (0~1)")
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--members", type=int, default=2000, help="users.list 멤버 수")
+
+
+def config_from_args(args) -> FakeConfig:
+    return FakeConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        ratelimit_rate=args.ratelimit_rate,
+        retry_after=args.retry_after,
+        members=args.members,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    server = FakeSlackServer(args.host, args.port, config_from_args(args))
+    print(f"fake Slack API: {server.slack_api_url}  /  fake Jira: {server.jira_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
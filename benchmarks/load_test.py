@@ -0,0 +1,282 @@
+"""/slack/command, /slack/interactions 동시성 부하 테스트
+
+Slack_WebServer.app을 gunicorn(sync/gthread)으로, Slack_AsyncServer.app을 uvicorn(asgi)으로 띄우고, 업스트림은 benchmarks/fake_slack.py의 가짜 Slack/Jira 서버로 대체한다.
+라우트별 처리량과 p50/p95/p99 지연 시간을 측정해 JSON으로 저장한다.
+
+사용법:
+    python benchmarks/load_test.py --modes sync gthread asgi --concurrency 32 --duration 20 \\
+        --latency-ms 80 --ratelimit-rate 0.02 --output benchmarks/results/run.json
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_slack import FakeSlackServer, add_config_arguments, config_from_args  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORK_TYPES = [
+    "client_task", "planning_task", "qa_task", "character_task", "background_task", "concept_task",
+    "animation_task", "effect_task", "server_task", "ta_task", "test_task", "ui_task",
+]
+
+# 서빙 모드별 실행 명령 ({bind}, {port}, {workers}, {threads} 치환)
+SERVER_MODES = {
+    "sync": ["-m", "gunicorn", "-k", "sync", "-w", "{workers}", "-b", "{bind}", "Slack_WebServer:app"],
+    "gthread": ["-m", "gunicorn", "-k", "gthread", "-w", "{workers}", "--threads", "{threads}",
+                "-b", "{bind}", "Slack_WebServer:app"],
+    "asgi": ["-m", "uvicorn", "--workers", "{workers}", "--host", "127.0.0.1", "--port", "{port}",
+             "--no-access-log", "Slack_AsyncServer:app"],
+}
+
+
+def _user_id():
+    return f"U{random.randint(0, 1999):08d}"
+
+
+def _command(command, text=""):
+    return {
+        "command": command,
+        "text": text,
+        "user_id": _user_id(),
+        "user_name": "bench",
+        "channel_id": "C0BENCH01",
+        "trigger_id": f"{random.randint(10 ** 9, 10 ** 10)}.{uuid.uuid4().hex[:12]}",
+        "response_url": "http://127.0.0.1:9/response",
+    }
+
+
+def _submission(callback_id, values):
+    payload = {
+        "type": "view_submission",
+        "user": {"id": _user_id(), "name": "bench"},
+        "view": {
+            "id": "V" + uuid.uuid4().hex[:10].upper(),
+            "hash": uuid.uuid4().hex[:16],
+            "callback_id": callback_id,
+            "state": {"values": values},
+        },
+    }
+    return {"payload": json.dumps(payload, ensure_ascii=False)}
+
+
+def work_submission():
+    return _submission("work_create_modal", {
+        "work_type": {"work_type_select": {"selected_option": {"value": random.choice(WORK_TYPES)}}},
+        "title": {"title_input": {"value": f"벤치마크 업무 {random.randint(1, 10 ** 6)}"}},
+        "content": {"content_input": {"value": "부하 테스트용 업무 내용입니다.\n" * 3}},
+        "start_date": {"start_date_input": {"selected_date": "2026-11-02"}},
+        "end_date": {"end_date_input": {"selected_date": "2026-11-13"}},
+        "plan_url": {"plan_url_input": {"value": "https://example.com/plan"}},
+        "assignee": {"assignee_input": {"selected_user": _user_id()}},
+    })
+
+
+def meeting_submission():
+    return _submission("meeting_review_modal", {
+        "title": {"title_input": {"value": "기획 리뷰"}},
+        "assignee": {"assignee_input": {"selected_users": [_user_id() for _ in range(random.randint(1, 5))]}},
+        "document": {"document_input": {"value": "https://example.com/doc"}},
+        "content": {"content_input": {"value": "리뷰 부탁드립니다."}},
+    })
+
+
+def jira_submission():
+    return _submission("jira_issue_create_modal", {
+        "summary": {"summary_input": {"value": f"벤치마크 이슈 {random.randint(1, 10 ** 6)}"}},
+        "description": {"description_input": {"value": "부하 테스트용 이슈입니다."}},
+        "project": {"project_select": {"selected_option": {"value": random.choice(["PROJ", "GAME", "SRV"])}}},
+        "issuetype": {"issuetype_select": {"selected_option": {"value": random.choice(["Task", "Bug", "Story"])}}},
+    })
+
+
+def options_query():
+    action_id, queries = random.choice([
+        ("work_type_select", ["", "클", "qa", "서버", "anim"]),
+        ("project_select", ["", "g", "ga", "srv", "proj"]),
+        ("issuetype_select", ["", "t", "bu", "sto"]),
+    ])
+    payload = {"type": "block_suggestion", "action_id": action_id, "value": random.choice(queries),
+               "view": {"id": "V" + uuid.uuid4().hex[:10].upper(), "state": {"values": {}}}}
+    return {"payload": json.dumps(payload, ensure_ascii=False)}
+
+
+# (라우트 이름, 경로, 폼 생성 함수, 가중치)
+TRAFFIC = [
+    ("command:/create_new_work", "/slack/command", lambda: _command("/create_new_work"), 3),
+    ("command:/모임요청", "/slack/command", lambda: _command("/모임요청"), 1),
+    ("command:/jira_issue_create", "/slack/command", lambda: _command("/jira_issue_create"), 1),
+    ("submit:work_create_modal", "/slack/interactions", work_submission, 3),
+    ("submit:meeting_review_modal", "/slack/interactions", meeting_submission, 1),
+    ("submit:jira_issue_create_modal", "/slack/interactions", jira_submission, 1),
+    ("options", "/slack/options", options_query, 4),
+]
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * pct))]
+
+
+def summarize(samples: dict, elapsed: float) -> dict:
+    routes = {}
+    for route, entries in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in entries)
+        errors = sum(1 for _, ok in entries if not ok)
+        routes[route] = {
+            "requests": len(entries),
+            "errors": errors,
+            "throughput_rps": round(len(entries) / elapsed, 2),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        }
+    total = sum(r["requests"] for r in routes.values())
+    return {"total_requests": total, "throughput_rps": round(total / elapsed, 2), "routes": routes}
+
+
+def run_load(base_url: str, concurrency: int, duration: float, traffic=TRAFFIC) -> dict:
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    weights = [w for *_, w in traffic]
+    deadline = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        local = defaultdict(list)
+        while time.monotonic() < deadline:
+            route, path, make_form, _ = random.choices(traffic, weights)[0]
+            form = make_form()
+            started = time.perf_counter()
+            try:
+                response = session.post(base_url + path, data=form, timeout=30)
+                ok = response.status_code == 200 and b'"errors"' not in response.content
+            except requests.RequestException:
+                ok = False
+            local[route].append((time.perf_counter() - started, ok))
+        with lock:
+            for route, entries in local.items():
+                samples[route].extend(entries)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(samples, time.monotonic() - started)
+
+
+def wait_ready(base_url: str, timeout: float = 30) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(base_url + "/slack/worker/stats", timeout=1).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def start_server(mode: str, port: int, args, fake: FakeSlackServer, workdir: str) -> subprocess.Popen:
+    bind = f"127.0.0.1:{port}"
+    command = [sys.executable] + [
+        part.format(bind=bind, port=port, workers=args.workers, threads=args.threads) for part in SERVER_MODES[mode]
+    ]
+    env = dict(
+        os.environ,
+        SLACK_BOT_TOKEN="xoxb-benchmark",
+        SLACK_API_URL=fake.slack_api_url,
+        JIRA_URL=fake.jira_url,
+        JIRA_API_TOKEN="benchmark",
+        DATA_DIR=workdir,  # 리마인더 / 원장 등 나머지 저장소도 작업 디렉터리에 둔다
+        OUTBOX_PATH=os.path.join(workdir, f"outbox-{mode}.db"),
+        SHARED_CACHE_PATH=os.path.join(workdir, f"shared-cache-{mode}.db"),
+        PYTHONPATH=ROOT,
+        # 클라이언트 측 tier 제한은 끄고, 가짜 서버의 429 주입과 Retry-After 처리로 측정한다
+        SLACK_RATE_LIMIT_SCALE=str(args.rate_limit_scale),
+        CHANNEL_POST_RATE=str(args.channel_post_rate),
+    )
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL if not args.verbose else None,
+                            start_new_session=True)
+
+
+def stop_server(proc: subprocess.Popen):
+    # outbox 발송이 남아 있으면 graceful 종료가 길어지므로 잠시 기다린 뒤 워커까지 프로세스 그룹째 종료
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["sync", "gthread"], choices=sorted(SERVER_MODES))
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=15, help="모드별 측정 시간(초)")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn 워커 수")
+    parser.add_argument("--threads", type=int, default=8, help="gthread 워커당 스레드 수")
+    parser.add_argument("--port", type=int, default=8911, help="앱 서버 포트")
+    parser.add_argument("--rate-limit-scale", type=float, default=0, help="앱의 SLACK_RATE_LIMIT_SCALE (0=제한 없음)")
+    parser.add_argument("--channel-post-rate", type=float, default=1.0, help="앱의 CHANNEL_POST_RATE (채널당 초당 발송)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/<시각>.json)")
+    parser.add_argument("--verbose", action="store_true", help="앱 서버 로그 출력")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    fake = FakeSlackServer(config=config_from_args(args)).start()
+    results = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "verbose")},
+        "modes": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for index, mode in enumerate(args.modes):
+            port = args.port + index  # 이전 모드 서버의 소켓 정리를 기다리지 않도록 모드마다 다른 포트 사용
+            base_url = f"http://127.0.0.1:{port}"
+            proc = start_server(mode, port, args, fake, workdir)
+            try:
+                if not wait_ready(base_url):
+                    print(f"[{mode}] 서버 기동 실패")
+                    continue
+                fake.calls.clear()
+                print(f"[{mode}] {args.duration}s 동안 동시 {args.concurrency} 클라이언트로 측정 중...")
+                summary = run_load(base_url, args.concurrency, args.duration)
+                summary["upstream_calls"] = dict(fake.calls)
+                results["modes"][mode] = summary
+                print(f"[{mode}] 총 {summary['total_requests']}건, {summary['throughput_rps']} req/s")
+                for route, stats in summary["routes"].items():
+                    print(f"    {route:<32} n={stats['requests']:<6} err={stats['errors']:<4} "
+                          f"p50={stats['p50_ms']:>8.1f}ms p95={stats['p95_ms']:>8.1f}ms p99={stats['p99_ms']:>8.1f}ms")
+            finally:
+                stop_server(proc)
+    fake.stop()
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
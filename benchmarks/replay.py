@@ -0,0 +1,210 @@
+"""캡처한 요청(CAPTURE_PATH JSONL)을 시간 간격을 유지하며 다시 보내는 회귀 벤치마크
+
+Slack_WebServer.app을 gunicorn으로 띄우고(또는 --url로 이미 떠 있는 서버를 지정), 업스트림은
+benchmarks/fake_slack.py의 가짜 Slack/Jira 서버로 대체한다. 원래 도착 간격을 --speed 배로 줄여 보내며
+(0이면 간격 없이 최대 속도) 라우트별 지연 시간과 스케줄 지연(예정 시각보다 늦게 보낸 시간)을 측정한다.
+--baseline으로 이전 결과를 주면 p95가 --max-regression(%) 넘게 늘어난 라우트가 있을 때 종료 코드 1.
+
+사용법:
+    CAPTURE_PATH=capture.jsonl gunicorn ... Slack_WebServer:app      # 운영에서 캡처
+    python benchmarks/replay.py capture.jsonl --speed 10 --output benchmarks/results/replay.json
+    python benchmarks/replay.py capture.jsonl --speed 0 --baseline benchmarks/results/replay.json
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_slack import FakeSlackServer, add_config_arguments, config_from_args  # noqa: E402
+from load_test import ROOT, SERVER_MODES, percentile, start_server, stop_server, summarize, wait_ready  # noqa: E402
+
+sys.path.insert(0, ROOT)
+
+from Slack_Capture import load  # noqa: E402
+
+
+def prepare(entry: dict, run_id: str):
+    """캡처 한 줄 → (라우트 이름, 경로, 보낼 form). 멱등성 키에 걸리지 않도록 trigger_id / view hash를 바꾼다."""
+    form = dict(entry["form"])
+    payload = form.get("payload")
+    if isinstance(payload, dict):
+        payload = dict(payload)
+        if payload.get("trigger_id"):
+            payload["trigger_id"] = f"{payload['trigger_id']}.{run_id}"
+        view = payload.get("view")
+        if isinstance(view, dict):
+            payload["view"] = view = dict(view, hash=f"{view.get('hash', '')}{run_id}")
+        name = (view or {}).get("callback_id") if payload.get("type") == "view_submission" else payload.get("type")
+        form["payload"] = json.dumps(payload, ensure_ascii=False)
+        return f"submit:{name}", entry["path"], form
+    if form.get("trigger_id"):
+        form["trigger_id"] = f"{form['trigger_id']}.{run_id}"
+    return f"command:{form.get('command')}", entry["path"], form
+
+
+def replay(base_url: str, entries: list, speed: float, concurrency: int) -> dict:
+    """entries를 원래 간격 / speed 로 보낸다. 동시 요청은 최대 concurrency개."""
+    samples = defaultdict(list)
+    lags = []
+    lock = threading.Lock()
+    work = queue.Queue()
+    run_id = uuid.uuid4().hex[:8]
+
+    def client():
+        session = requests.Session()
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            (route, path, form), due = item
+            started = time.perf_counter()
+            try:
+                response = session.post(base_url + path, data=form, timeout=30)
+                ok = response.status_code == 200 and b'"errors"' not in response.content
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                samples[route].append((elapsed, ok))
+                lags.append(max(0.0, started - due))
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    first_ts = entries[0]["ts"] if entries else 0.0
+    started = time.perf_counter()
+    for entry in entries:
+        due = started + (entry["ts"] - first_ts) / speed if speed > 0 else time.perf_counter()
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        work.put((prepare(entry, run_id), due))
+    for _ in threads:
+        work.put(None)
+    for t in threads:
+        t.join()
+    summary = summarize(samples, time.perf_counter() - started)
+    lags.sort()
+    summary["schedule_lag_ms"] = {
+        "p50": round(percentile(lags, 0.50) * 1000, 2),
+        "p95": round(percentile(lags, 0.95) * 1000, 2),
+        "max": round(lags[-1] * 1000, 2) if lags else 0.0,
+    }
+    return summary
+
+
+def recorded_latency(entries: list) -> dict:
+    """캡처 당시(운영) 서버 처리 시간 — 재생 결과와 비교용"""
+    by_route = defaultdict(list)
+    for entry in entries:
+        by_route[prepare(entry, "")[0]].append(entry.get("elapsed_ms", 0.0))
+    result = {}
+    for route, values in sorted(by_route.items()):
+        values.sort()
+        result[route] = {"requests": len(values), "p50_ms": percentile(values, 0.50), "p95_ms": percentile(values, 0.95)}
+    return result
+
+
+def regressions(summary: dict, baseline: dict, max_regression: float) -> list:
+    """baseline보다 p95가 max_regression(%) 넘게 늘어난 라우트 목록"""
+    found = []
+    for route, stats in summary["routes"].items():
+        before = baseline.get("routes", {}).get(route)
+        if not before or not before.get("p95_ms"):
+            continue
+        change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        if change > max_regression:
+            found.append((route, before["p95_ms"], stats["p95_ms"], round(change, 1)))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="CAPTURE_PATH로 남긴 JSONL 파일")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (1=원래 간격, 10=10배 빠르게, 0=최대 속도)")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 요청 수 상한")
+    parser.add_argument("--url", default=None, help="이미 떠 있는 서버 주소 (지정하지 않으면 gunicorn으로 직접 띄운다)")
+    parser.add_argument("--mode", default="gthread", choices=sorted(SERVER_MODES), help="서버 실행 방식")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn 워커 수")
+    parser.add_argument("--threads", type=int, default=8, help="gthread 워커당 스레드 수")
+    parser.add_argument("--port", type=int, default=8931, help="앱 서버 포트")
+    parser.add_argument("--rate-limit-scale", type=float, default=0, help="앱의 SLACK_RATE_LIMIT_SCALE (0=제한 없음)")
+    parser.add_argument("--channel-post-rate", type=float, default=1.0, help="앱의 CHANNEL_POST_RATE (채널당 초당 발송)")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 replay 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="허용하는 p95 증가율(%%)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/replay-<시각>.json)")
+    parser.add_argument("--verbose", action="store_true", help="앱 서버 로그 출력")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    entries = load(args.capture)
+    if not entries:
+        print(f"재생할 요청이 없습니다: {args.capture}")
+        return 1
+    span = entries[-1]["ts"] - entries[0]["ts"]
+    print(f"{len(entries)}건, 원래 {span:.1f}s 구간 → "
+          + (f"{span / args.speed:.1f}s로 재생" if args.speed > 0 else "최대 속도로 재생"))
+
+    fake = proc = None
+    with tempfile.TemporaryDirectory() as workdir:
+        base_url = args.url
+        if base_url is None:
+            # --url 서버는 이미 자체 업스트림(가짜 서버 등)을 쓰고 있다고 본다
+            fake = FakeSlackServer(config=config_from_args(args)).start()
+            base_url = f"http://127.0.0.1:{args.port}"
+            proc = start_server(args.mode, args.port, args, fake, workdir)
+        try:
+            if not wait_ready(base_url):
+                print("서버 기동 실패")
+                return 1
+            if fake is not None:
+                fake.calls.clear()
+            summary = replay(base_url, entries, args.speed, args.concurrency)
+            if fake is not None:
+                summary["upstream_calls"] = dict(fake.calls)
+        finally:
+            if proc is not None:
+                stop_server(proc)
+            if fake is not None:
+                fake.stop()
+
+    summary["recorded"] = recorded_latency(entries)
+    results = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "verbose", "baseline")},
+        **summary,
+    }
+    print(f"총 {summary['total_requests']}건, {summary['throughput_rps']} req/s, "
+          f"스케줄 지연 p95={summary['schedule_lag_ms']['p95']}ms")
+    for route, stats in summary["routes"].items():
+        print(f"    {route:<32} n={stats['requests']:<6} err={stats['errors']:<4} "
+              f"p50={stats['p50_ms']:>8.1f}ms p95={stats['p95_ms']:>8.1f}ms p99={stats['p99_ms']:>8.1f}ms")
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", "replay-" + time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            found = regressions(summary, json.load(f), args.max_regression)
+        for route, before, after, change in found:
+            print(f"    회귀: {route} p95 {before}ms → {after}ms (+{change}%)")
+        if found:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fake_slack import FakeConfig, FakeSlackServer  # noqa: E402
+
+# Slack_Config 등은 import 시 환경 변수를 읽으므로, 테스트 모듈을 불러오기 전에 가짜 서버를 띄우고 설정한다
+_FAKE_SLACK = FakeSlackServer(config=FakeConfig(latency_ms=1, jitter_ms=0, members=20)).start()
+os.environ.update({
+    "SLACK_BOT_TOKEN": "xoxb-test",
+    "SLACK_API_URL": _FAKE_SLACK.slack_api_url,
+    "SLACK_SIGNING_SECRET": "test-secret",
+    "SLACK_RATE_LIMIT_SCALE": "0",
+    "OUTBOX_ENABLED": "0",
+    "REMINDER_ENABLED": "0",
+    "LEDGER_ENABLED": "0",
+    "SHARED_CACHE_PATH": "",
+    "IDEMPOTENCY_DB": "",
+})
+os.environ.pop("CAPTURE_PATH", None)
+os.environ.pop("JIRA_URL", None)
+
+
+@pytest.fixture(scope="session")
+def fake_slack():
+    """로컬 가짜 Slack 서버 (benchmarks/fake_slack.py)"""
+    yield _FAKE_SLACK
+    _FAKE_SLACK.stop()
+
+
+@pytest.fixture(scope="session")
+def web_server(fake_slack):
+    """가짜 Slack에 붙은 Slack_WebServer 모듈 (디스크 저장소 없이). import 시 설정을 읽으므로 세션당 한 번만 불러온다."""
+    import Slack_WebServer
+    yield Slack_WebServer
+    # 백그라운드 처리를 끝내고 종료한다 (pytest 출력 캡처가 닫힌 뒤 로그를 쓰지 않도록)
+    Slack_WebServer.submission_pool.join()
+
+
+class ScriptedServer:
+    """요청마다 script에서 (status, headers, 지연 초[, 본문])을 하나씩 꺼내 응답하는 서버 (다 쓰면 200 {"ok": true})"""
+
+    def __init__(self):
+        self.script = []
+        self.calls = 0
+        scripted = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                scripted.calls += 1
+                entry = scripted.script.pop(0) if scripted.script else (200, {}, 0)
+                status, headers, delay = entry[:3]
+                time.sleep(delay)
+                data = json.dumps(entry[3] if len(entry) > 3 else {"ok": status == 200}).encode()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _handle
+            do_POST = _handle
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def url(self):
+        return f"{self.base_url}/api"
+
+
+@pytest.fixture
+def scripted():
+    """응답을 순서대로 지정하는 Slack / Jira 대역 서버"""
+    server = ScriptedServer()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
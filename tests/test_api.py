@@ -0,0 +1,105 @@
+import socket
+import time
+
+import pytest
+
+from Slack_Api import RateLimiter, SlackApiClient
+
+
+def test_burst_is_available_immediately():
+    limiter = RateLimiter(per_minute=60, burst=3)
+    started = time.monotonic()
+    assert all(limiter.acquire(max_wait=0) for _ in range(3))
+    assert time.monotonic() - started < 0.05
+
+
+def test_reservation_over_max_wait_is_cancelled():
+    limiter = RateLimiter(per_minute=60, burst=1)
+    assert limiter.acquire(max_wait=0)
+    # 다음 토큰은 약 1초 뒤 → 예약을 취소하고 바로 실패한다 (대기하지 않는다)
+    started = time.monotonic()
+    for _ in range(5):
+        assert not limiter.acquire(max_wait=0.1)
+    assert time.monotonic() - started < 0.05
+    # 취소한 예약이 빚으로 남지 않았으면 1초 뒤에는 바로 토큰을 얻는다
+    time.sleep(1.05)
+    assert limiter.acquire(max_wait=0)
+
+
+def test_acquire_waits_for_the_next_token():
+    limiter = RateLimiter(per_minute=600, burst=1)  # 0.1초마다 1개
+    assert limiter.acquire()
+    started = time.monotonic()
+    assert limiter.acquire(max_wait=1)
+    assert time.monotonic() - started == pytest.approx(0.1, abs=0.05)
+
+
+def test_block_for_pauses_even_unlimited_methods():
+    limiter = RateLimiter(per_minute=float("inf"))
+    assert limiter.acquire(max_wait=0)
+    limiter.block_for(0.5)
+    assert not limiter.acquire(max_wait=0.1)
+    time.sleep(0.5)
+    assert limiter.acquire(max_wait=0)
+
+
+def make_client(url, **kwargs):
+    options = {"max_retries": 2, "backoff_base": 0.01, "rate_limit_scale": 0}
+    options.update(kwargs)
+    return SlackApiClient("xoxb-test", base_url=url, **options)
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_post_message_is_not_retried_after_5xx(scripted, status):
+    scripted.script = [(status, {}, 0)]
+    result = make_client(scripted.url).call("chat.postMessage", {"channel": "C1", "text": "hi"})
+    assert result == {"ok": False, "error": f"uncertain: http_{status}"}
+    assert scripted.calls == 1
+
+
+def test_post_message_is_not_retried_after_read_timeout(scripted):
+    scripted.script = [(200, {}, 0.5)]
+    client = make_client(scripted.url, timeout=(1, 0.2))
+    result = client.call("chat.postMessage", {"channel": "C1", "text": "hi"})
+    assert result == {"ok": False, "error": "uncertain: ReadTimeout"}
+    assert scripted.calls == 1
+
+
+def test_post_message_is_retried_when_the_connection_was_refused():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    result = make_client(f"http://127.0.0.1:{port}/api").call("chat.postMessage", {"channel": "C1"})
+    assert result == {"ok": False, "error": "request_failed: ConnectionError"}
+
+
+def test_posts_are_retried_after_429_with_a_malformed_retry_after(scripted):
+    scripted.script = [(429, {"Retry-After": "soon"}, 0)]
+    client = make_client(scripted.url)
+    started = time.monotonic()
+    assert client.call("chat.postEphemeral", {"channel": "C1", "user": "U1"}) == {"ok": True}
+    assert scripted.calls == 2
+    assert time.monotonic() - started >= 0.9  # 기본값 1초를 기다린다
+
+
+def test_post_message_429_is_returned_to_the_channel_scheduler(scripted):
+    """채널별 제한이므로 메서드 전체를 멈추지 않고 Retry-After를 돌려준다 (다른 채널 발송은 바로 나간다)"""
+    scripted.script = [(429, {"Retry-After": "3"}, 0)]
+    client = make_client(scripted.url)
+    assert client.call("chat.postMessage", {"channel": "C1"}) == {"ok": False, "error": "ratelimited", "retry_after": 3.0}
+    started = time.monotonic()
+    assert client.call("chat.postMessage", {"channel": "C2"}) == {"ok": True}
+    assert time.monotonic() - started < 0.5
+    assert scripted.calls == 2
+
+
+def test_idempotent_methods_are_retried_after_5xx(scripted):
+    scripted.script = [(503, {}, 0), (500, {}, 0)]
+    assert make_client(scripted.url).call("users.list", http_method="GET") == {"ok": True}
+    assert scripted.calls == 3
+
+
+def test_idempotent_override_allows_retrying_a_post(scripted):
+    scripted.script = [(503, {}, 0)]
+    assert make_client(scripted.url).call("chat.postMessage", {"channel": "C1"}, idempotent=True) == {"ok": True}
+    assert scripted.calls == 2
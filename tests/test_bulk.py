@@ -0,0 +1,100 @@
+import pytest
+
+from Slack_Bulk import (
+    MAX_LISTED, MAX_ROWS, format_errors, group_by_channel, parse_rows, resolve_assignee, resolve_work_type,
+    summary_text, validate_rows,
+)
+from Slack_Config import CHANNEL_MAP
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("client_task", "client_task"),
+    ("Client", "client_task"),
+    (" 클라 ", "client_task"),
+    ("기획", "planning_task"),
+    ("없는부서", None),
+    ("", None),
+])
+def test_resolve_work_type(value, expected):
+    assert resolve_work_type(value) == expected
+
+
+def test_resolve_assignee():
+    names = {"hong": "U00000009"}
+    assert resolve_assignee("<@U12345678|hong>") == "U12345678"
+    assert resolve_assignee("U12345678") == "U12345678"
+    assert resolve_assignee("@Hong", names) == "U00000009"
+    assert resolve_assignee("@hong") is None  # 이름 목록 없이는 멘션 / id만
+    assert resolve_assignee("kim", names) is None
+
+
+def test_parse_rows_detects_tsv_and_skips_header_and_blank_lines():
+    text = "업무유형\t제목\t시작일\t종료일\t담당자\n\n클라\t로그인\t\t\tU12345678\n"
+    assert parse_rows(text) == [(3, ["클라", "로그인", "", "", "U12345678"], "클라\t로그인\t\t\tU12345678")]
+
+
+def test_parse_rows_csv_keeps_quoted_commas():
+    rows = parse_rows('클라,"제목, 쉼표",2025-01-01,2025-01-02,U12345678')
+    assert rows[0][1][1] == "제목, 쉼표"
+
+
+def test_validate_rows_builds_bulk_rows():
+    text = "클라,로그인,2025-01-01,2025-01-09,<@U12345678>,내용,https://plan\n기획,기획서,,,U87654321"
+    rows, errors = validate_rows(text)
+    assert errors == []
+    first, second = rows
+    assert (first.line, first.work_type, first.period, first.assignee_user_id, first.content, first.plan_url) == (
+        1, "client_task", "2025-01-01 ~ 2025-01-09", "U12345678", "내용", "https://plan")
+    assert (second.work_type, second.period, second.content) == ("planning_task", "기간 미설정", "")
+
+
+@pytest.mark.parametrize("line, message", [
+    ("클라,제목,,", "열이 부족합니다"),
+    ("없는부서,제목,,,U12345678", "알 수 없는 업무유형"),
+    ("클라,,,,U12345678", "제목이 비어 있습니다"),
+    ("클라,제목,2025-01-01,,U12345678", "YYYY-MM-DD"),
+    ("클라,제목,2025/01/01,2025-01-02,U12345678", "YYYY-MM-DD"),
+    ("클라,제목,2025-01-09,2025-01-01,U12345678", "종료일이 시작일보다 빠릅니다"),
+    ("클라,제목,,,누구", "담당자를 찾을 수 없습니다"),
+])
+def test_validate_rows_reports_line_errors(line, message):
+    rows, errors = validate_rows(f"클라,정상,,,U12345678\n{line}")
+    assert [row.title for row in rows] == ["정상"]
+    assert len(errors) == 1
+    assert errors[0][0] == 2
+    assert message in errors[0][1]
+
+
+def test_validate_rows_collects_all_problems_of_a_line():
+    _, errors = validate_rows("없는부서,,,,누구")
+    message = errors[0][1]
+    assert "알 수 없는 업무유형" in message and "제목이 비어 있습니다" in message and "담당자를 찾을 수 없습니다" in message
+
+
+def test_validate_rows_limits():
+    assert validate_rows("")[1] == [(0, "입력된 업무가 없습니다")]
+    too_many = "\n".join(["클라,제목,,,U12345678"] * (MAX_ROWS + 1))
+    rows, errors = validate_rows(too_many)
+    assert rows == [] and str(MAX_ROWS) in errors[0][1]
+
+
+def test_group_by_channel_keeps_input_order():
+    rows, _ = validate_rows("클라,a,,,U12345678\n기획,b,,,U12345678\n클라,c,,,U12345678")
+    groups = group_by_channel(rows)
+    assert [row.title for row in groups[CHANNEL_MAP["client_task"]]] == ["a", "c"]
+    assert [row.title for row in groups[CHANNEL_MAP["planning_task"]]] == ["b"]
+
+
+def test_format_errors_caps_the_list():
+    errors = [(n, "오류") for n in range(1, MAX_LISTED + 6)]
+    text = format_errors(errors)
+    assert text.count("번째 줄") == MAX_LISTED
+    assert text.endswith("외 5건")
+
+
+def test_summary_text_attaches_failed_source_lines():
+    rows, _ = validate_rows("클라,a,,,U12345678\n클라,b,,,U12345678")
+    text = summary_text([(rows[0], {"ok": True}), (rows[1], {"ok": False, "error": "channel_not_found"})])
+    assert "성공 1건 / 실패 1건" in text
+    assert "2번째 줄 b: channel_not_found" in text
+    assert text.endswith("```클라,b,,,U12345678```")
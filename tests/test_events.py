@@ -0,0 +1,98 @@
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from Slack_Events import handle_envelope, verify_signature
+
+
+class Directory:
+    def __init__(self):
+        self.calls = []
+
+    def upsert(self, user):
+        self.calls.append(("upsert", user["id"]))
+
+    def join_channel(self, channel, user):
+        self.calls.append(("join", channel, user))
+
+    def leave_channel(self, channel, user):
+        self.calls.append(("leave", channel, user))
+
+
+def sign(secret, body: bytes, timestamp=None):
+    timestamp = str(int(timestamp or time.time()))
+    digest = hmac.new(secret.encode(), b"v0:" + timestamp.encode() + b":" + body, hashlib.sha256).hexdigest()
+    return {"X-Slack-Request-Timestamp": timestamp, "X-Slack-Signature": f"v0={digest}"}
+
+
+def test_verify_signature_rejects_tampering_and_old_timestamps():
+    body = b'{"type":"event_callback"}'
+    headers = sign("s", body)
+    assert verify_signature("s", headers["X-Slack-Request-Timestamp"], body, headers["X-Slack-Signature"])
+    assert not verify_signature("s", headers["X-Slack-Request-Timestamp"], body + b" ", headers["X-Slack-Signature"])
+    old = sign("s", body, time.time() - 600)
+    assert not verify_signature("s", old["X-Slack-Request-Timestamp"], body, old["X-Slack-Signature"])
+
+
+@pytest.mark.parametrize("event, call", [
+    ({"type": "user_change", "user": {"id": "U1"}}, ("upsert", "U1")),
+    ({"type": "team_join", "user": {"id": "U2"}}, ("upsert", "U2")),
+    ({"type": "member_joined_channel", "channel": "C1", "user": "U1"}, ("join", "C1", "U1")),
+    ({"type": "member_left_channel", "channel": "C1", "user": "U1"}, ("leave", "C1", "U1")),
+])
+def test_member_events_are_applied(event, call):
+    directory = Directory()
+    assert handle_envelope(directory, {"type": "event_callback", "event": event}) == (200, None)
+    assert directory.calls == [call]
+
+
+def test_malformed_events_are_ignored_or_rejected():
+    directory = Directory()
+    assert handle_envelope(directory, {"type": "event_callback", "event": "x"}) == (400, None)
+    assert handle_envelope(directory, {"type": "event_callback", "event": {"type": "member_joined_channel"}}) == (200, None)
+    assert handle_envelope(directory, [1]) == (400, None)
+    assert directory.calls == []
+
+
+@pytest.fixture
+def post_event(web_server):
+    client = web_server.app.test_client()
+
+    def post(envelope, headers=None):
+        body = json.dumps(envelope).encode() if not isinstance(envelope, bytes) else envelope
+        return client.post("/slack/events", data=body, content_type="application/json",
+                           headers=sign("test-secret", body) if headers is None else headers)
+
+    return post
+
+
+def test_events_endpoint_answers_url_verification(post_event):
+    response = post_event({"type": "url_verification", "challenge": "abc"})
+    assert response.status_code == 200
+    assert response.get_json() == {"challenge": "abc"}
+
+
+def test_events_endpoint_rejects_unsigned_requests(post_event):
+    assert post_event({"type": "url_verification", "challenge": "abc"}, headers={}).status_code == 401
+
+
+def test_events_endpoint_is_closed_without_a_signing_secret(web_server, post_event, monkeypatch):
+    monkeypatch.setattr(web_server, "SLACK_SIGNING_SECRET", "")
+    assert post_event({"type": "url_verification", "challenge": "abc"}).status_code == 404
+
+
+@pytest.mark.parametrize("body", [b"[1]", b"not json", json.dumps({"type": "event_callback", "event": "x"}).encode()])
+def test_events_endpoint_returns_400_for_malformed_bodies(post_event, body):
+    assert post_event(body).status_code == 400
+
+
+def test_events_endpoint_tracks_channel_membership(web_server, post_event):
+    event = {"type": "member_joined_channel", "channel": "CEVENTS", "user": "U1"}
+    assert post_event({"type": "event_callback", "event": event}).status_code == 200
+    assert web_server.member_directory.channel_members("CEVENTS") == {"U1"}
+    event["type"] = "member_left_channel"
+    assert post_event({"type": "event_callback", "event": event}).status_code == 200
+    assert web_server.member_directory.channel_members("CEVENTS") == set()
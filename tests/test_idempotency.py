@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from Slack_Idempotency import (
+    DONE, NEW, PENDING, CachedResponse, IdempotencyCache, command_key, interaction_key, should_store,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    return IdempotencyCache(ttl=60, path=str(tmp_path / "idempotency.db") if request.param == "sqlite" else None)
+
+
+def test_command_key_uses_team_and_trigger_id():
+    assert command_key({"team_id": "T1", "trigger_id": "123.456"}) == "cmd:T1:123.456"
+    assert command_key({"team_id": "T1"}) is None
+
+
+def test_interaction_key_uses_view_id_and_hash_for_submissions():
+    submission = {"type": "view_submission", "trigger_id": "t1", "view": {"id": "V1", "hash": "h1"}}
+    assert interaction_key(submission) == "view:V1:h1"
+    assert interaction_key({"type": "block_actions", "trigger_id": "t1"}) == "act:t1"
+    assert interaction_key({"type": "block_actions"}) is None
+
+
+def test_begin_complete_returns_cached_response(cache):
+    response = CachedResponse(200, b'{"response_action":"clear"}', "application/json")
+    assert cache.begin("k") == (NEW, None)
+    assert cache.begin("k") == (PENDING, None)
+    cache.complete("k", response)
+    assert cache.begin("k") == (DONE, response)
+
+
+def test_release_lets_the_key_be_processed_again(cache):
+    assert cache.begin("k")[0] == NEW
+    cache.release("k")
+    assert cache.begin("k")[0] == NEW
+
+
+def test_shared_store_is_seen_by_other_workers(tmp_path):
+    path = str(tmp_path / "idempotency.db")
+    first, second = IdempotencyCache(path=path), IdempotencyCache(path=path)
+    assert first.begin("k")[0] == NEW
+    assert second.begin("k")[0] == PENDING
+    first.complete("k", CachedResponse(200, b"", "text/plain"))
+    assert second.begin("k") == (DONE, CachedResponse(200, b"", "text/plain"))
+
+
+@pytest.mark.parametrize("status, body, expected", [
+    (200, b"", True),
+    (200, b'{"response_action":"clear"}', True),
+    (200, b'{"response_type":"ephemeral","text":"ok"}', True),
+    (200, b'{"response_action":"errors","errors":{"title":"x"}}', False),
+    (500, b"", False),
+    (503, b'{"response_action":"clear"}', False),
+])
+def test_should_store(status, body, expected):
+    assert should_store(status, body) is expected
+
+
+def _bulk_submission(rows_text):
+    payload = {
+        "type": "view_submission",
+        "user": {"id": "U00000002"},
+        "view": {"id": "V1", "hash": "h1", "callback_id": "work_bulk_create_modal",
+                 "state": {"values": {"rows": {"rows_input": {"value": rows_text}}}}},
+    }
+    return {"payload": json.dumps(payload)}
+
+
+def test_corrected_resubmission_is_not_answered_from_cache(web_server):
+    """입력 오류 응답은 저장하지 않으므로, 같은 view.id + hash로 고쳐 낸 제출은 다시 처리된다."""
+    client = web_server.app.test_client()
+    first = client.post("/slack/interactions", data=_bulk_submission("없는부서,제목,,,U00000003"))
+    assert first.json["response_action"] == "errors"
+    corrected = client.post("/slack/interactions", data=_bulk_submission("클라,제목,,,U00000003"))
+    assert corrected.json == {"response_action": "clear"}
+    # 성공 응답은 저장되어 Slack 재시도에는 같은 응답을 돌려준다
+    retry = client.post("/slack/interactions", data=_bulk_submission("클라,제목,,,U00000003"),
+                        headers={"X-Slack-Retry-Num": "1"})
+    assert retry.json == {"response_action": "clear"}
+    assert web_server.idempotency.hits >= 1
@@ -0,0 +1,111 @@
+import socket
+
+import pytest
+
+from fake_slack import FakeConfig, FakeSlackServer
+from Slack_Jira import CreateMetaIndex, JiraClient
+
+
+def make_client(url, **kwargs):
+    options = {"max_retries": 3, "backoff_base": 0.01}
+    options.update(kwargs)
+    return JiraClient(url, "token", **options)
+
+
+def test_create_issue_against_the_fake_jira(fake_slack):
+    result = make_client(fake_slack.jira_url).create_issue("PROJ", "Task", "로그인 오류")
+    assert result["ok"]
+    assert result["key"].startswith("PROJ-")
+    assert result["url"] == f"{fake_slack.jira_url}/browse/{result['key']}"
+
+
+def test_validation_errors_are_final(fake_slack):
+    result = make_client(fake_slack.jira_url).create_issue("PROJ", "Epic", "")
+    assert result["error"] == "http_400"
+    assert "summary" in result["detail"] and "issuetype" in result["detail"]
+    assert not result["retryable"] and not result["uncertain"]
+
+
+def test_5xx_on_create_is_not_retried():
+    server = FakeSlackServer(config=FakeConfig(latency_ms=1, jitter_ms=0, error_rate=1.0)).start()
+    try:
+        result = make_client(server.jira_url).create_issue("PROJ", "Task", "s")
+        assert server.calls["jira/issue"] == 1
+    finally:
+        server.stop()
+    assert result["error"] == "http_503"
+    assert result["uncertain"] and not result["retryable"]
+
+
+def test_read_timeout_on_create_is_uncertain(scripted):
+    scripted.script = [(201, {}, 0.5, {"key": "PROJ-1"})]
+    result = make_client(scripted.base_url, timeout=(1, 0.2)).create_issue("PROJ", "Task", "s")
+    assert scripted.calls == 1
+    assert result["error"] == "response_lost"
+    assert result["uncertain"] and not result["retryable"]
+
+
+def test_429_on_create_is_retried(scripted):
+    scripted.script = [(429, {"Retry-After": "0"}, 0), (429, {"Retry-After": "bad"}, 0),
+                       (201, {}, 0, {"key": "PROJ-7"})]
+    result = make_client(scripted.base_url).create_issue("PROJ", "Task", "s")
+    assert scripted.calls == 3
+    assert result["ok"] and result["key"] == "PROJ-7"
+
+
+def test_refused_connection_is_retryable():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    result = make_client(f"http://127.0.0.1:{port}", max_retries=1).create_issue("PROJ", "Task", "s")
+    assert result["error"] == "request_failed"
+    assert result["retryable"] and not result["uncertain"]
+
+
+def test_idempotent_requests_are_retried_after_5xx(scripted):
+    scripted.script = [(503, {}, 0), (200, {}, 0, {"projects": []})]
+    status, result = make_client(scripted.base_url).request("GET", "/rest/api/2/issue/createmeta")
+    assert (status, result) == (200, {"projects": []})
+    assert scripted.calls == 2
+
+
+@pytest.fixture
+def meta(fake_slack):
+    index = CreateMetaIndex(make_client(fake_slack.jira_url).createmeta)
+    assert index.refresh()
+    return index
+
+
+def test_createmeta_index_normalizes_project_and_issue_type(meta):
+    assert meta.validate(" proj ", "bug") == ("PROJ", "Bug", {})
+
+
+def test_createmeta_index_rejects_unknown_values(meta):
+    _, _, errors = meta.validate("NOPE", "Task")
+    assert list(errors) == ["project"] and "GAME" in errors["project"]
+    _, _, errors = meta.validate("GAME", "Epic")
+    assert list(errors) == ["issuetype"] and "Story" in errors["issuetype"]
+
+
+def test_createmeta_index_passes_input_through_until_loaded():
+    def fail():
+        raise RuntimeError("down")
+
+    index = CreateMetaIndex(fail, cold_wait=0.1)
+    assert index.validate(" proj ", " Task ") == ("PROJ", "Task", {})
+
+
+def test_process_jira_issue_notifies_when_there_is_no_outbox(web_server, monkeypatch):
+    class Client:
+        def create_issue(self, *args):
+            return {"ok": False, "error": "request_failed", "detail": "request_failed: ConnectionError",
+                    "retryable": True, "uncertain": False}
+
+    sent = []
+    monkeypatch.setattr(web_server, "jira_client", Client())
+    monkeypatch.setattr(web_server, "post_message", lambda payload, coalesce=None: sent.append(payload) or {"ok": True})
+    assert web_server.process_jira_issue("PROJ", "Task", "s", "", "U1")["ok"]
+    assert [payload["channel"] for payload in sent] == ["U1"]
+    # outbox에서 부른 경우는 재시도에 맡기고 알리지 않는다
+    assert web_server.process_jira_issue("PROJ", "Task", "s", "", "U1", retry_later=True)["retryable"]
+    assert len(sent) == 1
@@ -0,0 +1,103 @@
+import sqlite3
+import time
+
+import pytest
+
+from Slack_Ledger import (
+    MEETING, NO_END_DATE, SECTION_LIMIT, TITLE_LIMIT, TaskLedger, ledger_command, parse_page, parse_team,
+    tasks_response,
+)
+
+TODAY = "2025-06-01"
+FUTURE = "2025-06-01 ~ 2999-12-30"  # 오늘 날짜로 조회하는 커맨드 테스트용
+
+
+def work(title, assignee="U1", period="2025-06-01 ~ 2025-06-30", work_type="client_task"):
+    return {"kind": "work", "work_type": work_type, "title": title, "assignee_user_id": assignee, "period": period,
+            "channel": "C1", "ts": "1700000000.000100"}
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return TaskLedger(str(tmp_path / "ledger.db"), page_size=3)
+
+
+def test_query_orders_by_end_date_and_pages(ledger):
+    ledger.record([work(f"t{day:02d}", period=f"2025-06-01 ~ 2025-06-{day:02d}") for day in (9, 3, 7, 5, 1)])
+    ledger.record([work("other", assignee="U2")])
+    first, total = ledger.query("assignee", "U1", 1, today=TODAY)
+    second, _ = ledger.query("assignee", "U1", 2, today=TODAY)
+    assert total == 5
+    assert [task["title"] for task in first] == ["t01", "t03", "t05"]
+    assert [task["title"] for task in second] == ["t07", "t09"]
+    assert ledger.query("assignee", "U1", 3, today=TODAY) == ([], 5)
+
+
+def test_query_skips_finished_tasks(ledger):
+    ledger.record([work("old", period="2025-05-01 ~ 2025-05-31"), work("current")])
+    tasks, total = ledger.query("assignee", "U1", today=TODAY)
+    assert total == 1 and tasks[0]["title"] == "current"
+
+
+def test_undated_tasks_come_last_and_expire(ledger):
+    ledger.record([work("undated", period="기간 미설정"), work("dated")])
+    tasks, _ = ledger.query("assignee", "U1", today=TODAY)
+    assert [(task["title"], task["end_date"]) for task in tasks] == [("dated", "2025-06-30"),
+                                                                     ("undated", NO_END_DATE)]
+    conn = sqlite3.connect(ledger.path)
+    conn.execute("UPDATE tasks SET created_at = ? WHERE title = 'undated'",
+                 (time.time() - (ledger.undated_days + 1) * 86400,))
+    conn.commit()
+    assert ledger.query("assignee", "U1", today=TODAY)[1] == 1
+
+
+def test_query_by_work_type_includes_meetings(ledger):
+    ledger.record([work("a", work_type="qa_task"), work("b", assignee="U2", work_type="qa_task")])
+    ledger.record([{"kind": MEETING, "work_type": MEETING, "title": "리뷰", "assignee_user_id": "U3"}])
+    assert ledger.query("work_type", "qa_task", today=TODAY)[1] == 2
+    meetings, total = ledger.query("work_type", MEETING, today=TODAY)
+    assert total == 1 and meetings[0]["end_date"] == NO_END_DATE
+
+
+@pytest.mark.parametrize("value, expected", [("2", 2), ("0", 1), ("-3", 1), ("x", 1), (None, 1)])
+def test_parse_page(value, expected):
+    assert parse_page(value) == expected
+
+
+def test_parse_team():
+    assert parse_team("클라") == "client_task"
+    assert parse_team("모임") == MEETING
+    assert parse_team("없는팀") is None
+
+
+def test_response_points_to_the_next_page(ledger):
+    ledger.record([work(f"t{i}", period=FUTURE) for i in range(4)])
+    response = ledger_command(ledger, "/my_tasks", "U1", "")
+    assert "전체 4건 (1/2 페이지)" in response["text"]
+    assert response["blocks"][-1]["elements"][0]["text"] == "다음 페이지: `/my_tasks 2`"
+    last = ledger_command(ledger, "/my_tasks", "U1", "2")
+    assert last["blocks"][-1]["type"] == "section"
+
+
+def test_team_command_usage_and_pagination(ledger):
+    assert "사용법" in ledger_command(ledger, "/team_tasks", "U1", "")["text"]
+    ledger.record([work(f"t{i}", assignee=f"U{i}", period=FUTURE) for i in range(4)])
+    response = ledger_command(ledger, "/team_tasks", "U1", "클라")
+    assert "<@U0>" in response["blocks"][1]["text"]["text"]
+    assert response["blocks"][-1]["elements"][0]["text"] == "다음 페이지: `/team_tasks 클라 2`"
+
+
+def test_empty_results():
+    assert "진행 중인 업무가 없습니다" in tasks_response("내 업무", [], 0, 1, 10, "/my_tasks")["text"]
+    assert "3페이지가 없습니다" in tasks_response("내 업무", [], 5, 3, 10, "/my_tasks")["text"]
+
+
+def test_long_titles_are_truncated_and_sections_stay_within_limit():
+    tasks = [{"id": i, "kind": "work", "work_type": "client_task", "title": "가" * 5000, "assignee_user_id": "U1",
+              "start_date": "", "end_date": "2025-06-30", "channel": "C1", "ts": "1.2"} for i in range(30)]
+    response = tasks_response("내 업무", tasks, 30, 1, 30, "/my_tasks")
+    sections = [block["text"]["text"] for block in response["blocks"][1:] if block["type"] == "section"]
+    assert len(sections) > 1
+    assert all(len(text) <= SECTION_LIMIT for text in sections)
+    assert sum(text.count("\n") + 1 for text in sections) == 30
+    assert "가" * TITLE_LIMIT not in sections[0]
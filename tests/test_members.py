@@ -0,0 +1,57 @@
+import time
+
+from Slack_Members import Member, MemberDirectory, patch_rows
+from Slack_Mentions import mention_lines, take_within_budget
+
+
+class PagedUsers:
+    """users.list fetch_page 대역: pages쪽 × per_page명, 읽은 페이지 수를 센다"""
+
+    def __init__(self, pages=50, per_page=10):
+        self.pages = pages
+        self.per_page = per_page
+        self.fetched = 0
+
+    def __call__(self, cursor=None):
+        page = int(cursor or 0)
+        self.fetched += 1
+        members = [{"id": f"U{page:03d}{i:02d}", "name": f"user{page}-{i}"} for i in range(self.per_page)]
+        return members, str(page + 1) if page + 1 < self.pages else ""
+
+
+def test_closing_iter_active_stops_paginating_and_installs_nothing():
+    fetch = PagedUsers()
+    directory = MemberDirectory(fetch, cold_wait=0)
+    mentions = mention_lines(directory.iter_active())
+    lines, truncated = take_within_budget(mentions, 300)
+    mentions.close()
+    time.sleep(0.1)
+    assert truncated and lines
+    assert fetch.fetched == len(lines) // fetch.per_page + 1  # 예산을 넘긴 줄이 있는 페이지까지만 읽는다
+    assert len(directory) == 0
+    assert not directory._refreshing  # 다음 갱신을 막지 않는다
+
+
+def test_full_scan_fills_the_cache_from_the_same_pages():
+    fetch = PagedUsers(pages=3)
+    directory = MemberDirectory(fetch, cold_wait=0)
+    assert len(list(directory.iter_active())) == 30
+    assert fetch.fetched == 3
+    assert len(directory) == 30
+    # 캐시가 채워졌으므로 다시 순회해도 페이지를 읽지 않는다
+    assert len(list(directory.iter_active())) == 30
+    assert fetch.fetched == 3
+
+
+def test_upsert_applies_events_to_the_cache():
+    directory = MemberDirectory(PagedUsers(pages=1), cold_wait=0)
+    list(directory.iter_active())
+    directory.upsert({"id": "U00000", "name": "renamed", "deleted": True})
+    assert directory.get("U00000") == Member("U00000", "renamed", True, False)
+    assert "U00000" not in {m.id for m in directory.iter_active()}
+
+
+def test_patch_rows_replaces_or_appends():
+    rows = [["U1", "a", False, False]]
+    assert patch_rows(rows, Member("U1", "b", False, False)) == [["U1", "b", False, False]]
+    assert patch_rows(rows, Member("U2", "c", False, True))[-1] == ["U2", "c", False, True]
@@ -0,0 +1,22 @@
+import Slack_Metrics
+
+
+def test_unknown_names_are_recorded_as_other():
+    Slack_Metrics.known_names("test_route", ("/known",))
+    assert Slack_Metrics.metric_name("test_route", "/known") == "/known"
+    assert Slack_Metrics.metric_name("test_route", "busy") == "busy"
+    assert Slack_Metrics.metric_name("test_route", None) == ""
+    assert Slack_Metrics.metric_name("test_route", "/junk") == "other"
+    assert Slack_Metrics.metric_name("test_route", ["not", "a", "str"]) == "other"
+    assert Slack_Metrics.metric_name("other_route", "/known") == "other"
+
+
+def test_forged_command_names_do_not_create_series(web_server):
+    client = web_server.app.test_client()
+    for i in range(5):
+        client.post("/slack/command", data={"command": f"/junk{i}", "user_id": "U1"})
+    client.post("/slack/command", data={"command": "/my_tasks", "user_id": "U1"})
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert "/junk" not in metrics
+    assert 'route="command",name="other"' in metrics
+    assert 'route="command",name="/my_tasks"' in metrics
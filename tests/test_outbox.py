@@ -0,0 +1,175 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from Slack_Outbox import Outbox
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def statuses(path) -> dict:
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "outbox.db")
+
+
+def make_outbox(path, deliver, **kwargs):
+    options = {"poll_interval": 0.05, "backoff_base": 0.05, "max_backoff": 0.1}
+    options.update(kwargs)
+    return Outbox(path, deliver, **options)
+
+
+def test_enqueue_persists_and_delivers(path):
+    delivered = []
+    outbox = make_outbox(path, lambda kind, data: delivered.append((kind, data)) or {"ok": True})
+    row_id = outbox.enqueue("work_create_modal", {"title": "t"})
+    assert row_id > 0
+    assert wait_for(lambda: statuses(path) == {"sent": 1})
+    assert delivered == [("work_create_modal", {"title": "t"})]
+    assert outbox.stats()["delivered"] == 1
+
+
+def test_transient_failure_is_retried_until_success(path):
+    attempts = []
+
+    def deliver(kind, data):
+        attempts.append(time.monotonic())
+        return {"ok": len(attempts) >= 3, "error": "request_failed: ConnectionError"}
+
+    outbox = make_outbox(path, deliver, max_attempts=5)
+    outbox.enqueue("k", {})
+    assert wait_for(lambda: statuses(path) == {"sent": 1})
+    assert len(attempts) == 3
+    assert outbox.stats()["retried"] == 2
+
+
+def test_gives_up_after_max_attempts(path):
+    outbox = make_outbox(path, lambda kind, data: {"ok": False, "error": "request_failed"}, max_attempts=2)
+    outbox.enqueue("k", {})
+    assert wait_for(lambda: statuses(path) == {"dead": 1})
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT attempts, last_error FROM outbox").fetchone() == (2, "request_failed")
+
+
+def test_definitive_error_is_not_retried(path):
+    calls = []
+
+    def deliver(kind, data):
+        calls.append(kind)
+        return {"ok": False, "error": "channel_not_found"}
+
+    outbox = make_outbox(path, deliver, max_attempts=10,
+                         retryable=lambda result: result["error"].startswith("request_failed"))
+    outbox.enqueue("k", {})
+    assert wait_for(lambda: statuses(path) == {"dead": 1})
+    time.sleep(0.2)
+    assert calls == ["k"]
+
+
+def test_slow_row_does_not_block_others(path):
+    release = threading.Event()
+    fast = []
+
+    def deliver(kind, data):
+        if kind == "slow":
+            release.wait(5)
+        else:
+            fast.append(data["i"])
+        return {"ok": True}
+
+    outbox = make_outbox(path, deliver, concurrency=4)
+    outbox.enqueue("slow", {})
+    for i in range(10):
+        outbox.enqueue("fast", {"i": i})
+    try:
+        assert wait_for(lambda: len(fast) == 10, timeout=2)
+        assert wait_for(lambda: statuses(path).get("sent") == 10)
+        assert outbox.stats()["in_flight"] == 1
+    finally:
+        release.set()
+    assert wait_for(lambda: statuses(path) == {"sent": 11})
+
+
+def test_lease_is_renewed_while_a_row_runs(path):
+    """lease보다 오래 걸리는 항목도 같은 파일을 쓰는 다른 워커가 다시 가져가지 않는다."""
+    calls = []
+
+    def deliver(kind, data):
+        calls.append(threading.current_thread().name)
+        time.sleep(1.0)
+        return {"ok": True}
+
+    first = make_outbox(path, deliver, lease=0.3)
+    make_outbox(path, deliver, lease=0.3)
+    first.enqueue("slow", {})
+    assert wait_for(lambda: statuses(path) == {"sent": 1})
+    time.sleep(0.3)
+    assert len(calls) == 1
+
+
+def test_claim_skips_rows_leased_by_another_worker(path):
+    outbox = make_outbox(path, lambda kind, data: {"ok": True}, poll_interval=60)
+    time.sleep(0.1)  # 디스패처의 첫 조회(빈 결과)가 지나간 뒤 넣는다 → 이후로는 enqueue 없이 깨어나지 않는다
+    conn = sqlite3.connect(path, isolation_level=None)
+    now = time.time()
+    conn.execute("INSERT INTO outbox (kind, data, next_attempt_at, created_at) VALUES ('k', '{}', ?, ?)", (now, now))
+    claimed = outbox._claim(conn, 10)
+    assert [row[1] for row in claimed] == ["k"]
+    assert outbox._claim(conn, 10) == []
+    lease_until = conn.execute("SELECT next_attempt_at FROM outbox").fetchone()[0]
+    assert lease_until == pytest.approx(now + outbox.lease, abs=1)
+
+
+def test_dead_rows_are_reported_once(path):
+    dead = []
+    outbox = make_outbox(path, lambda kind, data: {"ok": False, "error": "uncertain: http_503"},
+                         retryable=lambda result: False, on_dead=lambda *args: dead.append(args))
+    outbox.enqueue("work_create_modal", {"title": "t", "user_id": "U1"})
+    assert wait_for(lambda: statuses(path) == {"dead": 1})
+    assert wait_for(lambda: dead)
+    assert dead == [("work_create_modal", {"title": "t", "user_id": "U1"}, {"ok": False, "error": "uncertain: http_503"})]
+
+
+def test_purge_removes_finished_rows_after_retention(path):
+    outbox = make_outbox(path, lambda kind, data: {"ok": True}, retention=60, purge_interval=3600)
+    time.sleep(0.1)  # 디스패처 시작 시의 정리가 지나간 뒤 넣는다
+    conn = sqlite3.connect(path, isolation_level=None)
+    old = time.time() - 120
+    conn.executemany(
+        "INSERT INTO outbox (kind, data, status, next_attempt_at, created_at) VALUES ('k', '{}', ?, ?, ?)",
+        [("sent", old, old), ("dead", old, old), ("pending", old + 3600, old), ("sent", time.time(), old)],
+    )
+    assert outbox.purge() == 2
+    assert statuses(path) == {"pending": 1, "sent": 1}
+
+
+@pytest.mark.parametrize("result, retryable", [
+    ({"ok": False, "error": "post_timeout"}, True),
+    ({"ok": False, "error": "request_failed: ConnectionError"}, True),
+    ({"ok": False, "error": "ratelimited"}, True),
+    ({"ok": False, "error": "circuit_open"}, True),
+    ({"ok": False, "error": "http_429", "retryable": True}, True),
+    ({"ok": False, "error": "uncertain: ReadTimeout"}, False),
+    ({"ok": False, "error": "uncertain: http_503"}, False),
+    ({"ok": False, "error": "internal_error"}, False),
+    ({"ok": False, "error": "exception: boom"}, False),
+    ({"ok": False, "error": "channel_not_found"}, False),
+])
+def test_outbox_retries_only_unsent_posts(web_server, result, retryable):
+    assert web_server.outbox_retryable(result) is retryable
@@ -0,0 +1,185 @@
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta, timezone
+
+import pytest
+
+from Slack_Reminders import SCHEMA, ReminderScheduler, parse_days, period_dates
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class Sender:
+    """send(reminders) 대역. outcomes를 차례로 꺼내 결과로 쓴다 (다 쓰면 성공)"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, reminders):
+        with self.lock:
+            self.batches.append([r["id"] for r in reminders])
+            outcome = self.outcomes.pop(0) if self.outcomes else {"ok": True}
+        return [outcome] * len(reminders)
+
+    @property
+    def sent_ids(self):
+        return [row_id for batch in self.batches for row_id in batch]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "reminders.db")
+
+
+def make_scheduler(path, send, **kwargs):
+    options = {"tz": timezone.utc, "horizon": 0.4, "retry_delay": 0.05, "purge_interval": 3600}
+    options.update(kwargs)
+    return ReminderScheduler(path, send, **options)
+
+
+def insert(path, due_at, status="pending", sent_at=None, title="업무"):
+    """다른 워커가 저장한 것처럼 DB에 바로 넣는다"""
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            return conn.execute(
+                "INSERT INTO reminders (due_at, days_left, work_type, title, end_date, assignee_user_id, channel, "
+                "status, created_at, sent_at) VALUES (?, 0, 'client_task', ?, '2025-01-09', 'U1', 'C1', ?, ?, ?)",
+                (due_at, title, status, time.time(), sent_at),
+            ).lastrowid
+    finally:
+        conn.close()
+
+
+def row(path, row_id) -> dict:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return dict(conn.execute("SELECT * FROM reminders WHERE id = ?", (row_id,)).fetchone())
+    finally:
+        conn.close()
+
+
+def test_period_and_days_parsing():
+    assert period_dates("2025-01-01 ~ 2025-01-09") == ("2025-01-01", "2025-01-09")
+    assert period_dates("기간 미설정") == ("", "")
+    assert parse_days("0, 3,1,1,-2") == (3, 1, 0)
+
+
+def test_schedule_stores_future_due_times_only(path):
+    scheduler = make_scheduler(path, Sender(), days_before=(1, 0), hour=10, horizon=3600)
+    end = (date.today() + timedelta(days=10)).isoformat()
+    assert [days for days, _ in scheduler.due_times(end)] == [1, 0]
+    assert scheduler.due_times(end)[1][1] - scheduler.due_times(end)[0][1] == 86400
+    items = [
+        {"work_type": "client_task", "title": "미래", "end_date": end, "assignee_user_id": "U1", "channel": "C1"},
+        {"work_type": "client_task", "title": "과거", "end_date": "2000-01-01", "assignee_user_id": "U1"},
+        {"work_type": "client_task", "title": "잘못된 날짜", "end_date": "내일", "assignee_user_id": "U1"},
+    ]
+    assert scheduler.schedule(items) == 2
+    assert scheduler.stats()["pending"] == 2
+
+
+def test_rows_beyond_the_horizon_are_loaded_by_a_later_refill(path):
+    sender = Sender()
+    scheduler = make_scheduler(path, sender, horizon=0.2)
+    time.sleep(0.05)  # 첫 구간을 읽은 뒤에 저장한다
+    row_id = insert(path, time.time() + 0.5)
+    assert not wait_for(lambda: sender.batches, timeout=0.3)
+    assert wait_for(lambda: sender.sent_ids == [row_id])
+    assert row(path, row_id)["status"] == "sent"
+    assert scheduler.stats()["sent"] == 1
+
+
+def test_overdue_rows_from_other_workers_are_picked_up(path):
+    sender = Sender()
+    scheduler = make_scheduler(path, sender, horizon=0.2)
+    time.sleep(0.05)
+    # 이미 읽은 구간보다 앞(지난 시각)에 저장된 항목: 다음 구간을 읽을 때 함께 올린다
+    row_id = insert(path, time.time() - 1)
+    assert wait_for(lambda: sender.sent_ids == [row_id])
+    assert scheduler.stats()["pending"] == 0
+
+
+def test_rows_at_the_same_time_are_sent_in_batches(path):
+    sender = Sender()
+    due_at = time.time() + 0.1
+    ids = [insert(path, due_at, title=f"업무{i}") for i in range(5)]
+    make_scheduler(path, sender, batch_size=2)
+    assert wait_for(lambda: len(sender.sent_ids) == 5)
+    assert sorted(sender.sent_ids) == ids
+    assert [len(batch) for batch in sender.batches] == [2, 2, 1]
+
+
+def test_rows_past_max_delay_expire_without_sending(path):
+    sender = Sender()
+    stale = insert(path, time.time() - 100)
+    fresh = insert(path, time.time() - 1)
+    scheduler = make_scheduler(path, sender, max_delay=10)
+    assert wait_for(lambda: sender.sent_ids == [fresh])
+    assert row(path, stale)["status"] == "expired"
+    assert scheduler.stats()["expired"] == 1
+
+
+def test_failed_sends_are_retried_then_marked_failed(path):
+    sender = Sender(*[{"ok": False, "error": "channel_not_found"}] * 3)
+    row_id = insert(path, time.time())
+    scheduler = make_scheduler(path, sender, max_attempts=3)
+    assert wait_for(lambda: row(path, row_id)["status"] == "failed")
+    assert sender.sent_ids == [row_id] * 3
+    saved = row(path, row_id)
+    assert (saved["attempts"], saved["last_error"]) == (3, "channel_not_found")
+    assert scheduler.stats()["failed"] == 1
+
+
+def test_send_errors_are_retried_until_sent(path):
+    sender = Sender(RuntimeError("boom"))
+
+    def send(reminders):
+        outcome = sender(reminders)[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return [outcome] * len(reminders)
+
+    row_id = insert(path, time.time())
+    scheduler = make_scheduler(path, send)
+    assert wait_for(lambda: row(path, row_id)["status"] == "sent" and len(sender.batches) == 2)
+    assert row(path, row_id)["attempts"] == 2
+    assert scheduler.stats()["sent"] == 1
+
+
+def test_purge_removes_finished_rows_after_retention(path):
+    old, recent = time.time() - 3 * 86400, time.time() - 60
+    scheduler = make_scheduler(path, Sender(), retention=86400, horizon=3600)
+    time.sleep(0.1)  # 기동 직후 타이머의 정리가 끝난 뒤에 넣는다
+    for status in ("sent", "expired", "failed"):
+        insert(path, old, status, old)
+    kept = [insert(path, recent, "sent", recent), insert(path, time.time() + 3600)]
+    assert scheduler.purge() == 3
+    conn = sqlite3.connect(path)
+    try:
+        assert sorted(i for (i,) in conn.execute("SELECT id FROM reminders")) == kept
+    finally:
+        conn.close()
+
+
+def test_purge_runs_from_the_timer(path):
+    old = time.time() - 3 * 86400
+    row_id = insert(path, old, "sent", old)
+    make_scheduler(path, Sender(), retention=86400)
+    conn = sqlite3.connect(path)
+    try:
+        assert wait_for(lambda: conn.execute("SELECT COUNT(*) FROM reminders WHERE id = ?", (row_id,)).fetchone()[0] == 0)
+    finally:
+        conn.close()
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from Slack_Resilience import (
+    CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker, breaker_settings, is_failure,
+)
+
+
+def make_breaker(**kwargs):
+    options = {"failure_ratio": 0.5, "min_calls": 4, "window": 30, "open_seconds": 0.05}
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        assert breaker.allow()
+        breaker.record(True)
+
+
+def test_stays_closed_below_min_calls():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_stays_closed_below_failure_ratio():
+    breaker = make_breaker()
+    for failed in (True, False, False, False, True, False):
+        breaker.record(failed)
+    assert breaker.state == CLOSED
+
+
+def test_opens_at_failure_ratio_and_rejects():
+    breaker = make_breaker()
+    trip(breaker)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["calls"] == 0
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_old_calls_leave_the_window():
+    breaker = make_breaker(window=0.05)
+    for _ in range(3):
+        breaker.record(True)
+    time.sleep(0.06)
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["calls"] == 1
+
+
+def test_registry_keeps_one_breaker_per_name():
+    registry = BreakerRegistry(**breaker_settings({"BREAKER_MIN_CALLS": "2", "BREAKER_OPEN_SECONDS": "60"}))
+    assert registry.get("chat.postMessage") is registry.get("chat.postMessage")
+    for _ in range(2):
+        registry.get("views.open").record(True)
+    assert registry.is_open("views.open")
+    assert not registry.is_open("chat.postMessage")
+    assert not registry.is_open("users.list")
+
+
+@pytest.mark.parametrize("response, expected", [
+    ({"ok": True}, False),
+    ({"ok": False, "error": "channel_not_found"}, False),
+    ({"ok": False, "error": "ratelimited"}, False),
+    ({"ok": False, "error": "circuit_open"}, False),
+    ({"ok": False, "error": "request_failed: ConnectionError"}, True),
+    ({"ok": False, "error": "http_503"}, True),
+])
+def test_is_failure(response, expected):
+    assert is_failure(response) is expected
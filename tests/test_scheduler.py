@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from Slack_Scheduler import MessageScheduler
+
+
+class Recorder:
+    """send 대역: 보낸 payload를 순서대로 남기고, results에 채널별 응답을 미리 넣어 둘 수 있다"""
+
+    def __init__(self):
+        self.sent = []
+        self.results = {}
+        self.gate = None
+        self._lock = threading.Lock()
+
+    def __call__(self, payload):
+        if self.gate is not None:
+            self.gate.wait(5)
+        with self._lock:
+            self.sent.append((time.monotonic(), payload))
+            queued = self.results.get(payload["channel"])
+            if queued:
+                return queued.pop(0)
+        return {"ok": True, "channel": payload["channel"]}
+
+    def texts(self):
+        return [payload.get("text") for _, payload in self.sent]
+
+
+def block_message(channel, text, blocks=1):
+    return {"channel": channel, "text": text, "blocks": [{"type": "section"}] * blocks}
+
+
+def test_channels_take_turns():
+    recorder = Recorder()
+    scheduler = MessageScheduler(recorder, rate=10, coalesce=False)
+    futures = [scheduler.post("A", {"channel": "A", "text": f"A{i}"}) for i in range(4)]
+    futures.append(scheduler.post("B", {"channel": "B", "text": "B0"}))
+    for future in futures:
+        assert future.result(5)["ok"]
+    # A가 토큰을 기다리는 동안 B가 먼저 나간다 (한 채널이 다른 채널을 막지 않는다)
+    assert recorder.texts().index("B0") <= 1
+
+
+def test_each_channel_keeps_its_rate():
+    recorder = Recorder()
+    scheduler = MessageScheduler(recorder, rate=10, coalesce=False)
+    futures = [scheduler.post("A", {"channel": "A", "text": str(i)}) for i in range(4)]
+    for future in futures:
+        future.result(5)
+    times = [at for at, _ in recorder.sent]
+    assert all(b - a >= 0.09 for a, b in zip(times, times[1:]))
+
+
+def test_queued_block_messages_are_coalesced_up_to_max_blocks():
+    recorder = Recorder()
+    recorder.gate = threading.Event()
+    scheduler = MessageScheduler(recorder, rate=100, max_blocks=50)
+    first = scheduler.post("A", block_message("A", "first"))
+    time.sleep(0.05)  # 첫 메시지가 발송 중인 동안 나머지가 쌓인다
+    queued = [scheduler.post("A", block_message("A", f"m{i}", blocks=20)) for i in range(3)]
+    plain = scheduler.post("A", {"channel": "A", "text": "plain"})
+    recorder.gate.set()
+    for future in [first, *queued, plain]:
+        assert future.result(5)["ok"]
+    # 20 + 20은 합치고 세 번째(60 > 50)는 따로, block 없는 메시지도 따로 보낸다
+    assert recorder.texts() == ["first", "m0\nm1", "m2", "plain"]
+    assert scheduler.stats()["coalesced"] == 1
+
+
+def test_cancelled_messages_are_never_sent():
+    recorder = Recorder()
+    recorder.gate = threading.Event()
+    scheduler = MessageScheduler(recorder, rate=100, coalesce=False)
+    first = scheduler.post("A", {"channel": "A", "text": "first"})
+    time.sleep(0.05)
+    second = scheduler.post("A", {"channel": "A", "text": "second"})
+    assert not first.cancel()  # 이미 발송 중
+    assert second.cancel()
+    recorder.gate.set()
+    assert first.result(5)["ok"]
+    time.sleep(0.1)
+    assert recorder.texts() == ["first"]
+
+
+def test_rate_limit_pauses_only_that_channel_and_retries():
+    recorder = Recorder()
+    recorder.results["A"] = [{"ok": False, "error": "ratelimited", "retry_after": 0.3}]
+    scheduler = MessageScheduler(recorder, rate=100, coalesce=False)
+    started = time.monotonic()
+    a = scheduler.post("A", {"channel": "A", "text": "a"})
+    time.sleep(0.02)
+    b = scheduler.post("B", {"channel": "B", "text": "b"})
+    assert b.result(5)["ok"]
+    assert time.monotonic() - started < 0.2  # B는 A의 Retry-After를 기다리지 않는다
+    assert a.result(5)["ok"]
+    assert time.monotonic() - started >= 0.3
+    assert recorder.texts() == ["a", "b", "a"]
+    assert scheduler.stats()["rate_limited"] == 1
+
+
+def test_rate_limit_retries_are_bounded():
+    recorder = Recorder()
+    recorder.results["A"] = [{"ok": False, "error": "ratelimited", "retry_after": 0.01}] * 5
+    scheduler = MessageScheduler(recorder, rate=100, max_rate_retries=2)
+    assert scheduler.post("A", {"channel": "A", "text": "a"}).result(5)["error"] == "ratelimited"
+    assert len(recorder.sent) == 3
+
+
+def test_idle_channels_are_evicted():
+    recorder = Recorder()
+    scheduler = MessageScheduler(recorder, rate=100, evict_interval=0.05)
+    for i in range(5):
+        scheduler.post(f"D{i}", {"channel": f"D{i}", "text": "hi"}).result(5)
+    assert scheduler.stats()["channels"] <= 5
+    time.sleep(0.2)
+    assert scheduler.stats()["channels"] == 0
+    # 지운 뒤에도 같은 채널로 다시 보낼 수 있다
+    assert scheduler.post("D0", {"channel": "D0", "text": "again"}).result(5)["ok"]
+
+
+@pytest.mark.parametrize("error", ["channel_not_found", "uncertain: http_503"])
+def test_other_errors_are_returned_without_retry(error):
+    recorder = Recorder()
+    recorder.results["A"] = [{"ok": False, "error": error}]
+    scheduler = MessageScheduler(recorder, rate=100)
+    assert scheduler.post("A", {"channel": "A", "text": "a"}).result(5)["error"] == error
+    assert len(recorder.sent) == 1
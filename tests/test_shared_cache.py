@@ -0,0 +1,121 @@
+import threading
+import time
+
+from Slack_Cache import MISSING
+from Slack_SharedCache import SharedCache
+
+
+def make(tmp_path, **kwargs):
+    """같은 DB 파일을 쓰는 워커 하나 (워커 메모리 캐시 없이)"""
+    kwargs.setdefault("local_ttl", 0)
+    return SharedCache(str(tmp_path / "cache.db"), "test", **kwargs)
+
+
+def test_only_one_owner_holds_a_lease(tmp_path):
+    a, b = make(tmp_path, lease=0.2), make(tmp_path, lease=0.2)
+    now = time.time()
+    assert a._acquire("k", "a", now)
+    assert not b._acquire("k", "b", now)
+    a._release("k", "b")  # 다른 소유자는 lease를 풀지 못한다
+    assert not b._acquire("k", "b", time.time())
+    a._release("k", "a")
+    assert b._acquire("k", "b", time.time())
+    # lease 시간이 지나면 다른 소유자가 가져간다
+    assert a._acquire("k", "a", time.time() + 0.3)
+
+
+def test_competing_workers_fetch_once(tmp_path):
+    a, b = make(tmp_path), make(tmp_path, wait=2.0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fetch():
+        started.set()
+        release.wait(2)
+        return {"v": 1}
+
+    results = {}
+    owner = threading.Thread(target=lambda: results.setdefault("a", a.get_or_fetch("k", slow_fetch)))
+    owner.start()
+    assert started.wait(2)
+    waiter = threading.Thread(target=lambda: results.setdefault("b", b.get_or_fetch("k", lambda: {"v": 2})))
+    waiter.start()
+    time.sleep(0.1)
+    release.set()
+    owner.join(2)
+    waiter.join(2)
+    assert results == {"a": {"v": 1}, "b": {"v": 1}}
+    assert (a.fetches, b.fetches) == (1, 0)
+
+
+def test_waiter_fetches_directly_when_the_owner_never_finishes(tmp_path):
+    a, b = make(tmp_path), make(tmp_path, wait=0.2)
+    assert a._acquire("k", "stuck", time.time())
+    started = time.time()
+    assert b.get_or_fetch("k", lambda: "direct") == "direct"
+    assert 0.2 <= time.time() - started < 1.0
+    assert b.fetches == 1
+
+
+def test_waiter_uses_stale_value_while_another_owner_refreshes(tmp_path):
+    a, b = make(tmp_path, ttl=0.05, stale_ttl=10), make(tmp_path, wait=0.2)
+    a.set("k", "old")
+    time.sleep(0.1)
+    assert a._acquire("k", "refreshing", time.time())
+    started = time.time()
+    assert b.get_or_fetch("k", lambda: "new") == "old"
+    assert time.time() - started < 0.1
+    assert b.fetches == 0
+
+
+def test_transient_fetch_failure_is_not_cached(tmp_path):
+    cache = make(tmp_path)
+    assert cache.get_or_fetch("k", lambda: MISSING) is None
+    assert cache.get("k") is MISSING
+    assert cache.get_or_fetch("k", lambda: "ok") == "ok"
+
+
+def test_update_changes_only_live_values(tmp_path):
+    cache = make(tmp_path, ttl=0.05)
+    calls = []
+
+    def append(value):
+        calls.append(value)
+        return value + [2]
+
+    assert not cache.update("missing", append)
+    cache.set("k", [1])
+    assert cache.update("k", append)
+    assert cache.get("k") == [1, 2]
+    time.sleep(0.1)
+    assert not cache.update("k", append)
+    assert calls == [[1]]
+
+
+def test_update_keeps_the_value_when_func_fails(tmp_path):
+    cache = make(tmp_path)
+    cache.set("k", [1])
+
+    def fail(value):
+        raise ValueError("boom")
+
+    try:
+        cache.update("k", fail)
+    except ValueError:
+        pass
+    assert cache.get("k") == [1]
+    assert cache.update("k", lambda value: value + [3])
+
+
+def test_purge_keeps_live_stale_and_leased_rows(tmp_path):
+    cache = make(tmp_path, ttl=0.05)
+    stale = make(tmp_path, ttl=0.05, stale_ttl=10)
+    cache.set("expired", 1)
+    cache.set("leased", 1)
+    stale.set("stale", 1)
+    make(tmp_path).set("live", 1)
+    time.sleep(0.1)
+    assert cache._acquire("leased", "owner", time.time())
+    assert cache.purge() == 1
+    assert cache.get("live") == 1
+    assert cache._read("stale")[0] == 1
+    assert not cache._acquire("leased", "other", time.time())
@@ -0,0 +1,113 @@
+import json
+
+from Slack_Submissions import (
+    JiraIssueRequest, MeetingRequest, WorkBulkRequest, WorkRequest, decode_submission, parse_submission,
+)
+
+
+def submission(callback_id, values, user_id="U1"):
+    return {"type": "view_submission", "user": {"id": user_id},
+            "view": {"id": "V1", "callback_id": callback_id, "state": {"values": values}}}
+
+
+def text(block_id, action_id, value):
+    return {block_id: {action_id: {"type": "plain_text_input", "value": value}}}
+
+
+WORK_VALUES = {
+    "work_type": {"work_type_select": {"selected_option": {"value": "client_task"}}},
+    **text("title", "title_input", "로그인"),
+    **text("content", "content_input", "내용"),
+    "start_date": {"start_date_input": {"selected_date": "2025-01-01"}},
+    "end_date": {"end_date_input": {"selected_date": "2025-01-09"}},
+    **text("plan_url", "plan_url_input", None),
+    "assignee": {"assignee_input": {"selected_user": "U2"}},
+}
+
+
+def test_work_request():
+    callback_id, request, errors = parse_submission(submission("work_create_modal", WORK_VALUES))
+    assert (callback_id, errors) == ("work_create_modal", {})
+    assert request == WorkRequest(user_id="U1", work_type="client_task", title="로그인", content="내용",
+                                  assignee_user_id="U2", start_date="2025-01-01", end_date="2025-01-09")
+    assert request.fields() == {"work_type": "client_task", "title": "로그인", "content": "내용",
+                                "period": "2025-01-01 ~ 2025-01-09", "plan_url": "", "assignee_user_id": "U2",
+                                "user_id": "U1"}
+
+
+def test_work_request_without_dates_has_no_period():
+    values = {k: v for k, v in WORK_VALUES.items() if k not in ("start_date", "end_date")}
+    _, request, errors = parse_submission(submission("work_create_modal", values))
+    assert errors == {}
+    assert request.period == "기간 미설정"
+
+
+def test_missing_required_fields_become_view_errors():
+    values = {**WORK_VALUES, **text("title", "title_input", "   ")}
+    del values["assignee"]
+    values["work_type"] = {"work_type_select": {"selected_option": None}}
+    _, request, errors = parse_submission(submission("work_create_modal", values))
+    assert request is None
+    assert set(errors) == {"title", "assignee", "work_type"}
+    assert errors["title"].endswith("입력하세요")
+    assert errors["assignee"].endswith("선택하세요")
+
+
+def test_malformed_values_are_treated_as_missing():
+    values = {**WORK_VALUES, **text("title", "title_input", 123)}
+    values["work_type"] = {"work_type_select": {"selected_option": "client_task"}}
+    values["assignee"] = {"assignee_input": ["U2"]}
+    values["content"] = "내용"
+    _, request, errors = parse_submission(submission("work_create_modal", values))
+    assert request is None
+    assert set(errors) == {"title", "work_type", "assignee", "content"}
+
+
+def test_malformed_selected_option_returns_view_errors(web_server):
+    values = {**WORK_VALUES, "work_type": {"work_type_select": {"selected_option": "client_task"}}}
+    response = web_server.app.test_client().post(
+        "/slack/interactions", data={"payload": json.dumps(submission("work_create_modal", values))})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["response_action"] == "errors"
+    assert set(body["errors"]) == {"work_type"}
+
+
+def test_meeting_request():
+    values = {
+        **text("title", "title_input", "기획리뷰"),
+        "assignee": {"assignee_input": {"selected_users": ["U2", "U3"]}},
+        **text("document", "document_input", "https://doc"),
+    }
+    _, request, errors = parse_submission(submission("meeting_review_modal", values))
+    assert errors == {}
+    assert request == MeetingRequest(user_id="U1", title="기획리뷰", assignees=["U2", "U3"], document="https://doc")
+    assert request.fields()["user_id"] == "U1"
+
+
+def test_jira_issue_request():
+    values = {
+        **text("summary", "summary_input", "버그"),
+        "project": {"project_select": {"selected_option": {"value": "PROJ"}}},
+        "issuetype": {"issuetype_select": {"selected_option": {"value": "Bug"}}},
+    }
+    _, request, errors = parse_submission(submission("jira_issue_create_modal", values))
+    assert errors == {}
+    assert request == JiraIssueRequest(user_id="U1", summary="버그", project_key="PROJ", issuetype="Bug")
+
+
+def test_bulk_request():
+    values = text("rows", "rows_input", "클라,제목,,,U12345678")
+    _, request, errors = parse_submission(submission("work_bulk_create_modal", values))
+    assert request == WorkBulkRequest(user_id="U1", rows_text="클라,제목,,,U12345678")
+
+
+def test_unknown_callback_id():
+    assert parse_submission(submission("other_modal", {})) == ("other_modal", None, {})
+    assert parse_submission({}) == (None, None, {})
+
+
+def test_decode_submission_accepts_str_and_bytes():
+    payload = json.dumps(submission("work_bulk_create_modal", text("rows", "rows_input", "x")))
+    assert decode_submission(payload) == decode_submission(payload.encode())
+    assert decode_submission(payload)[1].rows_text == "x"